@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark comparing the per point edge tessellation (pyrr slerp and ``Calc.move_to_position`` for each point)
+with the vectorized ``Calc.get_edge_points`` and ``Calc.get_many_edge_points``.
+
+The root of the repository is added to the import path, so the ``sphere_base`` package next to the benchmarks
+is used without installing it. Run from the root of the repository:
+
+    python benchmarks/bench_edge_tessellation.py
+
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pyrr import quaternion
+from sphere_base.calc import Calc
+from types import SimpleNamespace
+import numpy as np
+import timeit
+
+RADIUS = 3
+
+
+def random_quaternions(rng, number):
+    quats = rng.normal(size=(number, 4))
+    return quats / np.linalg.norm(quats, axis=1, keepdims=True)
+
+
+def per_point(calc, sphere, start, end, number_of_vertices, step):
+    points = []
+    for i in range(number_of_vertices):
+        pos = quaternion.slerp(start, end, step * i)
+        p = calc.move_to_position(pos, sphere, RADIUS)
+        points.append([p[0], p[1], p[2]])
+    return points
+
+
+def main():
+    calc = Calc()
+    sphere = SimpleNamespace(xyz=[0.0, 0.0, 0.0])
+    rng = np.random.default_rng(0)
+    start, end = random_quaternions(rng, 2)
+
+    print("single edge")
+    for number_of_vertices in (10, 100, 1000):
+        step = 1 / number_of_vertices
+        loops = max(1, 2000 // number_of_vertices)
+
+        old = timeit.timeit(lambda: per_point(calc, sphere, start, end, number_of_vertices, step), number=loops)
+        new = timeit.timeit(lambda: calc.get_edge_points(start, end, number_of_vertices, step, sphere.xyz, RADIUS),
+                            number=loops)
+        print("  %5d points: per point %8.3f ms, vectorized %7.3f ms, %6.1fx" %
+              (number_of_vertices, old / loops * 1000, new / loops * 1000, old / new))
+
+    print("many edges")
+    for number_of_edges in (100, 1000):
+        starts, ends = random_quaternions(rng, number_of_edges), random_quaternions(rng, number_of_edges)
+        counts = rng.integers(10, 120, number_of_edges)
+
+        def loop():
+            for s, e, n in zip(starts, ends, counts):
+                per_point(calc, sphere, s, e, n, 1 / n)
+
+        old = timeit.timeit(loop, number=1)
+        new = timeit.timeit(lambda: calc.get_many_edge_points(starts, ends, counts, sphere.xyz, RADIUS), number=1)
+        print("  %5d edges, %6d points: per point %8.1f ms, vectorized %6.1f ms, %6.1fx" %
+              (number_of_edges, counts.sum(), old * 1000, new * 1000, old / new))
+
+
+if __name__ == '__main__':
+    main()
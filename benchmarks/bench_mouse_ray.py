@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark comparing picking with the ``PyBullet`` based ``MouseRay`` with the ``AnalyticRay``.
+A sphere with nodes, sockets and edges is registered with both. The benchmark measures moving all
+collision objects after the nodes changed position, a single ray and a batch of rays as used by the
+rubber band box, and counts how often both give the same result. Rays aimed at the middle of each rendered
+edge count how many edges are picked.
+
+The root of the repository is added to the import path, so the ``sphere_base`` package next to the benchmarks
+is used without installing it. Run from the root of the repository:
+
+    python benchmarks/bench_mouse_ray.py
+
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from types import SimpleNamespace
+from pyrr import quaternion
+from sphere_base.calc import Calc
+from sphere_base.constants import *
+from sphere_base.sphere.sphere import Sphere
+from sphere_base.sphere_universe.mouse_ray import MouseRay
+from sphere_base.sphere_universe.analytic_ray import AnalyticRay
+import numpy as np
+import timeit
+
+RAY_SEED = 50  # rays per side of the rubber band box
+EDGE_IDS = 10 ** 6  # ids of the edges start here
+
+
+class BenchObject:
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+
+class BenchSphere(BenchObject):
+    orientation = Sphere.orientation
+    get_rotation_matrix = Sphere.get_rotation_matrix
+    get_world_position = Sphere.get_world_position
+    get_world_orientation = Sphere.get_world_orientation
+
+
+class BenchItem(BenchObject):
+    @property
+    def xyz(self):
+        return self.sphere.get_world_position(self.local_xyz)
+
+    @property
+    def orientation(self):
+        return self.sphere.get_world_orientation(self.local_orientation)
+
+
+def create_scene(calc, rng, number_of_nodes, number_of_edges):
+    sphere = BenchSphere(id=1, type='sphere_base', xyz=[0.0, 0.0, 0.0], radius=SPHERE_RADIUS,
+                         _orientation=None, _rotation_matrix=None, collision_object_id=None)
+    sphere.orientation = quaternion.create_from_eulers([0.0, 0.7, 0.0])
+
+    angles = rng.normal(size=(number_of_nodes, 4))
+    angles /= np.linalg.norm(angles, axis=1, keepdims=True)
+
+    nodes, sockets = [], []
+    for i, angle in enumerate(angles):
+        local_xyz = calc.move_to_positions(angle, [0.0, 0.0, 0.0], sphere.radius)
+        local_orientation = calc.get_direction_pointing_outwards(local_xyz, [0.0, 0.0, 0.0])
+        node = BenchItem(id=10 + 2 * i, type='sphere_node', sphere=sphere, local_xyz=local_xyz,
+                         local_orientation=local_orientation, collision_object_radius=NODE_DISC_RADIUS,
+                         pos_orientation_offset=angle, collision_object_id=None)
+        socket = BenchItem(id=11 + 2 * i, type='socket', sphere=sphere, node=node, radius=SOCKET_RADIUS,
+                           local_xyz=calc.move_to_positions(angle, [0.0, 0.0, 0.0], sphere.radius + 0.001),
+                           local_orientation=local_orientation, collision_object_radius=SOCKET_RADIUS,
+                           collision_object_id=None)
+        nodes.append(node)
+        sockets.append(socket)
+
+    edges = []
+    for i in range(number_of_edges):
+        a, b = rng.choice(number_of_nodes, 2, replace=False)
+        vert = calc.get_edge_points(angles[a], angles[b], 20, 1 / 20, sphere.xyz, sphere.radius)
+        edge = BenchObject(id=EDGE_IDS + i, type='edge', sphere=sphere, vert=vert.tolist(),
+                           xyz=sphere.xyz, orientation=sphere.orientation, collision_object_id=None)
+        edges.append(edge)
+
+    return sphere, nodes, sockets, edges
+
+
+def is_edge(item_id):
+    return item_id is not None and item_id >= EDGE_IDS
+
+
+def register(ray, sphere, nodes, sockets, edges):
+    sphere.collision_shape_id = ray.get_collision_shape(sphere)
+    sphere.collision_object_id = ray.create_collision_object(sphere)
+    for item in nodes + sockets:
+        item.collision_object_id = ray.create_collision_object(item)
+    for edge in edges:
+        edge.collision_object_id = ray.create_collision_object(edge, edge.vert)
+
+
+def get_edge_rays(sphere, edges):
+    # rays straight down on the middle vertex of each rendered edge
+    targets = np.array([sphere.get_world_position(edge.vert[len(edge.vert) // 2]) for edge in edges])
+    starts = targets / np.linalg.norm(targets, axis=1, keepdims=True) * SPHERE_RADIUS * 3
+    ends = starts + (targets - starts) * 2
+    return starts, ends
+
+
+def get_rays(rng, nodes, number_of_rays):
+    # rays from outside the sphere aimed at points close to the nodes
+    targets = np.array([nodes[i].xyz for i in rng.choice(len(nodes), number_of_rays)])
+    targets += rng.normal(scale=NODE_DISC_RADIUS, size=targets.shape)
+    starts = targets / np.linalg.norm(targets, axis=1, keepdims=True) * SPHERE_RADIUS * 3
+    ends = starts + (targets - starts) * 2
+    return starts, ends
+
+
+def main():
+    calc = Calc()
+    rng = np.random.default_rng(0)
+    universe = SimpleNamespace(cam=SimpleNamespace(xyz=[0.0, 0.0, 10.0]))
+
+    for number_of_nodes in (100, 1000, 5000):
+        scene = create_scene(calc, rng, number_of_nodes, number_of_nodes)
+        sphere, nodes, sockets, edges = scene
+
+        bullet_ray = MouseRay(universe)
+        register(bullet_ray, *scene)
+        bullet_ids = dict(bullet_ray._collision_objects)
+
+        analytic_ray = AnalyticRay(universe)
+        for item in (sphere, *nodes, *sockets, *edges):
+            item.collision_object_id = None
+        register(analytic_ray, *scene)
+
+        print("%d nodes and sockets, %d edges" % (number_of_nodes, len(edges)))
+
+        # moving all collision objects, as after deserializing or dropping a selection
+        def move_bullet():
+            for item in nodes + sockets:
+                bullet_ray.reset_position_collision_object(item)
+
+        def move_analytic():
+            for item in nodes + sockets:
+                analytic_ray.reset_position_collision_object(item)
+            analytic_ray.get_sphere_data(sphere)
+
+        old = timeit.timeit(move_bullet, number=1)
+        new = timeit.timeit(move_analytic, number=1)
+        print("  move all items:     pybullet %9.2f ms, analytic %8.2f ms" % (old * 1000, new * 1000))
+        bullet_ids.update(bullet_ray._collision_objects)
+
+        starts, ends = get_rays(rng, nodes, RAY_SEED * RAY_SEED)
+
+        loops = 100
+        old = timeit.timeit(lambda: bullet_ray.bullet.rayTest(starts[0], ends[0]), number=loops) / loops
+        new = timeit.timeit(lambda: analytic_ray.cast_rays(starts[:1], ends[:1]), number=loops) / loops
+        print("  single ray:         pybullet %9.3f ms, analytic %8.3f ms" % (old * 1000, new * 1000))
+
+        old = timeit.timeit(lambda: bullet_ray.bullet.rayTestBatch(starts.tolist(), ends.tolist()), number=1)
+        new = timeit.timeit(lambda: analytic_ray.cast_rays(starts, ends), number=1)
+        print("  %d rays:         pybullet %9.2f ms, analytic %8.2f ms" % (len(starts), old * 1000, new * 1000))
+
+        # compare the picked items of all rays. The pybullet edge meshes are made of the edge vertices only,
+        # they are hardly ever hit, so those rays hit the sphere or a node disc instead. Most other differences
+        # are rays passing within the collision margin pybullet adds around the rim of a node disc.
+        bullet_hits = [bullet_ids.get(result[0]) for result in bullet_ray.bullet.rayTestBatch(starts.tolist(),
+                                                                                             ends.tolist())]
+        analytic_hits = [item.id if item is not None else None for item in analytic_ray.cast_rays(starts, ends)[0]]
+        same = sum(a == b for a, b in zip(bullet_hits, analytic_hits))
+        missed_edges = sum(is_edge(b) and not is_edge(a) for a, b in zip(bullet_hits, analytic_hits))
+        print("  same result:        %d of %d rays, %d edges missed by pybullet" % (same, len(starts),
+                                                                                    missed_edges))
+
+        # the middle of each edge, where no node disc is on top of it
+        edge_starts, edge_ends = get_edge_rays(sphere, edges)
+        picked = analytic_ray.cast_rays(edge_starts, edge_ends)[0]
+        hit = sum(item is edge for item, edge in zip(picked, edges))
+        on_top = sum(item is not None and item.type in ('sphere_node', 'socket') for item in picked)
+        print("  edges picked:       %d of %d, %d below a node disc" % (hit, len(edges), on_top))
+
+        bullet_ray.bullet.disconnect()
+
+
+if __name__ == '__main__':
+    main()
@@ -6,6 +6,7 @@ Calculation module. Contains calculations used in several modules.
 
 from pyrr import Vector3, Vector4, vector, matrix44, quaternion, Quaternion
 from sphere_base.utils.utils import dump_exception
+import numpy as np
 import math
 
 
@@ -33,14 +34,51 @@ class Calc:
 
         """
 
+        return Calc.get_direction_pointing_outwards(item.xyz, sphere.xyz)
+
+    @staticmethod
+    def get_direction_pointing_outwards(xyz, center) -> 'Quaternion':
+        """
+        Calculates the quaternion pointing outwards from the center through the xyz position.
+
+        :param xyz: position on the surface of the sphere
+        :type xyz: ``Vector3``
+        :param center: center of the sphere
+        :type center: ``Vector3``
+        :returns: ``Quaternion``
+
+        """
+
         up = Vector3([0.0, 1.0, 0.0])
-        direction = vector.normalize(Vector3(item.xyz) - Vector3(sphere.xyz))
+        direction = vector.normalize(Vector3(xyz) - Vector3(center))
         right = vector.normalize(Vector3.cross(up, direction))
         up = Vector3.cross(Vector3(direction), Vector3(right))
-        m = matrix44.create_look_at(item.xyz, sphere.xyz, up)
+        m = matrix44.create_look_at(xyz, center, up)
 
         return quaternion.create_from_matrix(m)
 
+    @staticmethod
+    def get_rotations_pointing_outwards(positions, center, up=(0.0, 1.0, 0.0)) -> np.ndarray:
+        """
+        Vectorized version of :meth:`get_direction_pointing_outwards`. Returns the rotation matrices of
+        :meth:`~pyrr.matrix44.create_from_inverse_of_quaternion` for the quaternions pointing outwards from the
+        center through the positions, without calculating the quaternions.
+
+        :param positions: (n, 3) array with positions on the surface of the sphere
+        :type positions: ``np.array``
+        :param center: center of the sphere
+        :type center: ``Vector3``
+        :param up: the direction kept up, for sphere-local positions the world up in sphere-local coordinates
+        :type up: ``Vector3``
+        :returns: (n, 3, 3) ``np.array``
+        """
+        direction = np.asarray(positions, dtype=np.float64) - np.asarray(center, dtype=np.float64)
+        direction /= np.linalg.norm(direction, axis=-1, keepdims=True)
+        right = np.cross(np.asarray(up, dtype=np.float64), direction)
+        right /= np.linalg.norm(right, axis=-1, keepdims=True)
+
+        return np.stack([right, np.cross(direction, right), direction], axis=-2)
+
     @staticmethod
     def move_to_position(cumulative_orientation, sphere, radius) -> 'Vector4':
         """
@@ -80,6 +118,138 @@ class Calc:
 
         return Vector4(xyzw).xyz
 
+    @staticmethod
+    def slerp_array(quat1, quat2, steps) -> np.ndarray:
+        """
+        Vectorized version of ``pyrr.quaternion.slerp``. Interpolates between quat1 and quat2 for
+        every value in steps and gives the same results as calling slerp for each step.
+
+        :param quat1: start quaternion, or (m, 4) array with one start quaternion for each row of steps
+        :type quat1: ``quaternion``
+        :param quat2: end quaternion, or (m, 4) array
+        :type quat2: ``quaternion``
+        :param steps: (n,) values, or (m, n) values, between 0 and 1
+        :type steps: ``np.array``
+        :returns: (n, 4) or (m, n, 4) ``np.array`` of quaternions
+        """
+        quat1 = np.asarray(quat1, dtype=np.float64)[..., np.newaxis, :]
+        quat2 = np.asarray(quat2, dtype=np.float64)[..., np.newaxis, :]
+        t = np.clip(np.asarray(steps, dtype=np.float64), 0, 1)[..., np.newaxis]
+
+        dot = np.sum(quat1 * quat2, axis=-1, keepdims=True)
+        quat3 = np.where(dot < 0.0, -quat2, quat2)
+        dot = np.abs(dot)
+
+        # spherical interpolation, only used when the angle is large enough
+        angle = np.arccos(np.minimum(dot, 0.95))
+        res = (quat1 * np.sin(angle * (1 - t)) + quat3 * np.sin(angle * t)) / np.sin(angle)
+
+        # linear interpolation, pyrr uses the original quat2 here
+        lerp = quat1 * (1 - t) + quat2 * t
+        lerp = lerp / np.linalg.norm(lerp, axis=-1, keepdims=True)
+
+        return np.where(dot < 0.95, res, lerp)
+
+    @staticmethod
+    def move_to_positions(cumulative_orientations, center, radius) -> np.ndarray:
+        """
+        Vectorized version of :meth:`move_to_position`. Returns the xyz positions on the surface of a sphere
+        for an array of cumulative orientations.
+
+        :param cumulative_orientations: (..., 4) array of quaternions
+        :type cumulative_orientations: ``np.array``
+        :param center: xyz position of the center of the sphere
+        :type center: ``Vector3``
+        :param radius: The radius of the sphere
+        :type radius: ´´float´´
+        :returns: (..., 3) ``np.array`` positions
+        """
+        q = np.asarray(cumulative_orientations, dtype=np.float64)
+        x, y, z, w = q[..., 0], q[..., 1], q[..., 2], q[..., 3]
+
+        # the second row of the rotation matrix is the rotated y-axis
+        inverse_length = 1 / (x * x + y * y + z * z + w * w)
+        positions = np.stack([2.0 * (x * y + z * w),
+                              -x * x + y * y - z * z + w * w,
+                              2.0 * (y * z - x * w)], axis=-1)
+
+        return positions * (radius * inverse_length)[..., np.newaxis] + np.asarray(center, dtype=np.float64)
+
+    def get_edge_points(self, start, end, number_of_vertices: int, step: float, center, radius) -> np.ndarray:
+        """
+        Returns the points on the surface of a sphere between the start and end angle.
+        Gives the same points as slerp-ing and moving each point with :meth:`move_to_position`.
+
+        :param start: start angle
+        :type start: ``quaternion``
+        :param end: end angle
+        :type end: ``quaternion``
+        :param number_of_vertices: number of points
+        :type number_of_vertices: ``int``
+        :param step: increase of the slerp value for each point
+        :type step: ``float``
+        :param center: xyz position of the center of the sphere
+        :type center: ``Vector3``
+        :param radius: The radius of the sphere
+        :type radius: ´´float´´
+        :returns: (number_of_vertices, 3) ``np.array``
+        """
+        steps = np.arange(number_of_vertices) * step
+        return self.move_to_positions(self.slerp_array(start, end, steps), center, radius)
+
+    def get_many_edge_points(self, starts, ends, numbers_of_vertices, center, radius):
+        """
+        Returns the points of many edges on the same sphere at once. Each edge uses a step of
+        1 / number of vertices, like :meth:`~sphere_iot.uv_edge.SphereSurfaceEdge.create_edge`.
+
+        :param starts: (m, 4) start angles
+        :type starts: ``np.array``
+        :param ends: (m, 4) end angles
+        :type ends: ``np.array``
+        :param numbers_of_vertices: (m,) number of points on each edge
+        :type numbers_of_vertices: ``np.array``
+        :param center: xyz position of the center of the sphere
+        :type center: ``Vector3``
+        :param radius: The radius of the sphere
+        :type radius: ´´float´´
+        :returns: (total, 3) ``np.array`` with the points of all edges and (m,) ``np.array`` with the first
+            point of each edge
+        """
+        counts = np.asarray(numbers_of_vertices, dtype=np.int64)
+        firsts = np.concatenate([[0], np.cumsum(counts)[:-1]]).astype(np.int64)
+
+        # index of each point within its own edge
+        edge_index = np.repeat(np.arange(len(counts)), counts)
+        point_index = np.arange(counts.sum()) - firsts[edge_index]
+        steps = np.where(counts > 1, 1 / np.maximum(counts, 1), 1)[edge_index] * point_index
+
+        quats = self.slerp_array(np.asarray(starts)[edge_index], np.asarray(ends)[edge_index],
+                                 steps[:, np.newaxis])[:, 0]
+        return self.move_to_positions(quats, center, radius), firsts
+
+    @staticmethod
+    def create_line_buffer(points, center) -> np.ndarray:
+        """
+        Returns the interleaved vertex buffer (position, texture, normal) for an array of points on a sphere.
+        The texture coordinates are made up, the normals point away from the center.
+
+        :param points: (n, 3) positions
+        :type points: ``np.array``
+        :param center: xyz position of the center of the sphere
+        :type center: ``Vector3``
+        :returns: (n, 8) ``np.array`` of float32
+        """
+        points = np.asarray(points, dtype=np.float32).reshape(-1, 3)
+        normals = points - np.asarray(center, dtype=np.float32)
+        lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+        normals = np.divide(normals, lengths, out=np.zeros_like(normals), where=lengths > 0)
+
+        buffer = np.empty((len(points), 8), dtype=np.float32)
+        buffer[:, :3] = points
+        buffer[:, 3:5] = 1.0
+        buffer[:, 5:] = normals
+        return buffer
+
     def get_angle_from_point0(self, target_sphere, point):
         """
         calculate the angle between the sphere starting point and a point on the sphere
@@ -6,6 +6,9 @@ A module containing the Configuration class.
 """
 
 from sphere_base.utils.utils import dump_exception
+from sphere_base.shader.shader_program_cache import ShaderProgramCache
+from sphere_base.shader.camera_uniform_buffer import CameraUniformBuffer
+from sphere_base.shader.gl_state_cache import GLStateCache
 import os
 
 from importlib_resources import files
@@ -28,6 +31,9 @@ class UvConfig:
 
             - **view** - reference to the map class map widget or view.
             - **map** - Instance of :class:`~sphere_iot.uv_universe.Map`
+            - **shader_programs** - Instance of :class:`~sphere_iot.shader.shader_program_cache.ShaderProgramCache`
+            - **camera_uniforms** - Instance of :class:`~sphere_iot.shader.camera_uniform_buffer.CameraUniformBuffer`
+            - **gl_state** - Instance of :class:`~sphere_iot.shader.gl_state_cache.GLStateCache`
 
         """
         self.map = map
@@ -41,9 +47,19 @@ class UvConfig:
 
         self.mesh_id_counter = 0  # used in creating new indexes for meshes
 
+        # linked shader programs shared by all shaders using the same shader files
+        self.shader_programs = ShaderProgramCache()
+
+        # view, projection and light shared by all shader programs
+        self.camera_uniforms = CameraUniformBuffer()
+
+        # program, vertex arrays, textures and capabilities last set in OpenGL
+        self.gl_state = GLStateCache()
+
         self._win_size_changed_listeners = []
         self._view_changed_listeners = []
         self.textures = []
+        self.texture_array = None  # all textures as layers of one texture array, used for instanced rendering
 
         self.skybox_sets = self.create_skybox_set(skybox_img_dir)
         self.sphere_textures = self.create_texture_set(sphere_texture_dir)
@@ -95,13 +111,14 @@ class UvConfig:
 
     def set_view_loc(self, view):
         """
-        Setting the view matrix to be used in OpenGL
+        Setting the view matrix to be used in OpenGL. It is loaded into the camera uniform block once per frame.
 
         :param view: The view matrix
         :type view: ``Matrix``
 
         """
         self.view_loc = view
+        self.camera_uniforms.set_view(view)
         self.on_view_changed()
 
     def add_win_size_changed_listener(self, callback):
@@ -12,6 +12,7 @@ SPHERE_RADIUS = 3
 NODE_DISC_RADIUS = 0.075
 SOCKET_RADIUS = 0.015
 HOVER_MIN_DISTANCE = 10
+SPHERE_LOAD_DISTANCE = 15  # spheres loaded as placeholders build their items when the camera is closer
 
 WIDTH, HEIGHT = 720, 720
 
@@ -78,11 +79,31 @@ MODELS = {
     "sphere_lines": {"model_id": 15, "model_file_name": "line_1x1.obj", "shader": "EdgeShader",
                      "vertex_shader": "vert_sphere_edge.glsl",
                      "fragment_shader": "frag_sphere_edge.glsl", "geometry_shader": "none"},
+    "sphere_node_instanced": {"model_id": 16, "model_file_name": "node_disc1.obj", "shader": "NodeInstancedShader",
+                              "vertex_shader": "vert_node_instanced.glsl",
+                              "fragment_shader": "frag_node_instanced.glsl", "geometry_shader": "none"},
+    "circle_instanced": {"model_id": 17, "model_file_name": "vertex1.obj", "shader": "CircleInstancedShader",
+                         "vertex_shader": "vert_circle_instanced.glsl",
+                         "fragment_shader": "frag_circle.glsl", "geometry_shader": "geom_circle_instanced.glsl"},
 }
 
 SHADER_SWITCH = {"sphere_node": 0, "sphere_base": 1, "square1x1": 2, "rubber_band": 2, "sphere_small":
                  1, "socket": 2, "cube": 1, "cube_sphere": 1}
 
+# instanced rendering of node discs, sockets and circles
+INSTANCED_RENDERING = True
+INSTANCE_FLOATS = 22  # mat4 transform, vec4 color, vec2 switch and texture layer
+TEXTURE_ARRAY_SIZE = 256  # width and height of each layer in the texture array
+
+# leaving out spheres outside the view and items behind the horizon of their sphere
+VIEW_CULLING = True
+
+# collecting the draw calls of a frame and drawing them sorted by pass, program, vertex array and texture
+RENDER_QUEUE = True
+
+# frames are only rendered when the map changed, never more often than this many frames per second
+MAX_FRAME_RATE = 60
+
 EDGE_TYPE_DIRECT = 1
 TRANSPARENCY_SMALL_SPHERES = 0.8
 TRANSPARENCY_DETAIL_SPHERE = 0.5
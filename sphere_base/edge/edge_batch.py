@@ -0,0 +1,390 @@
+# -*- coding: utf-8 -*-
+
+"""
+Edge batch module. Contains the EdgeBatch class which holds the vertices of all edges on a sphere in one
+vertex buffer, so all edges can be rendered with a single ``glMultiDrawArrays`` call.
+
+"""
+
+from OpenGL.GL import *
+from sphere_base.shader.edge_batch_shader import EdgeBatchShader
+from sphere_base.utils.utils import dump_exception
+import numpy as np
+
+DEBUG = False
+
+
+class EdgeBatch:
+    Shader_class = EdgeBatchShader
+
+    """
+    Class holding all the edges of a ``Sphere`` in one OpenGL vertex buffer.
+
+    Each vertex holds its position and the slot of its edge. The color of each edge is stored at its slot
+    in a buffer texture, so changing the color of an edge for hovering or selecting only updates four floats.
+
+    Each edge owns a range of the vertex buffer with some room to grow. Moving an edge only loads its own
+    range with ``glBufferSubData``. The buffer is packed and loaded again when it is full or when too
+    much of it is no longer used.
+
+    For each edge a bounding cone, seen from the center of the sphere, is kept so edges behind the horizon
+    of the sphere are left out of the draw call.
+
+    """
+
+    def __init__(self, sphere):
+        """
+        Constructor of the ``EdgeBatch`` class.
+
+        :param sphere: The :class:`~sphere_iot.uv_sphere.Sphere` the edges are on.
+        :type sphere: :class:`~sphere_iot.uv_sphere.Sphere`
+
+        :Instance Variables:
+
+            - **sphere** - :class:`~sphere_iot.uv_sphere.Sphere`
+            - **shader** - Instance of :class:`~sphere_iot.shader.edge_batch_shader.EdgeBatchShader`
+            - **mesh_id** - index of the vertex array object and vertex buffer of the batch.
+
+        """
+        self.sphere = sphere
+        self.config = sphere.config
+        self.loader = self.sphere.map.models.loader
+        self.shader = self.__class__.Shader_class(self)
+
+        self._edges = {}  # edge -> slot
+        self._vertices = {}  # slot -> (n, 4) array with x, y, z and slot for each vertex
+        self._free_slots = []
+        self._colors = np.zeros((16, 4), dtype=np.float32)
+        self._dirty_colors = set()
+
+        self._colors_dirty = True  # the whole color buffer needs to be loaded
+
+        # slot -> sphere-local direction of the middle of the edge and the largest angle of its vertices with it
+        self._cones = np.zeros((16, 4), dtype=np.float64)
+        self._dirty_cones = set()
+
+        # each edge owns a range of the vertex buffer: slot -> [first vertex, capacity, number of vertices]
+        self._ranges = {}
+        self._end = 0  # first unused vertex at the end of the buffer
+        self._unused = 0  # vertices in ranges no longer used
+        self._vertex_capacity = 0  # number of vertices the buffer can hold
+        self._dirty_slots = set()  # edges with new vertices that are not loaded into OpenGL yet
+        self._rebuild = False  # the whole vertex buffer needs to be loaded
+        self._ranges_changed = False
+        self._draw_groups = []  # (line width, firsts, counts, slots)
+
+        self.mesh_id = None
+        self.color_buffer = None
+        self.color_texture = None
+        self._init_buffers()
+
+    def _init_buffers(self):
+        # one vertex array object and vertex buffer for all edges, the attribute is set up only once
+        self.mesh_id = self.loader.create_buffers(1)
+
+        self.config.gl_state.bind_vertex_array(self.config.VAO[self.mesh_id])
+        glBindBuffer(GL_ARRAY_BUFFER, self.config.VBO[self.mesh_id])
+        glEnableVertexAttribArray(0)
+        glVertexAttribPointer(0, 4, GL_FLOAT, GL_FALSE, 16, ctypes.c_void_p(0))
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        self.config.gl_state.bind_vertex_array(0)
+
+        self.color_buffer = glGenBuffers(1)
+        self.color_texture = glGenTextures(1)
+
+    def __len__(self):
+        return len(self._edges)
+
+    def __contains__(self, edge):
+        return edge in self._edges
+
+    def update_edge(self, edge, vertices):
+        """
+        Adds the edge to the batch or replaces its vertices. When the new vertices fit in the range of
+        the edge only this range of the vertex buffer is updated.
+
+        :param edge: the edge
+        :type edge: :class:`~sphere_iot.uv_edge.SphereSurfaceEdge`
+        :param vertices: (n, 3) positions of the points on the edge
+        :type vertices: ``np.array`` or ``list``
+        """
+        if edge not in self._edges:
+            self._edges[edge] = self._get_free_slot()
+            self.set_color(edge, edge.color)
+
+        slot = self._edges[edge]
+        vertices = np.asarray(vertices, dtype=np.float32).reshape(-1, 3)
+
+        data = np.empty((len(vertices), 4), dtype=np.float32)
+        data[:, :3] = vertices
+        data[:, 3] = slot
+        self._vertices[slot] = data
+
+        vertex_range = self._ranges.get(slot)
+        if vertex_range and len(data) <= vertex_range[1]:
+            # the edge still fits in its own range
+            if vertex_range[2] != len(data):
+                vertex_range[2] = len(data)
+                self._ranges_changed = True
+        else:
+            if vertex_range:
+                self._unused += vertex_range[1]
+            self._allocate_range(slot, len(data))
+            self._ranges_changed = True
+
+        self._dirty_slots.add(slot)
+        self._dirty_cones.add(slot)
+
+    def remove_edge(self, edge):
+        """
+        Removes the edge from the batch.
+
+        :param edge: the edge
+        :type edge: :class:`~sphere_iot.uv_edge.SphereSurfaceEdge`
+        """
+        slot = self._edges.pop(edge, None)
+        if slot is None:
+            return
+
+        self._vertices.pop(slot, None)
+        self._dirty_slots.discard(slot)
+        self._dirty_cones.discard(slot)
+        vertex_range = self._ranges.pop(slot, None)
+        if vertex_range:
+            self._unused += vertex_range[1]
+        self._free_slots.append(slot)
+        self._ranges_changed = True
+
+    @staticmethod
+    def get_range_capacity(number_of_vertices: int) -> int:
+        """
+        Returns the number of vertices reserved for an edge. Some room is left so an edge
+        can grow a little while it is dragged without moving to a new range.
+
+        :param number_of_vertices: number of vertices on the edge
+        :type number_of_vertices: ``int``
+        """
+        return number_of_vertices + number_of_vertices // 2 + 4
+
+    def _allocate_range(self, slot, number_of_vertices):
+        capacity = self.get_range_capacity(number_of_vertices)
+        if self._end + capacity > self._vertex_capacity:
+            # the buffer is full, it is rebuilt before the next draw
+            self._rebuild = True
+
+        self._ranges[slot] = [self._end, capacity, number_of_vertices]
+        self._end += capacity
+
+    def set_color(self, edge, color):
+        """
+        Changes the color of an edge. Only the color of this edge is loaded into OpenGL.
+
+        :param edge: the edge
+        :type edge: :class:`~sphere_iot.uv_edge.SphereSurfaceEdge`
+        :param color: rgba color
+        :type color: ``list``
+        """
+        slot = self._edges.get(edge)
+        if slot is None:
+            return
+
+        self._colors[slot] = color if color else [0.0, 0.0, 0.0, 0.5]
+        self._dirty_colors.add(slot)
+
+    def set_line_width(self, edge, line_width):
+        """
+        Changes the line width of an edge. The edges are drawn grouped by line width, the groups are
+        calculated again before the next draw.
+
+        :param edge: the edge
+        :type edge: :class:`~sphere_iot.uv_edge.SphereSurfaceEdge`
+        :param line_width: width of the edge in pixels
+        :type line_width: ``float``
+        """
+        if edge in self._edges:
+            self._ranges_changed = True
+
+    def _get_free_slot(self) -> int:
+        if self._free_slots:
+            return self._free_slots.pop()
+
+        slot = len(self._edges)
+        if slot >= len(self._colors):
+            # grow the color buffer
+            colors = np.zeros((len(self._colors) * 2, 4), dtype=np.float32)
+            colors[:len(self._colors)] = self._colors
+            self._colors = colors
+            self._colors_dirty = True
+
+            cones = np.zeros((len(colors), 4), dtype=np.float64)
+            cones[:len(self._cones)] = self._cones
+            self._cones = cones
+        return slot
+
+    def _load_all_vertices(self):
+        # packs the ranges of all edges and loads the whole vertex buffer into OpenGL
+        self._ranges, self._end, self._unused = {}, 0, 0
+        for slot, data in self._vertices.items():
+            capacity = self.get_range_capacity(len(data))
+            self._ranges[slot] = [self._end, capacity, len(data)]
+            self._end += capacity
+
+        self._vertex_capacity = max(self._end * 2, 1024)
+        buffer = np.zeros((self._vertex_capacity, 4), dtype=np.float32)
+        for slot, data in self._vertices.items():
+            first = self._ranges[slot][0]
+            buffer[first:first + len(data)] = data
+
+        glBindBuffer(GL_ARRAY_BUFFER, self.config.VBO[self.mesh_id])
+        glBufferData(GL_ARRAY_BUFFER, buffer.nbytes, buffer, GL_DYNAMIC_DRAW)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+        self._rebuild = False
+        self._dirty_slots = set()
+        self._ranges_changed = True
+
+        if DEBUG:
+            print("edge batch loaded", len(self._edges), "edges,", self._end, "vertices")
+
+    def _load_dirty_vertices(self):
+        # loads only the ranges of the edges that changed
+        glBindBuffer(GL_ARRAY_BUFFER, self.config.VBO[self.mesh_id])
+        for slot in self._dirty_slots:
+            data = self._vertices[slot]
+            glBufferSubData(GL_ARRAY_BUFFER, self._ranges[slot][0] * data.itemsize * 4, data.nbytes, data)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+        self._dirty_slots = set()
+
+    def _update_draw_groups(self):
+        # calculates the first vertex and number of vertices of each edge, grouped by line width
+        widths = {}
+        for edge, slot in self._edges.items():
+            vertex_range = self._ranges.get(slot)
+            if not vertex_range or vertex_range[2] == 0:
+                continue
+            firsts, counts, slots = widths.setdefault(edge.line_width, ([], [], []))
+            firsts.append(vertex_range[0])
+            counts.append(vertex_range[2])
+            slots.append(slot)
+
+        self._draw_groups = [(width, np.array(firsts, dtype=np.int32), np.array(counts, dtype=np.int32),
+                              np.array(slots, dtype=np.int64))
+                             for width, (firsts, counts, slots) in widths.items()]
+        self._ranges_changed = False
+
+    def _update_cones(self):
+        # the cones of all edges with new vertices are calculated together
+        slots = np.array([slot for slot in self._dirty_cones if len(self._vertices[slot])], dtype=np.int64)
+        self._dirty_cones = set()
+        if not len(slots):
+            return
+
+        data = [self._vertices[slot] for slot in slots]
+        counts = np.array([len(vertices) for vertices in data], dtype=np.int64)
+        firsts = np.concatenate([[0], np.cumsum(counts)[:-1]]).astype(np.int64)
+
+        directions = np.concatenate(data)[:, :3].astype(np.float64) - np.asarray(self.sphere.xyz, dtype=np.float64)
+        directions /= np.maximum(np.linalg.norm(directions, axis=1, keepdims=True), 1e-12)
+
+        axes = np.add.reduceat(directions, firsts, axis=0)
+        axes /= np.maximum(np.linalg.norm(axes, axis=1, keepdims=True), 1e-12)
+        cos = np.sum(directions * np.repeat(axes, counts, axis=0), axis=1)
+
+        self._cones[slots, :3] = axes
+        self._cones[slots, 3] = np.arccos(np.clip(np.minimum.reduceat(cos, firsts), -1.0, 1.0))
+
+    def get_visible_edges(self, edges: list) -> list:
+        """
+        Returns the edges in front of the horizon of the sphere.
+
+        :param edges: edges in the batch
+        :type edges: ``list`` of :class:`~sphere_iot.uv_edge.SphereSurfaceEdge`
+        """
+        if self._dirty_cones:
+            self._update_cones()
+
+        edges = [edge for edge in edges if edge in self._edges]
+        slots = np.array([self._edges[edge] for edge in edges], dtype=np.int64)
+        visible = self.sphere.map.culling.get_visible(self.sphere, self._cones[slots, :3], self._cones[slots, 3])
+        return [edge for edge, edge_visible in zip(edges, visible) if edge_visible]
+
+    def _load_colors(self):
+        glBindBuffer(GL_TEXTURE_BUFFER, self.color_buffer)
+
+        if self._colors_dirty:
+            glBufferData(GL_TEXTURE_BUFFER, self._colors.nbytes, self._colors, GL_DYNAMIC_DRAW)
+            self.config.gl_state.bind_texture(GL_TEXTURE_BUFFER, self.color_texture)
+            glTexBuffer(GL_TEXTURE_BUFFER, GL_RGBA32F, self.color_buffer)
+            self.config.gl_state.bind_texture(GL_TEXTURE_BUFFER, 0)
+            self._colors_dirty = False
+        else:
+            for slot in self._dirty_colors:
+                glBufferSubData(GL_TEXTURE_BUFFER, slot * 16, 16, self._colors[slot])
+
+        self._dirty_colors = set()
+        glBindBuffer(GL_TEXTURE_BUFFER, 0)
+
+    def update_buffers(self):
+        """
+        Loads the vertices of the edges that changed into OpenGL.
+        """
+        if self._rebuild or self._unused > self._end // 2:
+            self._load_all_vertices()
+        elif self._dirty_slots:
+            self._load_dirty_vertices()
+
+        if self._ranges_changed:
+            self._update_draw_groups()
+
+    def get_edge_ranges(self) -> list:
+        """
+        Returns the first vertex and the number of vertices of each edge in the vertex buffer. Call
+        :meth:`update_buffers` first, so the ranges are the ones loaded into OpenGL.
+
+        :returns: ``list`` of (edge, first vertex, number of vertices)
+        """
+        edge_ranges = []
+        for edge, slot in self._edges.items():
+            vertex_range = self._ranges.get(slot)
+            if vertex_range and vertex_range[2] > 1:
+                edge_ranges.append((edge, vertex_range[0], vertex_range[2]))
+        return edge_ranges
+
+    def draw(self):
+        """
+        Submits the edges to the render queue of the map, they are rendered with :meth:`render`.
+        """
+        if not self._edges:
+            return
+
+        self.sphere.map.render_queue.submit(self.render, shader=self.shader, mesh_index=self.mesh_id,
+                                            texture=self.color_texture)
+
+    def render(self):
+        """
+        Renders all edges in front of the horizon of the sphere with one draw call for each line width.
+        """
+        if not self._edges:
+            return
+
+        try:
+            self.update_buffers()
+
+            if self._colors_dirty or self._dirty_colors:
+                self._load_colors()
+
+            if self._dirty_cones:
+                self._update_cones()
+
+            culling = self.sphere.map.culling
+            for line_width, firsts, counts, slots in self._draw_groups:
+                visible = culling.get_visible(self.sphere, self._cones[slots, :3], self._cones[slots, 3])
+                if not visible.all():
+                    firsts, counts = firsts[visible], counts[visible]
+
+                self.shader.draw_batch(mesh_index=self.mesh_id, firsts=firsts, counts=counts,
+                                       position=self.sphere.xyz, orientation=self.sphere.orientation,
+                                       color_texture=self.color_texture, line_width=line_width)
+        except Exception as e:
+            dump_exception(e)
@@ -11,6 +11,7 @@ from sphere_base.edge.graphic_edge import GraphicEdge
 from sphere_base.shader.sphere_shader import SphereShader
 from sphere_base.model.model import Model
 from sphere_base.utils.utils import dump_exception
+from functools import partial
 
 
 class EdgeDrag:
@@ -125,6 +126,9 @@ class EdgeDrag:
         """
         try:
             if self._dragging:
-                self.model.shader.draw_edge(self.pos_array, width=2, color=[0, 0, 0, 1], dotted=True)
+                shader = self.model.shader
+                self.map.render_queue.submit(
+                    partial(shader.draw_edge, list(self.pos_array), width=2, color=[0, 0, 0, 1], dotted=True),
+                    shader=shader)
         except Exception as e:
             dump_exception(e)
@@ -5,7 +5,7 @@ Module Graphic Edge. The graphics edge is used with edges.
 
 """
 
-from pyrr import quaternion
+from pyrr import quaternion, Vector3
 from sphere_base.calc import Calc
 import math
 
@@ -66,7 +66,7 @@ class GraphicEdge:
 
         """
         # shortest distance over the surface of the globe between start socket and edge-end
-        length = self.calc.get_distance_on_sphere(end_xyz, start_xyz, radius)
+        length = self.calc.get_distance_on_sphere(Vector3(end_xyz), Vector3(start_xyz), radius)
         return int(math.ceil(length / unit_length))
 
     def get_position(self, pos_orientation_offset, radius=None):
@@ -6,13 +6,10 @@ Edges are drawn between sockets over the surface of a sphere_base.
 
 """
 
-from pyrr import quaternion, vector, Vector3
+from pyrr import quaternion
 from sphere_base.edge.graphic_edge import GraphicEdge
 from sphere_base.utils.serializable import Serializable
-from sphere_base.model.model import Model
-from sphere_base.model.mesh import Mesh
 from collections import OrderedDict
-from sphere_base.utils.utils import dump_exception
 import numpy as np
 from sphere_base.constants import *
 
@@ -20,8 +17,6 @@ DEBUG = False
 
 
 class SurfaceEdge(Serializable):
-    Mesh_class = Mesh
-
     """
     Class representing an ``Edge`` on a ``Sphere``. ``Edges`` are drawn between ``Sphere Sockets``.
 
@@ -47,6 +42,9 @@ class SurfaceEdge(Serializable):
         When creating or dragging a node with an edge, the vertices change and need to replace the existing
         vertices before drawing the new ones.
 
+        The vertices of all edges on a sphere are stored and rendered together by the
+        :class:`~sphere_iot.edge.edge_batch.EdgeBatch` of the sphere.
+
     """
     GraphicsEdge_class = GraphicEdge
 
@@ -68,7 +66,7 @@ class SurfaceEdge(Serializable):
             - **calc** - Instance of :class:`~sphere_iot.uv_calc.UvCalc`
             - **model** - Instance of :class:`~sphere_iot.uv_models.Model`
             - **gr_edge** - Instance of :class:`~sphere_iot.uv_graphic_edge.GraphicEdge`
-            - **shader** - Instance of :class:`~sphere_iot.shader.uv_base_shader.BaseShader`
+            - **edge_batch** - :class:`~sphere_iot.edge.edge_batch.EdgeBatch` of the sphere rendering this edge
 
         """
 
@@ -86,49 +84,94 @@ class SurfaceEdge(Serializable):
         self.xyz, self.pos_orientation_offset = None, None
         self.collision_object_id = None
         self.vert = []  # vertices needed for pybullet mouse ray
-        self.serialized_detail_scene = None
+        self._serialized_detail_scene = None
         self._edge_moved = False
-        self.line_width = 2
+        self._line_width = 2
         self.scale = [1.0, 1.0, 1.0]
+        self.edge_batch = self.sphere.edge_batch
+        self._color = None
         self.color = self.gr_edge.color
-        self.edge_type = 0
-        self.orientation = self.sphere.orientation
+        self._edge_type = 0
         self._new_edge = True
-        self.model = self.set_up_model('edge')
-
-        self.mesh = self.model.meshes[0]
-        self.mesh_id = self.mesh.mesh_id
-
-        self.model.name = 'edge_' + str(self.mesh_id)
 
         self.radius = self.sphere.radius  # - 0.01
         self.sphere.add_item(self)  # register the edge to the base for rendering
         self.create_edge()
 
-    def set_up_model(self, model_name):
-        shader, vertex_shader, fragment_shader, geometry_shader = None, None, None, None
-
-        # get the shaders for the edge
-        for _name in MODELS.keys():
-            if _name == model_name:
-                shader = MODELS[_name]["shader"]
-                vertex_shader = MODELS[_name]["vertex_shader"]
-                fragment_shader = MODELS[_name]["fragment_shader"]
-                geometry_shader = MODELS[_name]["geometry_shader"]
-                geometry_shader = None if geometry_shader == "none" else geometry_shader
-
-        # create a model for the edge
-        model = Model(
-                      models=self.uv.models,
-                      model_id=0,
-                      model_name=model_name,
-                      obj_file="",
-                      shader=shader,
-                      vertex_shader=vertex_shader,
-                      fragment_shader=fragment_shader,
-                      geometry_shader=geometry_shader)
-
-        return model
+    @property
+    def orientation(self):
+        """
+        The vertices of the edge are sphere-local, the edge rotates with the sphere_base.
+
+        :getter: Returns the orientation of the sphere_base
+        :type: ``quaternion``
+        """
+        return self.sphere.orientation
+
+    @property
+    def color(self):
+        """
+        Color of the edge
+
+        :getter: Returns the rgba color
+        :setter: Sets the color and passes it on to the edge batch
+        :type: ``list``
+        """
+        return self._color
+
+    @color.setter
+    def color(self, color):
+        self._color = color
+        self.edge_batch.set_color(self, color)
+
+    @property
+    def line_width(self):
+        """
+        Width of the edge in pixels
+
+        :getter: Returns the line width
+        :setter: Sets the line width and passes it on to the edge batch
+        :type: ``float``
+        """
+        return self._line_width
+
+    @line_width.setter
+    def line_width(self, line_width):
+        if line_width != self._line_width:
+            self._line_width = line_width
+            self.edge_batch.set_line_width(self, line_width)
+
+    @property
+    def edge_type(self):
+        """
+        Type of the edge
+
+        :getter: Returns the edge type
+        :setter: Sets the edge type and marks the edge as changed in the history of the sphere_base
+        :type: ``int``
+        """
+        return self._edge_type
+
+    @edge_type.setter
+    def edge_type(self, edge_type):
+        self._edge_type = edge_type
+        self.sphere.history.mark_changed(self)
+
+    @property
+    def serialized_detail_scene(self):
+        """
+        The ``json`` data of the detail scene of this edge
+
+        :getter: Returns the detail scene
+        :setter: Sets the detail scene and marks the edge as changed in the history of the sphere_base
+        :type: ``dict``
+        """
+        return self._serialized_detail_scene
+
+    @serialized_detail_scene.setter
+    def serialized_detail_scene(self, value):
+        self._serialized_detail_scene = value
+        self.sphere.history.mark_changed(self)
 
     @property
     def start_socket(self):
@@ -157,6 +200,8 @@ class SurfaceEdge(Serializable):
             self.xyz = self.sphere.xyz
             self.pos_orientation_offset = self.start_socket.pos_orientation_offset
 
+        self.sphere.update_edge_index(self)
+
     @property
     def end_socket(self):
         """
@@ -182,25 +227,19 @@ class SurfaceEdge(Serializable):
         if self.end_socket is not None:
             self.end_socket.add_edge(self)
 
+        self.sphere.update_edge_index(self)
+
     def update_collision_object(self):
-        # set the collision object for mouse pointer ray collision
-        self.sphere.map.mouse_ray.reset_position_collision_object(self, self.vert)
+        # the collision object for mouse pointer ray collision is updated before the next ray is cast
+        self.sphere.map.mouse_ray.mark_collision_object_dirty(self)
 
     def update_position(self):
-        """º
-        Recreate the edge when any of the sockets positions change
-
         """
+        Recreate the edge when any of the sockets positions change. Rotating the sphere_base does not
+        change the sphere-local vertices of the edge.
 
-        a = set(self.orientation)
-        b = set(self.sphere.orientation)
-
-        if a == b:
-            # socket(s) have changed
-            self.create_edge()
-        else:
-            # sphere rotates - just update the rotation
-            self.orientation = self.sphere.orientation
+        """
+        self.create_edge()
 
     def create_edge(self):
         # create an edge for the first time or recreate it during dragging
@@ -214,10 +253,62 @@ class SurfaceEdge(Serializable):
             if count > 0:
                 self.update_line_points_position(count, step)
 
+    @staticmethod
+    def create_edges(edges: list):
+        """
+        Creates the vertices of many new edges on the same sphere_base at once. Gives the same vertices as
+        calling :meth:`create_edge` for each edge. The collision objects are marked as dirty and created
+        together before the next mouse ray is cast.
+
+        :param edges: new edges with a start and an end socket
+        :type edges: ``list``
+        """
+        if not edges:
+            return
+
+        sphere = edges[0].sphere
+        calc = sphere.calc
+
+        # the distance over the surface does not depend on the rotation of the sphere_base
+        start_xyz = np.array([edge.start_socket.local_xyz for edge in edges], dtype=np.float64)
+        end_xyz = np.array([edge.end_socket.local_xyz for edge in edges], dtype=np.float64)
+        radius = np.array([edge.radius for edge in edges], dtype=np.float64)
+        unit_length = np.array([edge.gr_edge.unit_length for edge in edges], dtype=np.float64)
+
+        distance = np.linalg.norm(end_xyz - start_xyz, axis=1)
+        length = 2 * np.arcsin(np.minimum(distance / 2 / radius, 1.0)) * radius
+        counts = np.ceil(length / unit_length).astype(np.int64)
+
+        # edges between sockets at the same position have no vertices, like in create_edge
+        keep = np.flatnonzero(counts > 0)
+        edges = [edges[i] for i in keep]
+        counts, length = counts[keep], length[keep]
+
+        # get clearance from the start and end socket, as in get_edge_start_end
+        start_angles = np.array([edge.start_socket.pos_orientation_offset for edge in edges], dtype=np.float64)
+        end_angles = np.array([edge.end_socket.pos_orientation_offset for edge in edges], dtype=np.float64)
+        r0 = np.array([edge.start_socket.node.gr_node.node_disc_radius for edge in edges], dtype=np.float64)
+        r1 = np.array([edge.end_socket.node.gr_node.node_disc_radius for edge in edges], dtype=np.float64)
+
+        starts = calc.slerp_array(start_angles, end_angles, (r0 * .9 / length)[:, np.newaxis])[:, 0]
+        ends = calc.slerp_array(end_angles, start_angles, (r1 * .5 / length)[:, np.newaxis])[:, 0]
+
+        points, firsts = calc.get_many_edge_points(starts, ends, counts, sphere.xyz, sphere.radius)
+
+        for edge, first, count in zip(edges, firsts, counts):
+            vertices = points[first:first + count]
+            edge.vert = vertices.tolist()  # we need this for pybullet
+            edge.xyz = sphere.xyz
+            edge.edge_batch.update_edge(edge, vertices)
+
+            # the collision object is created with those of the other new items
+            edge._new_edge = False
+            edge.update_collision_object()
+
     def update_line_points_position(self, number_of_vertices: int, step: float):
         """
         Creates an array of vertex locations. SLERP is used to find angles with the center of the sphere_base for
-        each of the points. Each point receives also a normal.
+        each of the points.
 
         :param number_of_vertices: Number of points on the edge
         :type number_of_vertices: ``int``
@@ -226,49 +317,19 @@ class SurfaceEdge(Serializable):
         """
 
         start, end = self.get_edge_start_end()
-        self.vert = []
-        vertices = []  # vertex coordinates
-        buffer = []
-        indices = []
-
-        tex = [1.0, 1.0]  # made up surface edge, that needs to be added to the buffer
-        for i in range(number_of_vertices):
-            pos = quaternion.slerp(start, end, step * i)
 
-            p = self.calc.move_to_position(pos, self.sphere, self.sphere.radius)
-            n = vector.normalize(Vector3(p) - Vector3(self.sphere.xyz))  # finding the normal of the vertex
-
-            vertices, buffer, indices = self.expand_mesh(vertices, buffer, indices, p, tex, n, i)
+        # all points at once, the same as slerp-ing and moving each point to its position
+        points = self.calc.get_edge_points(start, end, number_of_vertices, step, self.sphere.xyz,
+                                           self.sphere.radius)
+        self.vert = points.tolist()  # we need this for pybullet
 
         if self._new_edge:
             # creating a collision object for mouse ray collisions
             self.collision_object_id = self.sphere.map.mouse_ray.create_collision_object(self, self.vert)
             self._new_edge = False
 
-        self.mesh.vertices = np.array(vertices, dtype=np.float32)
-        self.mesh.indices = np.array(indices, dtype='uint32')
-        self.mesh.buffer = np.array(buffer, dtype=np.float32)
-        self.mesh.indices_len = len(indices)
-
         self.xyz = self.sphere.xyz
-        self.model.loader.load_mesh_into_opengl(self.mesh_id, self.mesh.buffer,
-                                                self.mesh.indices, self.model.shader)
-
-    def expand_mesh(self, vertices, buffer, indices, point, texture, normals, i):
-        # This can be used to expanding each point into a mesh.
-        p = point
-        self.vert.append([p[0], p[1], p[2]])  # we need this for pybullet
-        vertices.extend(p)  # extending the vertices list with the vertex
-        buffer = self.extend_buffer(buffer, point, texture, normals)
-        indices.append(i)
-        return vertices, buffer, indices
-
-    @staticmethod
-    def extend_buffer(buffer, vertex, texture, normal):
-        buffer.extend(vertex)  # extending the buffer with the vertex
-        buffer.extend(texture)  # extending the buffer with the texture
-        buffer.extend(normal)  # extending the buffer with the normal
-        return buffer
+        self.edge_batch.update_edge(self, self.vert)
 
     def get_edge_start_end(self):
         """
@@ -342,17 +403,14 @@ class SurfaceEdge(Serializable):
         self.end_socket.remove_edge(self)
         self.sphere.remove_item(self)
 
-        if self.collision_object_id:
-            self.sphere.map.mouse_ray.delete_collision_object(self)
+        self.sphere.map.mouse_ray.delete_collision_object(self)
 
     def draw(self):
         """
-        Renders the edge.
+        Edges are rendered all at once by the :class:`~sphere_iot.edge.edge_batch.EdgeBatch` of the sphere.
+        Can be overridden to draw more than the edge line.
         """
-        try:
-            self.model.draw(self, color=self.color, line_width=self.line_width)
-        except Exception as e:
-            dump_exception(e)
+        pass
 
     def serialize(self):
         return OrderedDict([
@@ -366,7 +424,7 @@ class SurfaceEdge(Serializable):
 
     def deserialize(self, data: dict, hashmap: dict = None, restore_id: bool = True) -> bool:
         if restore_id:
-            self.id = data['id']
+            self.sphere.set_item_id(self, data['id'])
         self.edge_type = data['edge_type']
         self.start_socket = self.sphere.get_item_by_id(data['start_socket_id'])
         self.end_socket = self.sphere.get_item_by_id(data['end_socket_id'])
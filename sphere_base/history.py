@@ -4,13 +4,27 @@
 
     A module containing all the code for working with history on a single sphere (Undo/Redo)
 
+    Each history stamp only holds the nodes and edges that changed since the previous stamp, with their
+    serialized data before and after the change. Undo and redo apply these changes to the sphere, so their
+    cost depends on the size of the change and not on the size of the sphere.
+
+    The data of an unchanged item is not copied, the stamps share it. Older stamps are compressed and
+    the oldest stamps are dropped when the history uses more memory than its budget.
+
 """
 
 from sphere_base.utils.utils import dump_exception
+import json
+import zlib
 
 DEBUG_STORE = False
 DEBUG_RESTORE = False
 
+UNCOMPRESSED_STAMPS = 4  # number of the most recent history stamps that are not compressed
+
+# item type -> key used for the items in the serialized sphere
+HISTORY_ITEM_TYPES = {'sphere_node': 'sphere_nodes', 'edge': 'edges'}
+
 
 class History:
 
@@ -24,15 +38,11 @@ class History:
         Instance Variables:
 
             - **sphere_base** - :class:`~sphere_iot.uv_sphere.Sphere`.
-            - **current_img_id** - id of the current active image.
-            - **last_img_id** - id of the last active image.
-            - **default_img_id** - id of the default image
-            - **selected_img_id** - id of the image when the item is _selected.
-            - **hover_img_id** - id of the image when the item is hovered with the mouse pointer.
-            - **default_background_color** - ``list``
-            - **selected_background_color** - ``list``
-            - **hover_background_color** - ``list``
-            - **current_background_color** - ``list``
+            - **history_limit** - maximum number of history stamps.
+            - **memory_budget** - maximum number of bytes used by the history stamps of this sphere or ``None``.
+              The :class:`~sphere_iot.uv_universe.Map` can also have a budget for all spheres together.
+            - **history_stack** - ``list`` with the history stamps.
+            - **history_current_step** - index of the history stamp matching the current state of the sphere.
 
         """
 
@@ -41,6 +51,7 @@ class History:
 
         # history limit per Sphere
         self.history_limit = 32
+        self.memory_budget = None
 
         self.undo_selection_has_changed = False
 
@@ -52,10 +63,31 @@ class History:
 
         self.history_current_step = -1
 
+        # serialized data of the nodes and edges at the current history stamp: (key, id) -> data
+        self._item_data = {}
+        # nodes and edges changed since the current history stamp: (key, id) -> None
+        self._changed_items = {}
+
     def clear(self):
         # Reset the history stack
         self.history_stack = []
         self.history_current_step = -1
+        self._item_data = {}
+        self._changed_items = {}
+
+    def mark_changed(self, item):
+        """
+        Marks a node or edge as changed. Only marked items are serialized when the next history stamp is
+        stored. The ``Sphere`` marks items when they are added, removed, moved or get a new id. Setting the
+        ``serialized_detail_scene`` of a node, socket or edge, or the ``edge_type`` of an edge, marks the item
+        as well. Code changing the serialized data of an item in any other way needs to call this method.
+
+        :param item: the changed item, other items than nodes and edges are ignored
+        :type item: :class:`~sphere_iot.uv_node.Node` or :class:`~sphere_iot.uv_edge.SphereSurfaceEdge`
+        """
+        key = HISTORY_ITEM_TYPES.get(item.type)
+        if key:
+            self._changed_items[(key, item.id)] = None
 
     def store_initial_history_stamp(self):
         # Helper function usually used when new or open file requested
@@ -106,8 +138,9 @@ class History:
             print("UNDO")
 
         if self.can_undo():
+            changes = self.get_changes(self.history_stack[self.history_current_step])
             self.history_current_step -= 1
-            self.restore_history()
+            self.restore_history({key: before for key, (before, after) in changes.items()})
             self.sphere.has_been_modified = True
 
     def redo(self):
@@ -119,7 +152,8 @@ class History:
             print("REDO")
         if self.can_redo():
             self.history_current_step += 1
-            self.restore_history()
+            changes = self.get_changes(self.history_stack[self.history_current_step])
+            self.restore_history({key: after for key, (before, after) in changes.items()})
             self.sphere.has_been_modified = True
 
     def store_history(self, description: str, set_modified: bool = False):
@@ -148,14 +182,16 @@ class History:
 
         # history is exceeding the limits
         if self.history_current_step + 1 >= self.history_limit:
-            self.history_stack = self.history_stack[1:]
-            self.history_current_step -= 1
+            self.remove_oldest_stamp()
 
         history_stamp = self.create_history_stamp(description)
 
         self.history_stack.append(history_stamp)
         self.history_current_step += 1
 
+        self.compress_old_stamps()
+        self.limit_memory_usage()
+
         if DEBUG_STORE:
             print("  -- setting step to:", self.history_current_step)
 
@@ -191,44 +227,254 @@ class History:
 
     def create_history_stamp(self, description: str) -> dict:
         """
-        Create History Stamp. Internally serialize whole sphere and current selection.
+        Create History Stamp. Internally serialize the nodes and edges that changed since the last
+        History Stamp, the state of the sphere and the current selection.
+
         :param description: Descriptive label for the History Stamp
-        :return: serializing state of `Sphere` and current selection
+        :return: changes of the `Sphere` and current selection
         :rtype: ``dict``
         """
         if DEBUG_STORE:
             print("  -- create history time stamp")
         history_stamp = {
             'description': description,
-            'snapshot': self.sphere.serialize(),
-            # 'snapshot': self.map.serialize(),
+            'sphere': self.capture_sphere_state(),
+            'changes': self.capture_changes(),
             'selection': self.capture_current_selection(),
         }
+        history_stamp['size'] = self.get_stamp_size(history_stamp)
 
         return history_stamp
 
-    def restore_history(self):
+    @staticmethod
+    def get_stamp_size(history_stamp: dict) -> int:
+        """
+        Returns the number of bytes used by the History Stamp. For a stamp that is not compressed it is the size of
+        its data as json, for a compressed stamp the size of the compressed data.
+
+        :param history_stamp: History Stamp
+        :type history_stamp: ``dict``
+        :returns: ``int``
+        """
+        if 'compressed_changes' in history_stamp:
+            changes_size = len(history_stamp['compressed_changes'])
+        else:
+            # an estimate, values that are not json are counted as their string
+            changes_size = len(json.dumps([[key[0], key[1], before, after] for key, (before, after)
+                                           in history_stamp['changes'].items()], default=str))
+        return changes_size + len(json.dumps([history_stamp['sphere'], history_stamp['selection']], default=str))
+
+    @staticmethod
+    def encode_changes(changes: dict) -> bytes:
+        # the keys are tuples, json needs a list. Values that are not json raise a TypeError.
+        return json.dumps([[key[0], key[1], before, after] for key, (before, after) in changes.items()]).encode()
+
+    @staticmethod
+    def decode_changes(data: bytes) -> dict:
+        return {(kind, item_id): (before, after) for kind, item_id, before, after in json.loads(data)}
+
+    def get_changes(self, history_stamp: dict) -> dict:
+        """
+        Returns the changes of the History Stamp, decompressed when the stamp is compressed.
+
+        :param history_stamp: History Stamp
+        :type history_stamp: ``dict``
+        :returns: ``dict`` (key, id) -> (data before, data after)
+        """
+        if 'compressed_changes' in history_stamp:
+            return self.decode_changes(zlib.decompress(history_stamp['compressed_changes']))
+        return history_stamp['changes']
+
+    def compress_old_stamps(self):
+        """
+        Compresses the changes of the stamps older than the most recent ``UNCOMPRESSED_STAMPS``.
+        Stamps that cannot be stored as json are left as they are, as are stamps that json would change, for
+        instance a tuple that would come back as a list. Undo and redo give the same result for old stamps.
+        """
+        for history_stamp in self.history_stack[:-UNCOMPRESSED_STAMPS]:
+            if 'changes' not in history_stamp:
+                continue
+            try:
+                data = self.encode_changes(history_stamp['changes'])
+            except (TypeError, ValueError):
+                continue
+            if self.decode_changes(data) != history_stamp['changes']:
+                continue
+            history_stamp['compressed_changes'] = zlib.compress(data)
+            del history_stamp['changes']
+            history_stamp['size'] = self.get_stamp_size(history_stamp)
+
+    def remove_oldest_stamp(self) -> bool:
+        """
+        Removes the oldest History Stamp. The current stamp is never removed.
+
+        :returns: ``True`` when a stamp was removed
+        """
+        if self.history_current_step < 1:
+            return False
+
+        self.history_stack = self.history_stack[1:]
+        self.history_current_step -= 1
+
+        # the oldest stamp cannot be undone
+        oldest = self.history_stack[0]
+        oldest.pop('compressed_changes', None)
+        oldest['changes'] = {}
+        oldest['size'] = self.get_stamp_size(oldest)
+        return True
+
+    def get_memory_usage(self) -> int:
+        """
+        Returns the number of bytes used by the History Stamps of this sphere.
+
+        :returns: ``int``
+        """
+        return sum(history_stamp['size'] for history_stamp in self.history_stack)
+
+    def limit_memory_usage(self):
+        """
+        Removes the oldest History Stamps until the history of this sphere fits in its memory budget,
+        and the histories of all spheres fit in the memory budget of the map.
+        """
+        if self.memory_budget is not None:
+            while self.get_memory_usage() > self.memory_budget and self.remove_oldest_stamp():
+                pass
+
+        map_budget = getattr(self.uv, 'history_memory_budget', None)
+        if map_budget is not None:
+            self.uv.limit_history_memory_usage(map_budget)
+
+    def capture_sphere_state(self) -> dict:
+        """
+        Returns the state of the sphere itself, without the items on it.
+
+        """
+        return self.sphere.serialize_state()
+
+    def capture_changes(self) -> dict:
+        """
+        Serializes the nodes and edges that changed since the last History Stamp.
+
+        :returns: ``dict`` (key, id) -> (data before, data after). The data is ``None`` when the item did not exist.
+        """
+        if not self.history_stack:
+            # the first stamp holds no changes, it is the start of the history
+            self._item_data = {(HISTORY_ITEM_TYPES[item.type], item.id): item.serialize()
+                               for item in (*self.sphere.nodes, *self.sphere.edges)}
+            self._changed_items = {}
+            return {}
+
+        changes = {}
+        for key in self._changed_items:
+            item = self.get_item(key)
+            data = item.serialize() if item else None
+            before = self._item_data.get(key)
+            if data != before:
+                changes[key] = (before, data)
+                if data is None:
+                    del self._item_data[key]
+                else:
+                    self._item_data[key] = data
+
+        self._changed_items = {}
+
+        if DEBUG_STORE:
+            print("  -- changes: ", list(changes))
+        return changes
+
+    def get_item(self, key):
+        """
+        Returns the node or edge on the sphere matching the key.
+
+        :param key: 'sphere_nodes' or 'edges' and the id of the item
+        :type key: ``tuple``
+        :returns: :class:`~sphere_iot.uv_node.Node`, :class:`~sphere_iot.uv_edge.SphereSurfaceEdge` or ``None``
+        """
+        item = self.sphere.get_item_by_id(key[1])
+        if item is not None and HISTORY_ITEM_TYPES.get(item.type) == key[0]:
+            return item
+        return None
+
+    def restore_history(self, changes: dict = None):
         """
         Restore `History Stamp` from `History stack`
 
+        :param changes: (key, id) -> serialized data of the nodes and edges to restore
+        :type changes: ``dict``
         """
         if DEBUG_RESTORE:
             print("Restoring history",
                   ".... current_step: @%d" % self.history_current_step,
                   "(%d)" % len(self.history_stack))
 
-        self.restore_history_stamp(self.history_stack[self.history_current_step])
+        self.restore_history_stamp(self.history_stack[self.history_current_step], changes)
         for callback in self._history_modified_listeners:
             callback()
         for callback in self._history_restored_listeners:
             callback()
 
-    def restore_history_stamp(self, history_stamp: dict):
+    def restore_changes(self, changes: dict):
+        """
+        Brings the nodes and edges in the changes to their serialized state. Items changed after the current
+        History Stamp are restored too.
+
+        :param changes: (key, id) -> serialized data, ``None`` when the item has to be removed
+        :type changes: ``dict``
+        """
+        changes = dict(changes)
+        for key in self._changed_items:
+            changes.setdefault(key, self._item_data.get(key))
+
+        # leave out the items that are already in the right state
+        for key, data in list(changes.items()):
+            item = self.get_item(key)
+            if (item.serialize() if item else None) == data:
+                del changes[key]
+
+        # removing edges before nodes, removing a node also removes its edges
+        for kind in ('edges', 'sphere_nodes'):
+            for key, data in changes.items():
+                item = self.get_item(key)
+                if key[0] == kind and data is None and item:
+                    try:
+                        item.remove()
+                    except Exception as e:
+                        dump_exception(e)
+
+        # restoring nodes before edges, the edges need the sockets of the nodes
+        hashmap = {}
+        for kind in ('sphere_nodes', 'edges'):
+            for key, data in changes.items():
+                if key[0] != kind or data is None:
+                    continue
+                try:
+                    item = self.get_item(key)
+                    if item is None:
+                        if kind == 'sphere_nodes':
+                            item = self.sphere.get_node_class_from_data(data)(self.sphere)
+                        else:
+                            item = self.sphere.Edge(self.sphere)
+                    item.deserialize(data, hashmap, restore_id=True)
+                except Exception as e:
+                    dump_exception(e)
+
+        for key, data in changes.items():
+            if data is None:
+                self._item_data.pop(key, None)
+            else:
+                self._item_data[key] = data
+
+        # restoring marks items as changed while they are now in the state of the current History Stamp
+        self._changed_items = {}
+
+    def restore_history_stamp(self, history_stamp: dict, changes: dict = None):
         """
         Restore History Stamp to current `Scene` with selection of items included
 
         :param history_stamp: History Stamp to restore
         :type history_stamp: ``dict``
+        :param changes: (key, id) -> serialized data of the nodes and edges to restore
+        :type changes: ``dict``
 
         """
         if DEBUG_RESTORE:
@@ -241,7 +487,8 @@ class History:
                 print("_selected nodes before restore:", previous_selection['sphere_nodes'])
                 print("_selected edges before restore:", previous_selection['edges'])
 
-            self.sphere.deserialize(history_stamp['snapshot'])
+            self.sphere.deserialize_state(history_stamp['sphere'])
+            self.restore_changes(changes if changes else {})
 
             # restore selection
 
@@ -251,17 +498,15 @@ class History:
 
             # now restore _selected edges from history_stamp
             for edge_id in history_stamp['selection']['edges']:
-                for item in self.sphere.items:
-                    if item.id == edge_id:
-                        self.sphere.select_item(item, True)
-                        break
+                item = self.sphere.get_item_by_id(edge_id)
+                if item:
+                    self.sphere.select_item(item, True)
 
             # now restore _selected nodes from history_stamp
             for node_id in history_stamp['selection']['sphere_nodes']:
-                for item in self.sphere.items:
-                    if item.id == node_id:
-                        self.sphere.select_item(item, True)
-                        break
+                item = self.sphere.get_item_by_id(node_id)
+                if item:
+                    self.sphere.select_item(item, True)
 
             current_selection = self.capture_current_selection()
             if DEBUG_RESTORE:
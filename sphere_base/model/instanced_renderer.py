@@ -0,0 +1,247 @@
+# -*- coding: utf-8 -*-
+
+"""
+Module instanced renderer. Draws all node discs, sockets and circles of a sphere with one instanced
+draw call per model instead of four draw calls per node. The instances are in sphere-local coordinates,
+the rotation and position of the sphere are applied by the shader.
+
+"""
+
+from OpenGL.GL import *
+from sphere_base.constants import *
+from sphere_base.utils.utils import dump_exception
+from sphere_base.calc import Calc
+from functools import partial
+import numpy as np
+
+# shader switches used in frag_node_instanced.glsl
+SWITCH_ICON = 0
+SWITCH_BACKGROUND = 2
+SWITCH_SOCKET = 3
+
+DEFAULT_COLOR = [0.0, 0.0, 0.0, 0.5]
+
+
+class InstancedRenderer:
+
+    def __init__(self, map):
+        """
+        Constructor of the ``InstancedRenderer`` class.
+
+        :param map: reference to the :class:`~sphere_iot.uv_universe.Map`
+        :type map: :class:`~sphere_iot.uv_universe.Map`
+
+        :Instance Variables:
+
+            - **config** - :class:`~sphere_iot.uv_config.UvConfig`
+            - **node_model** - instanced :class:`~sphere_iot.uv_models.Model` for node discs and sockets.
+            - **circle_model** - instanced :class:`~sphere_iot.uv_models.Model` for the circles.
+            - **node_buffer** - id of the instance buffer of the node discs.
+            - **circle_buffer** - id of the instance buffer of the circles.
+
+        """
+        self.map = map
+        self.config = map.config
+        self.models = map.models
+        self.loader = self.models.loader
+
+        self.node_model = self.models.get_model('sphere_node_instanced')
+        self.circle_model = self.models.get_model('circle_instanced')
+        self.node_mesh = self.node_model.meshes[0]
+        self.circle_mesh = self.circle_model.meshes[0]
+
+        self.node_buffer = self.loader.create_instance_buffer(self.node_mesh.mesh_id)
+        self.circle_buffer = self.loader.create_instance_buffer(self.circle_mesh.mesh_id)
+
+        # size in bytes currently allocated for each instance buffer
+        self._capacity = {self.node_buffer: 0, self.circle_buffer: 0}
+
+        self._default_img_id = self.config.get_img_id('')
+
+    @staticmethod
+    def can_draw(node) -> bool:
+        """
+        Returns ``True`` if the node uses the default way of drawing and can be drawn instanced.
+        Nodes overriding ``draw`` are drawn the normal way.
+
+        :param node: the node to check
+        :type node: :class:`~sphere_iot.uv_node.Node`
+        """
+        from sphere_base.node.node import Node
+        from sphere_base.node.socket import Socket
+
+        return type(node).draw is Node.draw and type(node.socket).draw is Socket.draw
+
+    @staticmethod
+    def create_instance_matrices(positions, rotations, scales):
+        """
+        Returns the combined model and transform matrices for a number of items. The result is
+        the same as ``transform * model`` calculated in :class:`~sphere_iot.shader.uv_base_shader.BaseShader`.
+
+        :param positions: (n, 3) array with the positions of the items
+        :type positions: ``np.array``
+        :param rotations: (n, 3, 3) array with the rotation matrices of the items
+        :type rotations: ``np.array``
+        :param scales: (n, 3) array with the scale of the items
+        :type scales: ``np.array``
+        :returns: (n, 4, 4) array
+        """
+        matrices = np.zeros((len(positions), 4, 4), dtype=np.float32)
+        matrices[:, :3, :3] = rotations * scales[:, :, np.newaxis]
+        matrices[:, 3, :3] = positions
+        matrices[:, 3, 3] = 1.0
+        return matrices
+
+    @staticmethod
+    def get_up(model_matrix):
+        """
+        Returns the world up in the sphere-local coordinates of the instances.
+
+        :param model_matrix: rotation and position of the sphere the instances are on
+        :type model_matrix: 4x4 ``np.array``
+        :returns: ``np.array``
+        """
+        return np.asarray(model_matrix)[:3, 1]
+
+    def create_instances(self, positions, up, scales, colors, switches, layers):
+        """
+        Packs the instance data of a number of items into one array that can be loaded into the
+        instance buffer. The items point away from the center of the sphere, turned so the world up
+        stays up as it does for :meth:`~sphere_iot.uv_calc.Calc.get_direction_pointing_outwards`.
+
+        :returns: (n, INSTANCE_FLOATS) ``np.array``
+        """
+        positions = np.array(positions, dtype=np.float32).reshape(-1, 3)
+        instances = np.empty((len(positions), INSTANCE_FLOATS), dtype=np.float32)
+        instances[:, :16] = self.create_instance_matrices(
+            positions,
+            Calc.get_rotations_pointing_outwards(positions, [0.0, 0.0, 0.0], up),
+            np.array(scales, dtype=np.float32).reshape(-1, 3)).reshape(-1, 16)
+        instances[:, 16:20] = colors
+        instances[:, 20] = switches
+        instances[:, 21] = layers
+        return instances
+
+    def load_instances(self, buffer_id, instances):
+        """
+        Loads the instance data into the instance buffer. The buffer only grows, smaller updates
+        overwrite the start of the existing buffer.
+
+        :param buffer_id: id of the instance buffer
+        :type buffer_id: ``int``
+        :param instances: instance data
+        :type instances: ``np.array``
+        """
+        glBindBuffer(GL_ARRAY_BUFFER, buffer_id)
+        if instances.nbytes > self._capacity[buffer_id]:
+            glBufferData(GL_ARRAY_BUFFER, instances.nbytes, instances, GL_DYNAMIC_DRAW)
+            self._capacity[buffer_id] = instances.nbytes
+        else:
+            glBufferSubData(GL_ARRAY_BUFFER, 0, instances.nbytes, instances)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+    def draw(self, nodes, sphere):
+        """
+        Renders the node discs, sockets and circles of all nodes received.
+
+        :param nodes: nodes to render
+        :type nodes: ``list`` of :class:`~sphere_iot.uv_node.Node`
+        :param sphere: the sphere the nodes are on
+        :type sphere: :class:`~sphere_iot.uv_sphere.Sphere`
+        """
+
+        if not nodes:
+            return
+
+        # the instance buffers are shared by all spheres, so they are loaded when the packets are drawn.
+        # The backgrounds and circles are transparent, the packets are drawn with the transparent pass.
+        try:
+            model_matrix = sphere.get_model_matrix()
+            queue = self.map.render_queue
+            queue.submit(partial(self.draw_discs, nodes, model_matrix), shader=self.node_model.shader,
+                         mesh_index=self.node_mesh.mesh_id, position=sphere.xyz, transparent=True)
+            queue.submit(partial(self.draw_circles, nodes, model_matrix), shader=self.circle_model.shader,
+                         mesh_index=self.circle_mesh.mesh_id, position=sphere.xyz, transparent=True)
+        except Exception as e:
+            dump_exception(e)
+
+    def draw_discs(self, nodes, model_matrix):
+        """
+        Renders the hovered sockets, the icons and the backgrounds of the nodes in one draw call.
+        The order of the instances is the same as the order of the draw calls in
+        :meth:`~sphere_iot.uv_node.Node.draw`.
+
+        :param nodes: nodes to render
+        :type nodes: ``list`` of :class:`~sphere_iot.uv_node.Node`
+        :param model_matrix: rotation and position of the sphere the nodes are on
+        :type model_matrix: 4x4 ``np.array``
+        """
+        positions, scales, colors, switches, layers = [], [], [], [], []
+
+        for node in nodes:
+            socket = node.socket
+            if socket.gr_socket.is_hover():
+                positions.append(socket.local_xyz)
+                scales.append(socket.scale)
+                colors.append(socket.gr_socket.current_background_color or DEFAULT_COLOR)
+                switches.append(SWITCH_SOCKET)
+                layers.append(0)
+
+            img_id = self._default_img_id if node.img_id is None else node.img_id
+
+            positions += [node.local_xyz, node.local_xyz]
+            scales += [node.scale, node.scale]
+            colors += [node.gr_node.main_image_color or DEFAULT_COLOR,
+                       node.gr_node.current_background_color or DEFAULT_COLOR]
+            switches += [SWITCH_ICON, SWITCH_BACKGROUND]
+            layers += [img_id, 0]
+
+        instances = self.create_instances(positions, self.get_up(model_matrix), scales, colors, switches, layers)
+        self.load_instances(self.node_buffer, instances)
+
+        self.node_model.shader.draw_instanced(mesh_index=self.node_mesh.mesh_id,
+                                              indices_len=self.node_mesh.indices_len,
+                                              instance_count=len(instances),
+                                              model_matrix=model_matrix)
+
+    def draw_circles(self, nodes, model_matrix):
+        """
+        Renders the circles of the nodes and the hovered sockets. OpenGL cannot change the line width
+        within a draw call, so there is one draw call for each line width used.
+
+        :param nodes: nodes to render
+        :type nodes: ``list`` of :class:`~sphere_iot.uv_node.Node`
+        :param model_matrix: rotation and position of the sphere the nodes are on
+        :type model_matrix: 4x4 ``np.array``
+        """
+        positions, scales, colors, widths = [], [], [], []
+
+        for node in nodes:
+            socket = node.socket
+            if socket.gr_socket.is_hover():
+                positions.append(socket.local_xyz)
+                scales.append(socket.gr_socket.circle_scale)
+                colors.append(socket.gr_socket.current_border_color or DEFAULT_COLOR)
+                widths.append(socket.gr_socket.current_border_width)
+
+            positions.append(node.local_xyz)
+            scales.append(node.gr_node.circle_scale)
+            colors.append(node.gr_node.current_border_color or DEFAULT_COLOR)
+            widths.append(node.gr_node.current_border_width)
+
+        # group the circles by line width
+        widths = np.array(widths, dtype=np.float32)
+        order = np.argsort(widths, kind='stable')
+        instances = self.create_instances(positions, self.get_up(model_matrix), scales, colors, 0, 0)[order]
+        self.load_instances(self.circle_buffer, instances)
+
+        # all vertices of the circle mesh are in the center, the geometry shader needs only one of them
+        line_widths, first, counts = np.unique(widths[order], return_index=True, return_counts=True)
+        for line_width, first_instance, count in zip(line_widths, first, counts):
+            self.circle_model.shader.draw_instanced(mesh_index=self.circle_mesh.mesh_id,
+                                                    indices_len=1,
+                                                    instance_count=int(count),
+                                                    first_instance=int(first_instance),
+                                                    line_width=float(line_width),
+                                                    model_matrix=model_matrix,
+                                                    object_index=self.circle_model.model_id)
@@ -16,12 +16,15 @@ from sphere_base.shader.holo_sphere_shader import HoloSphereShader
 from sphere_base.shader.sphere_small_shader import SphereSmallShader
 from sphere_base.shader.edge_shader import EdgeShader
 from sphere_base.shader.drag_edge_shader import DragEdgeShader
+from sphere_base.shader.node_instanced_shader import NodeInstancedShader
+from sphere_base.shader.circle_instanced_shader import CircleInstancedShader
 # -----------------------------------------------------------------------
 
 from sphere_base.sphere_universe.graphic_item import GraphicItem
 from sphere_base.model.mesh import Mesh
 from sphere_base.model.obj_file_loader import ObjectFileLoader
 from sphere_base.utils.utils import dump_exception
+from functools import partial
 import pathlib
 
 DEBUG = False
@@ -118,21 +121,29 @@ class Model(GraphicItem):
         :param scale: ``list`` used for scaling the model
         :type scale:   ``list``
 
+        .. note::
+
+            During a frame the meshes are submitted to the render queue of the map and drawn when the queue
+            is flushed. A color with an alpha below 1 puts the meshes in the transparent pass.
+
         """
 
-        # draws all meshes
+        # submits all meshes
         try:
             color = color if color else [0.0, 0.0, 0.0, 0.5]
+            position = parent.xyz
             for mesh in self.meshes:
-                mesh.draw(self.shader,
-                          model_id=self.model_id,
-                          position=parent.xyz,
-                          orientation=parent.orientation,
-                          scale=scale if scale else parent.scale,
-                          texture_id=texture_id,
-                          color=color,
-                          switch=switch,
-                          line_width=line_width)
+                draw = partial(mesh.draw, self.shader,
+                               model_id=self.model_id,
+                               position=position,
+                               orientation=parent.orientation,
+                               scale=scale if scale else parent.scale,
+                               texture_id=texture_id,
+                               color=color,
+                               switch=switch,
+                               line_width=line_width)
+                self.uv.render_queue.submit(draw, shader=self.shader, mesh_index=mesh.mesh_id, texture=texture_id,
+                                            position=position, transparent=color[3] < 1.0)
         except Exception as e:
             dump_exception(e)
 
@@ -40,6 +40,8 @@ class Models:
         self._models = []
         self.loader = ObjectFileLoader(self)
         self.loader.load_all_textures_into_opengl()
+        if INSTANCED_RENDERING:
+            self.loader.load_texture_array_into_opengl()
         self.Model = self.__class__.Model_class
         self.setup_models()
         self.create_all_meshes()
@@ -7,6 +7,7 @@ from importlib_resources import files
 
 import sphere_base.model.resources.meshes
 from sphere_base.model.mesh import Mesh
+from sphere_base.constants import *
 from sphere_base.utils.utils import dump_exception
 
 DEBUG = False
@@ -87,9 +88,9 @@ class ObjectFileLoader:
 
             if model.name == "square1x1" or model.name == "rubber_band":
                 vert, indices, buffer = self.load_square1x1()
-            elif model.name == "circle" or model.name == "square" or model.name == "cross_hair1":
+            elif model.name in ("circle", "square", "cross_hair1", "circle_instanced"):
                 vert, indices, buffer = self.load_vertex1()
-            elif model.name == "sphere_node" or model.name == "socket":
+            elif model.name in ("sphere_node", "socket", "sphere_node_instanced"):
                 vert, indices, buffer = self.load_node_disc()
 
             mesh_id = self.config.get_mesh_id()
@@ -183,7 +184,7 @@ class ObjectFileLoader:
         """
 
         self.context.makeCurrent(self.map_widget.surface)
-        glBindVertexArray(self.config.VAO[mesh_id])
+        self.config.gl_state.bind_vertex_array(self.config.VAO[mesh_id])
 
         # vertex Buffer Object
         glBindBuffer(GL_ARRAY_BUFFER, self.config.VBO[mesh_id])
@@ -213,7 +214,7 @@ class ObjectFileLoader:
 
         #  Bind the VBO, VAO to 0 so that we don't accidentally modify the VAO and VBO we created
         glBindBuffer(GL_ARRAY_BUFFER, 0)
-        glBindVertexArray(0)
+        self.config.gl_state.bind_vertex_array(0)
         # Bind the EBO to 0 so that we don't accidentally modify it
         # MAKE SURE TO UNBIND IT AFTER UNBINDING THE VAO, as the EBO is linked in the VAO
         # This does not apply to the VBO because the VBO is already linked to the VAO during glVertexAttribPointer
@@ -221,6 +222,82 @@ class ObjectFileLoader:
 
         shader.set_environment()
 
+    def create_instance_buffer(self, mesh_id=0):
+        """
+        Creates a per instance Vertex Buffer Object and attaches it to the Vertex Array Object of the mesh.
+        Each instance holds a transformation matrix (locations 3 to 6), a color (location 7) and
+        the shader switch with the texture layer (location 8).
+
+        :param mesh_id: id of the :class:`~sphere_iot.uv_models.Mesh` to draw instanced
+        :type mesh_id: ``int``
+        :returns: id of the instance buffer
+
+        """
+
+        self.context.makeCurrent(self.map_widget.surface)
+        instance_vbo = glGenBuffers(1)
+
+        self.config.gl_state.bind_vertex_array(self.config.VAO[mesh_id])
+        glBindBuffer(GL_ARRAY_BUFFER, instance_vbo)
+
+        stride = INSTANCE_FLOATS * 4
+
+        # a mat4 is passed to OpenGL as 4 vec4 attributes
+        for column in range(4):
+            glEnableVertexAttribArray(3 + column)
+            glVertexAttribPointer(3 + column, 4, GL_FLOAT, GL_FALSE, stride, ctypes.c_void_p(column * 16))
+            glVertexAttribDivisor(3 + column, 1)
+
+        # color
+        glEnableVertexAttribArray(7)
+        glVertexAttribPointer(7, 4, GL_FLOAT, GL_FALSE, stride, ctypes.c_void_p(64))
+        glVertexAttribDivisor(7, 1)
+
+        # shader switch and texture layer
+        glEnableVertexAttribArray(8)
+        glVertexAttribPointer(8, 2, GL_FLOAT, GL_FALSE, stride, ctypes.c_void_p(80))
+        glVertexAttribDivisor(8, 1)
+
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        self.config.gl_state.bind_vertex_array(0)
+
+        return instance_vbo
+
+    def load_texture_array_into_opengl(self):
+        """
+        Loads all images and icons into a single ``OpenGl`` texture array. The layer of each image
+        is its ``img_id``. Used by the instanced renderer to draw many different icons in one call.
+
+        """
+
+        self.context.makeCurrent(self.map_widget.surface)
+        size = TEXTURE_ARRAY_SIZE
+        depth = max([item['img_id'] for item in self.config.all_textures.values()], default=0) + 1
+
+        self.config.texture_array = glGenTextures(1)
+        self.config.gl_state.bind_texture(GL_TEXTURE_2D_ARRAY, self.config.texture_array)
+
+        glTexParameteri(GL_TEXTURE_2D_ARRAY, GL_TEXTURE_WRAP_S, GL_REPEAT)
+        glTexParameteri(GL_TEXTURE_2D_ARRAY, GL_TEXTURE_WRAP_T, GL_REPEAT)
+        glTexParameteri(GL_TEXTURE_2D_ARRAY, GL_TEXTURE_MIN_FILTER, GL_LINEAR_MIPMAP_LINEAR)
+        glTexParameteri(GL_TEXTURE_2D_ARRAY, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
+
+        glTexImage3D(GL_TEXTURE_2D_ARRAY, 0, GL_RGBA, size, size, depth, 0, GL_RGBA, GL_UNSIGNED_BYTE, None)
+
+        for item in self.config.all_textures.values():
+            try:
+                img = Image.open(item['file_dir_name'])
+                img = img.transpose(Image.FLIP_TOP_BOTTOM).convert("RGBA").resize((size, size))
+                glTexSubImage3D(GL_TEXTURE_2D_ARRAY, 0, 0, 0, item['img_id'], size, size, 1, GL_RGBA,
+                                GL_UNSIGNED_BYTE, img.tobytes())
+            except Exception as e:
+                dump_exception(e)
+
+        glGenerateMipmap(GL_TEXTURE_2D_ARRAY)
+
+        #  Bind to 0 so it cannot be changed by mistake
+        self.config.gl_state.bind_texture(GL_TEXTURE_2D_ARRAY, 0)
+
     def load_all_textures_into_opengl(self):
         """
         Gets all the images and textures in the config dictionary. Retrieves image file location and
@@ -245,7 +322,7 @@ class ObjectFileLoader:
         """
 
         self.context.makeCurrent(self.map_widget.surface)
-        glBindTexture(GL_TEXTURE_2D, texture_id)
+        self.config.gl_state.bind_texture(GL_TEXTURE_2D, texture_id)
 
         # Set the texture wrapping parameters
         glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, GL_REPEAT)
@@ -266,7 +343,7 @@ class ObjectFileLoader:
         glGenerateMipmap(GL_TEXTURE_2D)
 
         #  Bind to 0 so it cannot be changed by mistake
-        glBindTexture(GL_TEXTURE_2D, 0)
+        self.config.gl_state.bind_texture(GL_TEXTURE_2D, 0)
 
     @staticmethod
     def load_square1x1():
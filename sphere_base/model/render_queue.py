@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+
+"""
+Render queue module. Contains the RenderQueue class which collects the draw packets of a frame and issues them
+in an order that changes the OpenGL state as little as possible.
+
+While the map is traversed, models and renderers submit a packet for each draw call instead of drawing right
+away. When the frame is flushed the opaque packets are drawn first, sorted by program, vertex array object and
+texture. The transparent packets are drawn after them, from back to front, so they blend with what is behind
+them. Packets with the same sort key keep the order in which they were submitted.
+
+"""
+
+from sphere_base.constants import *
+from sphere_base.utils.utils import dump_exception
+import numpy as np
+
+DEBUG = False
+
+OPAQUE_PASS = 0
+TRANSPARENT_PASS = 1
+
+
+class RenderQueue:
+
+    def __init__(self, map):
+        """
+        Constructor of the ``RenderQueue`` class.
+
+        :param map: reference to the :class:`~sphere_iot.uv_universe.Map`
+        :type map: :class:`~sphere_iot.uv_universe.Map`
+
+        :Instance Variables:
+
+            - **enabled** - ``bool`` when ``False`` all packets are drawn when they are submitted.
+            - **recording** - ``bool`` ``True`` while packets are collected for the frame.
+            - **packets_drawn** - ``int`` number of packets drawn in the last flush.
+
+        """
+        self.map = map
+        self.config = map.config
+        self.enabled = RENDER_QUEUE
+
+        self.recording = False
+        self.packets_drawn = 0
+        self._packets = []
+
+    def begin(self):
+        """
+        Starts collecting the packets of a frame.
+        """
+        self._packets = []
+        self.recording = self.enabled
+
+    def submit(self, draw, shader=None, mesh_index=None, texture=0, position=None, transparent=False):
+        """
+        Adds a draw packet to the queue. Outside a frame, or when the queue is disabled, the packet is
+        drawn right away.
+
+        :param draw: callable doing the OpenGL calls of the packet
+        :type draw: ``callable``
+        :param shader: shader used by the packet
+        :type shader: :class:`~sphere_iot.shader.uv_base_shader.BaseShader`
+        :param mesh_index: index of the vertex array object used by the packet
+        :type mesh_index: ``int``
+        :param texture: texture used by the packet
+        :type texture: ``int``
+        :param position: position in world space, used to sort transparent packets
+        :type position: ``Vector3``
+        :param transparent: ``True`` when the packet blends with what is behind it
+        :type transparent: ``bool``
+        """
+        if not self.recording:
+            draw()
+            return
+
+        if transparent:
+            # farthest first, packets at the same distance keep their order
+            distance = 0.0 if position is None else float(np.sum((np.asarray(position, dtype=np.float64) -
+                                                                  np.asarray(self.map.cam.xyz)) ** 2))
+            key = (TRANSPARENT_PASS, -distance, 0, 0, 0)
+        else:
+            program = shader.shader_id if shader else 0
+            vertex_array = int(self.config.VAO[mesh_index]) if mesh_index is not None else 0
+            key = (OPAQUE_PASS, 0.0, program, vertex_array, int(texture or 0))
+
+        self._packets.append((key, len(self._packets), draw))
+
+    def flush(self):
+        """
+        Sorts the packets of the frame and draws them.
+        """
+        self.recording = False
+        packets, self._packets = self._packets, []
+
+        packets.sort(key=lambda packet: packet[:2])
+        for key, order, draw in packets:
+            try:
+                draw()
+            except Exception as e:
+                dump_exception(e)
+
+        self.packets_drawn = len(packets)
+        if DEBUG:
+            print("render queue drew", self.packets_drawn, "packets")
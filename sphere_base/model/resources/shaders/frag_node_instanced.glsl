@@ -0,0 +1,34 @@
+#version 330 core
+
+in vec2 TexCoord;
+in vec4 v_color;
+flat in int v_switcher;
+flat in float v_layer;
+
+out vec4 color;
+
+uniform sampler2DArray texture_array;
+
+void main()
+{
+        // switcher 0: icon * color, 1: icon, 2: color (node background), 3: color without alpha test (socket)
+        if (v_switcher == 3) {
+            color = v_color;
+            return;
+        }
+
+        vec4 texColor = texture(texture_array, vec3(TexCoord, v_layer));
+        if(texColor.a < 0.1)
+            discard;
+
+        if (v_switcher == 0) {
+            color = texColor * v_color;
+        }
+        else if (v_switcher == 1){
+            color = texColor;
+        }
+        else {
+            color = v_color;
+        }
+
+}
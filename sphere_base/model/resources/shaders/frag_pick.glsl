@@ -0,0 +1,11 @@
+#version 330 core
+
+// pick id of the item, 0 is used for nothing
+uniform uint pick_id;
+
+out uint id;
+
+void main()
+{
+    id = pick_id;
+}
@@ -20,7 +20,13 @@ out vec3 FragColor;
 
 // Values that stay constant for the whole mesh.
 uniform sampler2D myTextureSampler;
-uniform vec3 LightPosition_world_space;
+// view, projection and light of the camera, one uniform buffer shared by all programs
+layout (std140) uniform Camera
+{
+    mat4 view;
+    mat4 projection;
+    vec3 LightPosition_world_space;
+};
 //uniform Material material;
 uniform vec3 LightColor = vec3(1, 1, 1);
 //uniform vec3 object_color;
@@ -0,0 +1,37 @@
+#version 330 core
+
+layout(points) in;
+layout(line_strip, max_vertices = 61) out;
+
+in vec4 v_color[];
+in mat4 v_transform[];
+out vec4 f_color;
+
+const float PI = 3.1415926;
+uniform mat4 model;
+// view, projection and light of the camera, one uniform buffer shared by all programs
+layout (std140) uniform Camera
+{
+    mat4 view;
+    mat4 projection;
+    vec3 LightPosition_world_space;
+};
+
+
+void main()
+{
+    f_color = v_color[0];
+    for (int i = 0; i <= 60; i++) {
+        // Angle between each side in radians
+        float ang = PI * 2.0 / 60.0 * i;
+
+        vec4 offset = vec4(cos(ang) * 0.15, -sin(ang) * 0.14, 0.0, 0.0);
+        vec4 new_position = gl_in[0].gl_Position + offset;
+        gl_Position = projection * view * model * v_transform[0] * new_position;
+
+
+        EmitVertex();
+    }
+
+    EndPrimitive();
+}
@@ -8,8 +8,13 @@ out vec4 f_color;
 
 const float PI = 3.1415926;
 uniform mat4 model;
-uniform mat4 projection;
-uniform mat4 view;
+// view, projection and light of the camera, one uniform buffer shared by all programs
+layout (std140) uniform Camera
+{
+    mat4 view;
+    mat4 projection;
+    vec3 LightPosition_world_space;
+};
 uniform mat4 transform;
 
 
@@ -0,0 +1,18 @@
+#version 330 core
+
+layout(location = 0) in vec3 aPos;
+
+// per instance data, a mat4 takes up the locations 3 to 6
+layout(location = 3) in mat4 instance_transform;
+layout(location = 7) in vec4 instance_color;
+
+out vec4 v_color;
+out mat4 v_transform;
+
+void main()
+{
+
+        gl_Position = vec4(aPos, 1.0);
+        v_color = instance_color;
+        v_transform = instance_transform;
+}
@@ -0,0 +1,27 @@
+#version 330 core
+
+// xyz position of the vertex, w holds the slot of the edge in the edge color buffer
+layout(location = 0) in vec4 vertexPosition_slot;
+
+out vec4 v_color;
+
+uniform mat4 model;
+// view, projection and light of the camera, one uniform buffer shared by all programs
+layout (std140) uniform Camera
+{
+    mat4 view;
+    mat4 projection;
+    vec3 LightPosition_world_space;
+};
+uniform mat4 transform;
+uniform samplerBuffer edge_colors;
+
+
+void main()
+{
+
+        gl_Position = projection * view * model * transform * vec4(vertexPosition_slot.xyz, 1.0);
+
+        v_color = texelFetch(edge_colors, int(vertexPosition_slot.w));
+
+}
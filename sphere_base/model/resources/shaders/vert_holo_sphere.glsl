@@ -8,8 +8,13 @@ out vec2 TexCoord;
 out vec4 v_color;
 
 uniform mat4 model;
-uniform mat4 projection;
-uniform mat4 view;
+// view, projection and light of the camera, one uniform buffer shared by all programs
+layout (std140) uniform Camera
+{
+    mat4 view;
+    mat4 projection;
+    vec3 LightPosition_world_space;
+};
 uniform mat4 transform;
 uniform vec4 a_color;
 
@@ -0,0 +1,38 @@
+#version 330 core
+
+layout(location = 0) in vec3 vertexPosition_model_space;
+layout(location = 1) in vec2 aTexCoord;
+layout(location = 2) in vec3 vertexNormal_model_space;
+
+// per instance data, a mat4 takes up the locations 3 to 6
+layout(location = 3) in mat4 instance_transform;
+layout(location = 7) in vec4 instance_color;
+layout(location = 8) in vec2 instance_params;
+
+out vec2 TexCoord;
+out vec4 v_color;
+flat out int v_switcher;
+flat out float v_layer;
+
+uniform mat4 model;
+// view, projection and light of the camera, one uniform buffer shared by all programs
+layout (std140) uniform Camera
+{
+    mat4 view;
+    mat4 projection;
+    vec3 LightPosition_world_space;
+};
+
+
+void main()
+{
+
+        // instance_transform holds model * transform of the item on the sphere, model rotates and moves the sphere
+        gl_Position = projection * view * model * instance_transform * vec4(vertexPosition_model_space, 1.0);
+
+        TexCoord = aTexCoord;
+        v_color = instance_color;
+        v_switcher = int(instance_params.x);
+        v_layer = instance_params.y;
+
+}
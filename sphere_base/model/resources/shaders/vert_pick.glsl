@@ -0,0 +1,21 @@
+#version 330 core
+
+layout(location = 0) in vec3 vertexPosition_model_space;
+
+uniform mat4 model;
+// view, projection and light of the camera, one uniform buffer shared by all programs
+layout (std140) uniform Camera
+{
+    mat4 view;
+    mat4 projection;
+    vec3 LightPosition_world_space;
+};
+uniform mat4 transform;
+
+
+void main()
+{
+
+        gl_Position = projection * view * model * transform * vec4(vertexPosition_model_space, 1.0);
+
+}
@@ -4,8 +4,13 @@ layout (location = 0) in vec3 aPos;
 
 out vec3 vPos;
 
-uniform mat4 projection;
-uniform mat4 view;
+// view, projection and light of the camera, one uniform buffer shared by all programs
+layout (std140) uniform Camera
+{
+    mat4 view;
+    mat4 projection;
+    vec3 LightPosition_world_space;
+};
 uniform mat4 model;
 
 void main()
@@ -56,12 +56,18 @@ class Node(Serializable):
             - **collision_object_radius** - radius of the node disc for pybullet collision object.
             - **pos_orientation_offset** - quaternion position of the node relative to the zero rotation of the
               sphere_base.
-            - **orientation** - quaternion with the orientation of the disc pointing away from the center of the
-              sphere_base.
+            - **local_orientation** - quaternion with the orientation of the disc pointing away from the center
+              of the sphere_base when the sphere_base is not rotated.
+            - **local_xyz** - ``Vector`` location of the ``node`` relative to the center of the sphere_base when
+              the sphere_base is not rotated.
             - **scale** - scaling the node with the gr_node.scale value.
             - **texture_id** - ``int`` id of the current texture, image or icon applied to the node disc.
+
+        :Properties:
+
+            - **xyz** - ``Vector`` location of the ``node`` in world space.
+            - **orientation** - quaternion with the orientation of the disc in world space.
             - **serialized_detail_scene** - contains the ``json`` data of the detail node editor for this node.
-            - **xyz** - ``Vector`` location of the ``node``.
 
         """
 
@@ -81,13 +87,13 @@ class Node(Serializable):
         self.yaw_degrees = yaw_degrees
         self.pitch_degrees = pitch_degrees
 
-        self.orientation = None
+        self.local_orientation = None
+        self.local_xyz = None
         self.offset_with_collision_point = None  # difference center node with collision point
         self.mouse_ray_collision_point = None
         self.grNode = None
-        self.serialized_detail_scene = None
+        self._serialized_detail_scene = None
         self._node_moved = False
-        self.xyz = None
         self.collision_object_radius = NODE_DISC_RADIUS
 
         self.Socket = self.__class__.Socket_class  # initiate later
@@ -98,9 +104,10 @@ class Node(Serializable):
         self.img_id = self.gr_node.default_img_id
         self.radius = target_sphere.radius
 
-        self.xyz = self.get_position(self.radius)  # the xyz position of the node on the surface of the sphere
+        # the sphere-local position of the node on the surface of the sphere
+        self.local_xyz = self.get_position(self.radius)
         # get the orientation of the disc pointing away from the center of the sphere_base
-        self.orientation = self.get_orientation()  # the normal for the node
+        self.local_orientation = self.get_orientation()  # the normal for the node
         self.cumulative_rotation = self.get_cumulative_rotation(self.pos_orientation_offset, self.sphere.orientation)
 
         # create a collision object (cylinder) pointing out
@@ -133,6 +140,48 @@ class Node(Serializable):
         """
         return self.__class__.GraphicNode_class
 
+    @property
+    def xyz(self):
+        """
+        Position of the node in world space, the sphere-local position rotated with the sphere_base.
+
+        :getter: Returns the xyz position
+        :type: ``np.array``
+        """
+        if self.local_xyz is None:
+            return None
+        return self.sphere.get_world_position(self.local_xyz)
+
+    @property
+    def orientation(self):
+        """
+        Orientation of the node disc in world space, pointing away from the center of the sphere_base with
+        the world up kept up. The icon does not roll with the sphere_base.
+
+        :getter: Returns the orientation
+        :type: ``quaternion``
+        """
+        if self.local_xyz is None:
+            return None
+        return self.calc.get_direction_pointing_outwards(self.xyz, self.sphere.xyz)
+
+    @property
+    def serialized_detail_scene(self):
+        """
+        The ``json`` data of the detail node editor for this node. Setting it marks the node as changed in
+        the history of the sphere_base.
+
+        :getter: Returns the detail scene
+        :setter: Sets the detail scene
+        :type: ``dict``
+        """
+        return self._serialized_detail_scene
+
+    @serialized_detail_scene.setter
+    def serialized_detail_scene(self, value):
+        self._serialized_detail_scene = value
+        self.sphere.history.mark_changed(self)
+
     @staticmethod
     def get_cumulative_rotation(angle1, angle2):
         """
@@ -201,32 +250,27 @@ class Node(Serializable):
             dump_exception(e)
 
     def get_position(self, radius):
-        # cumulative sphere_base rotation with position offset of node
-        cumulative_orientation = self.get_cumulative_rotation(self.pos_orientation_offset, self.sphere.orientation)
-
-        # get the position of the node on the sphere
-        xyz = self.calc.move_to_position(cumulative_orientation, self.sphere, radius)
-
-        return xyz
+        # get the sphere-local position of the node, the rotation of the sphere_base is applied when rendering
+        return self.calc.move_to_positions(self.pos_orientation_offset, [0.0, 0.0, 0.0], radius)
 
     def get_orientation(self):
-        # get the orientation of the disc pointing away from the center of the sphere_base
-        normal = self.calc.get_item_direction_pointing_outwards(self, self.sphere)
-        return normal
+        # get the sphere-local orientation of the disc pointing away from the center of the sphere_base
+        return self.calc.get_direction_pointing_outwards(self.local_xyz, [0.0, 0.0, 0.0])
 
     def update_position(self):
         """
         update the position of the node_disc on the sphere_base. Calculate the position and the direction.
         """
-        self.xyz = self.get_position(self.radius)
-        self.orientation = self.get_orientation()
+        self.local_xyz = self.get_position(self.radius)
+        self.local_orientation = self.get_orientation()
         self.socket.update_position()
+        self.sphere.history.mark_changed(self)
 
         return self.xyz
 
     def update_collision_object(self):
-        # set the collision object for mouse pointer ray collision
-        self.ray.reset_position_collision_object(self)
+        # the collision object for mouse pointer ray collision is updated before the next ray is cast
+        self.ray.mark_collision_object_dirty(self)
         self.socket.update_collision_object()
 
     def update_content(self, texture_id: int, sphere_id: int):
@@ -283,11 +327,12 @@ class Node(Serializable):
         self.node_disc.draw(self, texture_id=self.img_id, color=self.gr_node.main_image_color, switch=0)
         self.node_disc.draw(self, color=self.gr_node.current_background_color, switch=2)
 
-        self.circle.shader.line_width = self.gr_node.current_border_width
-        self.circle.draw(self, scale=self.gr_node.circle_scale, color=self.gr_node.current_border_color)
+        self.circle.draw(self, scale=self.gr_node.circle_scale, color=self.gr_node.current_border_color,
+                         line_width=self.gr_node.current_border_width)
 
     def set_img(self, img_name):
         self.img_name = img_name
+        self.sphere.history.mark_changed(self)
         self.img_id = self.gr_node.set_icon_by_name(img_name)
 
     def serialize(self):
@@ -310,8 +355,8 @@ class Node(Serializable):
         # hashmap = {} if hashmap is None else hashmap
 
         if restore_id:
-            self.id = data['id']
-            self.socket.id = data['socket_id']
+            self.sphere.set_item_id(self, data['id'])
+            self.sphere.set_item_id(self.socket, data['socket_id'])
 
         self.node_type_name = data['node_type_name']
         self.pos_orientation_offset = np.array(data['orientation_offset'])
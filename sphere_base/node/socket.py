@@ -47,13 +47,20 @@ class Socket(Serializable):
             - **radius** - radius of the sphere_base this node is on.
             - **collision_object_radius** - radius of the socket for pybullet collision object.
             - **collision_object_id** - id of the collision cylinder pointing out.
-            - **xyz** - ``Vector`` location of the ``Socket``.
+            - **local_xyz** - ``Vector`` location of the ``Socket`` relative to the center of the sphere_base
+              when the sphere_base is not rotated.
             - **pos_orientation_offset** - copy from quaternion position of the node.
-            - **orientation** - quaternion with the orientation of the disc pointing away from the center of
-              the sphere_base.
+            - **local_orientation** - quaternion with the orientation of the disc pointing away from the center of
+              the sphere_base when the sphere_base is not rotated.
             - **scale** - scaling the node with the gr_socket.scale value.
             - **texture_id** - ``int`` id of the current texture, image or icon applied to the node disc.
 
+        :Properties:
+
+            - **xyz** - ``Vector`` location of the ``Socket`` in world space.
+            - **orientation** - quaternion with the orientation of the ``Socket`` in world space.
+            - **serialized_detail_scene** - contains the ``json`` data of the detail scene of the ``Socket``.
+
         """
         super().__init__('socket')
         self.node = node
@@ -68,13 +75,13 @@ class Socket(Serializable):
         self.texture_id = self.gr_socket.default_img_id
 
         self.radius = self.node.radius + 0.001
-        self.orientation = self.node.orientation
+        self.local_orientation = self.node.local_orientation
         self.cumulative_rotation = self.node.cumulative_rotation
-        self.xyz = self.node.get_position(self.radius)
+        self.local_xyz = self.node.get_position(self.radius)
         self.pos_orientation_offset = self.node.pos_orientation_offset
 
         self.edges = []
-        self.serialized_detail_scene = None
+        self._serialized_detail_scene = None
 
         self.collision_object_radius = SOCKET_RADIUS
 
@@ -84,6 +91,43 @@ class Socket(Serializable):
 
         self.update_position()
 
+    @property
+    def xyz(self):
+        """
+        Position of the ``Socket`` in world space, the sphere-local position rotated with the sphere_base.
+
+        :getter: Returns the xyz position
+        :type: ``np.array``
+        """
+        return self.node.sphere.get_world_position(self.local_xyz)
+
+    @property
+    def orientation(self):
+        """
+        Orientation of the ``Socket`` in world space, the same as the orientation of the node disc.
+
+        :getter: Returns the orientation
+        :type: ``quaternion``
+        """
+        return self.node.orientation
+
+    @property
+    def serialized_detail_scene(self):
+        """
+        The ``json`` data of the detail scene of the ``Socket``. It is saved with the node, so setting it marks
+        the node as changed in the history of the sphere_base.
+
+        :getter: Returns the detail scene
+        :setter: Sets the detail scene
+        :type: ``dict``
+        """
+        return self._serialized_detail_scene
+
+    @serialized_detail_scene.setter
+    def serialized_detail_scene(self, value):
+        self._serialized_detail_scene = value
+        self.node.sphere.history.mark_changed(self.node)
+
     def create_collision_object(self) -> int:
         """
         Creating a``pybullet`` collision object in the form of a cylinder with the same size
@@ -98,8 +142,8 @@ class Socket(Serializable):
         self.node.sphere.map.mouse_ray.delete_collision_object(self)
 
     def update_collision_object(self):
-        # set the collision object for mouse pointer ray collision
-        self.node.sphere.map.mouse_ray.reset_position_collision_object(self)
+        # the collision object for mouse pointer ray collision is updated before the next ray is cast
+        self.node.sphere.map.mouse_ray.mark_collision_object_dirty(self)
         # find connected edges
         edges = self.node.sphere.get_edges(self)
         for edge in edges:
@@ -111,8 +155,8 @@ class Socket(Serializable):
         Node Disc. The collision object and the connected edges are also updated.
         """
 
-        self.xyz = self.node.get_position(self.radius)
-        self.orientation = self.node.orientation  # same orientation as the node disc
+        self.local_xyz = self.node.get_position(self.radius)
+        self.local_orientation = self.node.local_orientation  # same orientation as the node disc
         self.pos_orientation_offset = self.node.pos_orientation_offset
 
         self.update_connected_edges()
@@ -211,8 +255,8 @@ class Socket(Serializable):
         """
         if self.gr_socket.is_hover():
             self.socket_disc.draw(self, color=self.gr_socket.current_background_color, switch=2)
-            self.circle.shader.line_width = self.gr_socket.current_border_width
-            self.circle.draw(self, scale=self.gr_socket.circle_scale, color=self.gr_socket.current_border_color)
+            self.circle.draw(self, scale=self.gr_socket.circle_scale, color=self.gr_socket.current_border_color,
+                             line_width=self.gr_socket.current_border_width)
 
     def update_content(self):
         """
@@ -232,7 +276,7 @@ class Socket(Serializable):
     def deserialize(self, data, hashmap=None, restore_id=True):
         # not needed - not used, is included in node
         if restore_id:
-            self.id = data['id']
+            self.node.sphere.set_item_id(self, data['id'])
 
         self.serialized_detail_scene = data['scene']
         return True
@@ -11,6 +11,7 @@ from pyrr import Vector3, matrix44
 import pyrr
 from sphere_base.constants import *
 from sphere_base.utils.utils import dump_exception
+from sphere_base.shader.camera_uniform_buffer import LIGHT_POSITION
 from importlib_resources import files
 import sphere_base.model.resources.shaders
 import glm
@@ -19,6 +20,8 @@ DEBUG = True
 
 
 class BaseShader:
+    # capabilities set with each use of the shader, enabling one for a shader means listing it here
+    capabilities = {GL_CULL_FACE: False, GL_POLYGON_SMOOTH: False, GL_LINE_SMOOTH: False}
 
     def __init__(self, parent, vertex_shader=None, fragment_shader=None, geometry_shader=None, *args, **kwargs):
         """
@@ -33,10 +36,12 @@ class BaseShader:
             - **height** - height of the view.
             - **parent** - In many cases this is :class:`~sphere_iot.uv_models.Model`.
             - **shader_id** - Unique ID of the OpenGL shader.
+            - **gl_state** - reference to :class:`~sphere_iot.shader.gl_state_cache.GLStateCache`
 
         """
 
         self.config = parent.config
+        self.gl_state = self.config.gl_state
         self.uv_widget = self.config.map_widget
         self.width = self.config.map_widget.view_width
         self.height = self.config.map_widget.view_height
@@ -49,14 +54,9 @@ class BaseShader:
         self.geometry_shader = geometry_shader
 
         self._init_values()
-        self.shader_id = self.compile_shader()
+        self.shader_id = self.config.shader_programs.get_program(self)
         self._init_locations()
 
-        self.config.add_win_size_changed_listener(self.set_window_size)
-        self.config.add_view_changed_listener(self.set_view)
-
-        self.set_view()
-
     def _init_values(self):
         self.model_loc = None
         self.view_loc = None
@@ -79,11 +79,9 @@ class BaseShader:
         can be partially or completely overridden.
 
         """
-        self.model_loc = glGetUniformLocation(self.shader_id, "model")
-        self.view_loc = glGetUniformLocation(self.shader_id, "view")
-        self.proj_loc = glGetUniformLocation(self.shader_id, "projection")
-        self.a_color = glGetUniformLocation(self.shader_id, "a_color")
-        self.transform_loc = glGetUniformLocation(self.shader_id, "transform")
+        self.model_loc = self.get_uniform_location("model")
+        self.a_color = self.get_uniform_location("a_color")
+        self.transform_loc = self.get_uniform_location("transform")
 
     @staticmethod
     def shader_from_file(file_name):
@@ -108,7 +106,17 @@ class BaseShader:
     # activate the shader
     # ------------------------------------------------------------------------
     def use(self) -> None:
-        glUseProgram(self.shader_id)
+        self.gl_state.use_program(self.shader_id)
+        self.gl_state.set_capabilities(self.capabilities)
+
+    def get_uniform_location(self, location_name: str) -> int:
+        """
+        Returns the location of a uniform in the program of this shader.
+
+        :param location_name: name of the uniform
+        :type location_name: ``str``
+        """
+        return self.config.shader_programs.get_uniform_location(self.shader_id, location_name)
 
     def compile_shader(self):
         """
@@ -153,6 +161,7 @@ class BaseShader:
 
         glLinkProgram(shader_id)
         self.check_compile_errors(shader_id, "PROGRAM")
+        self.config.camera_uniforms.bind_program(shader_id)
         # delete the shaders as they're linked into our program now and no longer necessary
         glDeleteShader(vertex)
         glDeleteShader(fragment)
@@ -174,12 +183,10 @@ class BaseShader:
 
     def create_light_source(self):
         """
-        Create OpenGL light source
+        Create OpenGL light source. The light is part of the camera uniform block.
 
         """
-        if self.light_id:
-            light_pos = Vector3([0.0, 0.0, 150.0])
-            glUniform3f(self.light_id, light_pos.x, light_pos.y, light_pos.z)
+        self.config.camera_uniforms.set_light_position(LIGHT_POSITION)
 
     def set_buffer_bits(self):
         """
@@ -191,16 +198,17 @@ class BaseShader:
 
         if self.switcher_loc:
 
+            self.use()
             glUniform1i(self.switcher_loc, 1)
 
             # background black-ish
             glClearColor(0, 0.1, 0.1, 1)
             glClearStencil(0)
-            glEnable(GL_DEPTH_TEST)
-            glEnable(GL_STENCIL_TEST)
+            self.gl_state.enable(GL_DEPTH_TEST)
+            self.gl_state.enable(GL_STENCIL_TEST)
             glStencilOp(GL_KEEP, GL_KEEP, GL_REPLACE)
 
-            glEnable(GL_BLEND)
+            self.gl_state.enable(GL_BLEND)
             glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
 
             # Accept fragment if it closer to the camera than the last one
@@ -219,7 +227,7 @@ class BaseShader:
     def set_projection_matrix(self):
         """
 
-        Set OpenGL projection Matrix
+        Set OpenGL projection Matrix. It is loaded into the camera uniform block with the next frame.
 
         """
 
@@ -228,13 +236,11 @@ class BaseShader:
                 pyrr.matrix44.create_perspective_projection_matrix(self.fov,
                                                                    self.width / self.height,
                                                                    self.near_val, self.far_val)
-            glUseProgram(self.shader_id)
-            glUniformMatrix4fv(self.proj_loc, 1, GL_FALSE, self.projection_matrix)
+            self.config.camera_uniforms.set_projection(self.projection_matrix)
 
     def set_view(self):
-        # glUseProgram(self.shader_id)
-        self.use()
-        glUniformMatrix4fv(self.view_loc, 1, GL_FALSE, self.config.view_loc)
+        # the view matrix is part of the camera uniform block
+        self.config.camera_uniforms.set_view(self.config.view_loc)
 
     @staticmethod
     def create_scale_matrix(scale=None):
@@ -297,13 +303,11 @@ class BaseShader:
 
         # self.context.makeCurrent(self.map_widget.surface)
         self.use()
-        glBindVertexArray(self.config.VAO[mesh_index])
+        self.gl_state.bind_vertex_array(self.config.VAO[mesh_index])
 
         # if texture_id > 0:
         #     print("texture_id>0", self.config.get_texture(texture_id))
-        glActiveTexture(GL_TEXTURE0)
-
-        glBindTexture(GL_TEXTURE_2D, self.config.get_texture(texture_id))
+        self.gl_state.bind_texture(GL_TEXTURE_2D, self.config.get_texture(texture_id))
         obj_pos = matrix44.create_from_translation(Vector3(position))
 
         glUniformMatrix4fv(self.model_loc, 1, GL_FALSE, obj_pos)
@@ -333,40 +337,40 @@ class BaseShader:
     # utility uniform functions
 
     def set_bool(self, location_name: str, value: bool) -> None:
-        glUniform1i(glGetUniformLocation(self.shader_id, location_name), int(value))
+        glUniform1i(self.get_uniform_location(location_name), int(value))
 
     def set_int(self, location_name: str, value: int) -> None:
-        glUniform1i(glGetUniformLocation(self.shader_id, location_name), value)
+        glUniform1i(self.get_uniform_location(location_name), value)
 
     def set_float(self, location_name: str, value: float) -> None:
-        glUniform1f(glGetUniformLocation(self.shader_id, location_name), value)
+        glUniform1f(self.get_uniform_location(location_name), value)
 
     def set_vec2(self, location_name: str, *args) -> None:
         if len(args) == 1 and type(args[0]) == glm.vec2:
-            glUniform2fv(glGetUniformLocation(self.shader_id, location_name), 1, glm.value_ptr(args[0]))
+            glUniform2fv(self.get_uniform_location(location_name), 1, glm.value_ptr(args[0]))
         elif len(args) == 2 and all(map(lambda x: type(x) == float, args)):
-            glUniform2f(glGetUniformLocation(self.shader_id, location_name), *args)
+            glUniform2f(self.get_uniform_location(location_name), *args)
 
     def set_vec3(self, location_name: str, *args) -> None:
         if len(args) == 1 and type(args[0]) == glm.vec3:
-            glUniform3fv(glGetUniformLocation(self.shader_id, location_name), 1, glm.value_ptr(args[0]))
+            glUniform3fv(self.get_uniform_location(location_name), 1, glm.value_ptr(args[0]))
         elif len(args) == 3 and all(map(lambda x: type(x) == float, args)):
-            glUniform3f(glGetUniformLocation(self.shader_id, location_name), *args)
+            glUniform3f(self.get_uniform_location(location_name), *args)
 
     def set_vec4(self, location_name: str, *args) -> None:
         if len(args) == 1 and type(args[0]) == glm.vec4:
-            glUniform4fv(glGetUniformLocation(self.shader_id, location_name), 1, glm.value_ptr(args[0]))
+            glUniform4fv(self.get_uniform_location(location_name), 1, glm.value_ptr(args[0]))
         elif len(args) == 3 and all(map(lambda x: type(x) == float, args)):
-            glUniform4f(glGetUniformLocation(self.shader_id, location_name), *args)
+            glUniform4f(self.get_uniform_location(location_name), *args)
 
     def set_mat2(self, location_name: str, mat: glm.mat2) -> None:
-        glUniformMatrix2fv(glGetUniformLocation(self.shader_id, location_name), 1, GL_FALSE, glm.value_ptr(mat))
+        glUniformMatrix2fv(self.get_uniform_location(location_name), 1, GL_FALSE, glm.value_ptr(mat))
 
     def set_mat3(self, location_name: str, mat: glm.mat3) -> None:
-        glUniformMatrix3fv(glGetUniformLocation(self.shader_id, location_name), 1, GL_FALSE, glm.value_ptr(mat))
+        glUniformMatrix3fv(self.get_uniform_location(location_name), 1, GL_FALSE, glm.value_ptr(mat))
 
     def set_mat4(self, location_name: str, mat: glm.mat4) -> None:
-        glUniformMatrix4fv(glGetUniformLocation(self.shader_id, location_name), 1, GL_FALSE, glm.value_ptr(mat))
+        glUniformMatrix4fv(self.get_uniform_location(location_name), 1, GL_FALSE, glm.value_ptr(mat))
 
     @staticmethod
     def check_compile_errors(shader: int, activity_type: str) -> None:
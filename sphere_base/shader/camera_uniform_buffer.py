@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+
+"""
+Camera uniform buffer module. Contains the CameraUniformBuffer class which holds the view matrix, the projection
+matrix and the light position in one std140 uniform block. All shader programs read the ``Camera`` block from the
+same binding point, so a new view or window size is loaded into OpenGL once instead of once for each program.
+
+"""
+
+from OpenGL.GL import *
+import numpy as np
+
+DEBUG = False
+
+CAMERA_BLOCK_NAME = "Camera"
+CAMERA_BLOCK_BINDING = 0
+
+# std140 layout of the block: mat4 view, mat4 projection and the vec3 light position padded to a vec4
+VIEW_OFFSET = 0
+PROJECTION_OFFSET = 16
+LIGHT_OFFSET = 32
+CAMERA_BLOCK_FLOATS = 36
+
+LIGHT_POSITION = [0.0, 0.0, 150.0]
+
+
+class CameraUniformBuffer:
+
+    def __init__(self):
+        """
+        Constructor of the ``CameraUniformBuffer`` class.
+
+        :Instance Variables:
+
+            - **buffer_id** - id of the OpenGL uniform buffer, created with the first update.
+            - **uploads** - ``int`` number of times the block was loaded into OpenGL.
+
+        """
+        self.buffer_id = None
+        self.uploads = 0
+
+        self._data = np.zeros(CAMERA_BLOCK_FLOATS, dtype=np.float32)
+        self._data[LIGHT_OFFSET:LIGHT_OFFSET + 3] = LIGHT_POSITION
+        self._dirty = True
+
+    @staticmethod
+    def bind_program(program_id: int):
+        """
+        Connects the ``Camera`` block of a program to the binding point of the buffer. Programs without
+        the block are left alone.
+
+        :param program_id: OpenGL program id
+        :type program_id: ``int``
+        """
+        block_index = glGetUniformBlockIndex(program_id, CAMERA_BLOCK_NAME)
+        if block_index != GL_INVALID_INDEX:
+            glUniformBlockBinding(program_id, block_index, CAMERA_BLOCK_BINDING)
+
+    def _set(self, offset: int, values):
+        values = np.asarray(values, dtype=np.float32).ravel()
+        if not np.array_equal(self._data[offset:offset + len(values)], values):
+            self._data[offset:offset + len(values)] = values
+            self._dirty = True
+
+    def set_view(self, view):
+        """
+        Sets the view matrix. It is loaded into OpenGL with the next :meth:`update`.
+
+        :param view: the view matrix
+        :type view: ``matrix44``
+        """
+        self._set(VIEW_OFFSET, view)
+
+    def set_projection(self, projection):
+        """
+        Sets the projection matrix. It is loaded into OpenGL with the next :meth:`update`.
+
+        :param projection: the projection matrix
+        :type projection: ``matrix44``
+        """
+        self._set(PROJECTION_OFFSET, projection)
+
+    def set_light_position(self, position):
+        """
+        Sets the position of the light in world space. It is loaded into OpenGL with the next :meth:`update`.
+
+        :param position: xyz position
+        :type position: ``Vector3``
+        """
+        self._set(LIGHT_OFFSET, position)
+
+    def update(self):
+        """
+        Loads the block into OpenGL when it changed. Called once each frame before anything is drawn.
+        """
+        if not self._dirty:
+            return
+
+        if self.buffer_id is None:
+            self.buffer_id = glGenBuffers(1)
+            glBindBuffer(GL_UNIFORM_BUFFER, self.buffer_id)
+            glBufferData(GL_UNIFORM_BUFFER, self._data.nbytes, self._data, GL_DYNAMIC_DRAW)
+            glBindBufferBase(GL_UNIFORM_BUFFER, CAMERA_BLOCK_BINDING, self.buffer_id)
+        else:
+            glBindBuffer(GL_UNIFORM_BUFFER, self.buffer_id)
+            glBufferSubData(GL_UNIFORM_BUFFER, 0, self._data.nbytes, self._data)
+        glBindBuffer(GL_UNIFORM_BUFFER, 0)
+
+        self._dirty = False
+        self.uploads += 1
+
+        if DEBUG:
+            print("camera uniform buffer loaded", self.uploads)
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+
+"""
+Instanced circle shader module. This module contains the instanced circle shader class which extends the
+base shader.
+
+It uses an OpenGL geometry shader to draw the circles around all node discs and sockets of a sphere
+in a single instanced draw call per line width.
+
+"""
+
+from OpenGL.GL import *
+from pyrr import matrix44
+from sphere_base.shader.base_shader import BaseShader
+
+
+class CircleInstancedShader(BaseShader):
+    capabilities = {GL_CULL_FACE: False, GL_POLYGON_SMOOTH: True, GL_LINE_SMOOTH: True}
+
+    def draw_instanced(self, mesh_index: int = 0, indices_len: int = 0, instance_count: int = 0,
+                       first_instance: int = 0, line_width=1, model_matrix=None, object_index: int = 0):
+        """
+        Renders ``instance_count`` circles starting at ``first_instance`` in the instance buffer.
+
+        :param mesh_index: ID of the Mesh
+        :type mesh_index: ``int``
+        :param indices_len: length of Indices
+        :type indices_len: ``int``
+        :param instance_count: number of circles to draw
+        :type instance_count: ``int``
+        :param first_instance: offset of the first circle in the instance buffer
+        :type first_instance: ``int``
+        :param line_width: width of the circle lines
+        :type line_width: ``float``
+        :param model_matrix: rotation and position of the sphere the circles are on
+        :type model_matrix: 4x4 ``np.array``
+        :param object_index: ID of the model, set as stencil reference like
+            :class:`~sphere_iot.shader.circle_shader.CircleShader` does
+        :type object_index: ``int``
+        """
+
+        if instance_count == 0:
+            return
+
+        self.use()
+        self.gl_state.bind_vertex_array(self.config.VAO[mesh_index])
+        glUniformMatrix4fv(self.model_loc, 1, GL_FALSE,
+                           matrix44.create_identity() if model_matrix is None else model_matrix)
+
+        self.gl_state.line_width(line_width)
+
+        glDrawElementsInstancedBaseInstance(GL_POINTS, indices_len, GL_UNSIGNED_INT, ctypes.c_void_p(0),
+                                            instance_count, first_instance)
+
+        glStencilFunc(GL_ALWAYS, object_index, -1)
@@ -18,6 +18,7 @@ class CircleShader(BaseShader):
     Class representing the circle shader.
 
     """
+    capabilities = {GL_CULL_FACE: False, GL_POLYGON_SMOOTH: True, GL_LINE_SMOOTH: True}
 
     def __init__(self, parent, vertex_shader=None, fragment_shader=None, geometry_shader=None):
         super().__init__(parent, vertex_shader, fragment_shader, geometry_shader)
@@ -29,12 +30,13 @@ class CircleShader(BaseShader):
 
         :Instance Variables:
 
-            - **line_width** - width of the circle line
             - **scale** - scaling of the circle
 
+        The width of the circle line is passed to :meth:`draw` with each circle, as the circles are drawn
+        when the render queue is flushed.
+
         """
 
-        self.line_width = 1
         self.scale = [1.0, 1.0, 1.0]
 
     def draw(self, object_index=0, object_type="", mesh_index=0, indices_len=0, position=None, orientation=None,
@@ -44,7 +46,7 @@ class CircleShader(BaseShader):
                      position=position, orientation=orientation, scale=scale, texture_id=texture_id, color=color,
                      switch=switch, line_width=line_width)
 
-        glLineWidth(self.line_width)
+        self.gl_state.line_width(line_width)
 
         rm = matrix44.create_from_inverse_of_quaternion(orientation)
         sm = self.create_scale_matrix(scale)
@@ -54,13 +56,6 @@ class CircleShader(BaseShader):
 
         glUniformMatrix4fv(self.transform_loc, 1, GL_FALSE, tm)
 
-        glEnable(GL_POLYGON_SMOOTH)
-        glEnable(GL_LINE_SMOOTH)
-
         glDrawElements(GL_POINTS, indices_len * 3, GL_UNSIGNED_INT, ctypes.c_void_p(0))
 
-        glDisable(GL_LINE_SMOOTH)
-        glDisable(GL_POLYGON_SMOOTH)
-
         glStencilFunc(GL_ALWAYS, object_index, -1)
-        glLineWidth(1)
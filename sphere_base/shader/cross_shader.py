@@ -43,7 +43,7 @@ class CrossShader(BaseShader):
                      position=position, orientation=orientation, scale=scale, texture_id=texture_id, color=color,
                      switch=switch, line_width=line_width)
 
-        glLineWidth(self.line_width)
+        self.gl_state.line_width(self.line_width)
 
         rm = matrix44.create_from_inverse_of_quaternion(orientation)
         sm = self.create_scale_matrix(scale)
@@ -55,4 +55,3 @@ class CrossShader(BaseShader):
 
         glDrawElements(GL_POINTS, indices_len * 3, GL_UNSIGNED_INT, ctypes.c_void_p(0))
         glStencilFunc(GL_ALWAYS, object_index, -1)
-        glLineWidth(1)
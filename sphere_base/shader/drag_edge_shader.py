@@ -18,8 +18,8 @@ class DragEdgeShader(BaseShader):
 
         """
         super()._init_locations()
-        self.light_id = glGetUniformLocation(self.shader_id, "LightPosition_world_space")
-        self.switcher_loc = glGetUniformLocation(self.shader_id, "switcher")
+        self.light_id = self.get_uniform_location("LightPosition_world_space")
+        self.switcher_loc = self.get_uniform_location("switcher")
 
     def draw_edge(self, points, width=1.5, color=None, dotted=False, switch=0):
         """
@@ -45,27 +45,23 @@ class DragEdgeShader(BaseShader):
         """
         # drawing lines
 
-        glUseProgram(self.shader_id)  # using the standard shader ?????
+        self.use()  # using the standard shader ?????
         glUniform1i(self.switcher_loc, 3)  # switch to use fragment and vertex shader for lines
-        glLineWidth(width)
+        self.gl_state.line_width(width)
 
         if color:
             # enable blending
             glUniform4f(self.a_color, *color)
-            glEnable(GL_LINE_SMOOTH)
+            self.gl_state.enable(GL_LINE_SMOOTH)
             glHint(GL_LINE_SMOOTH_HINT, GL_NICEST)
 
         if dotted:
             # dotted line for dragging
             glLineStipple(4, 0xAAAA)
-            glEnable(GL_LINE_STIPPLE)
-        else:
-            # reset to normal
-            glDisable(GL_LINE_STIPPLE)
+        self.gl_state.set_capability(GL_LINE_STIPPLE, dotted)
 
         glBegin(GL_LINE_STRIP)
         for point in points:
             glVertex3f(point[0], point[1], point[2])
         glEnd()
-        glDisable(GL_LINE_STIPPLE)  # just in case ....
-        glLineWidth(1)
\ No newline at end of file
+        self.gl_state.disable(GL_LINE_STIPPLE)  # just in case ....
\ No newline at end of file
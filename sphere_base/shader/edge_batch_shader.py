@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+
+"""
+Edge batch shader module. This module contains the edge batch shader class which extends the base shader.
+It renders all edges of a sphere from one vertex buffer with a single multi draw call.
+
+"""
+
+from OpenGL.GL import *
+from pyrr import matrix44, Vector3
+from sphere_base.shader.base_shader import BaseShader
+
+
+class EdgeBatchShader(BaseShader):
+    capabilities = {GL_CULL_FACE: True, GL_POLYGON_SMOOTH: True, GL_LINE_SMOOTH: True}
+
+    def __init__(self, parent, vertex_shader="vert_edge_batch.glsl", fragment_shader="frag_sphere_edge.glsl",
+                 geometry_shader=None):
+        super().__init__(parent, vertex_shader=vertex_shader, fragment_shader=fragment_shader,
+                         geometry_shader=geometry_shader)
+
+    def _init_locations(self):
+        """
+        Initiates the OpenGL locations
+
+        """
+        super()._init_locations()
+        self.edge_colors_loc = self.get_uniform_location("edge_colors")
+
+    def draw_batch(self, mesh_index: int = 0, firsts=None, counts=None, position=None, orientation=None,
+                   color_texture: int = 0, line_width=1):
+        """
+        Renders a number of edges as line strips from one vertex buffer.
+
+        :param mesh_index: index of the vertex array object holding all edges
+        :type mesh_index: ``int``
+        :param firsts: first vertex of each edge
+        :type firsts: ``np.array`` of int32
+        :param counts: number of vertices of each edge
+        :type counts: ``np.array`` of int32
+        :param position: Position of the sphere the edges are on
+        :type position: ``Vector3``
+        :param orientation: Orientation of the sphere the edges are on
+        :type orientation: ``Quaternion``
+        :param color_texture: id of the buffer texture holding the color of each edge
+        :type color_texture: ``int``
+        :param line_width: width of the edges
+        :type line_width: ``float``
+        """
+
+        if counts is None or len(counts) == 0:
+            return
+
+        self.use()
+        self.gl_state.bind_vertex_array(self.config.VAO[mesh_index])
+        self.gl_state.bind_texture(GL_TEXTURE_BUFFER, color_texture)
+        glUniform1i(self.edge_colors_loc, 0)
+
+        glUniformMatrix4fv(self.model_loc, 1, GL_FALSE, matrix44.create_from_translation(Vector3(position)))
+        glUniformMatrix4fv(self.transform_loc, 1, GL_FALSE, matrix44.create_from_inverse_of_quaternion(orientation))
+
+        self.gl_state.line_width(line_width)
+
+        glMultiDrawArrays(GL_LINE_STRIP, firsts, counts, len(counts))
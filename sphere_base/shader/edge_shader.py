@@ -12,6 +12,7 @@ from sphere_base.shader.base_shader import BaseShader
 
 
 class EdgeShader(BaseShader):
+    capabilities = {GL_CULL_FACE: True, GL_POLYGON_SMOOTH: True, GL_LINE_SMOOTH: True}
 
     def __init__(self, parent, vertex_shader=None, fragment_shader=None, geometry_shader=None, *args, **kwargs):
         super().__init__(parent, vertex_shader, fragment_shader, geometry_shader)
@@ -25,17 +26,7 @@ class EdgeShader(BaseShader):
                      switch=switch, line_width=line_width)
 
         # self.context.makeCurrent(self.map_widget.surface)
-        self.use()
-        glBindVertexArray(self.config.VAO[mesh_index])
-
         glUniform4f(self.a_color, *color)
-        glLineWidth(line_width)
-        glEnable(GL_CULL_FACE)
-        glEnable(GL_POLYGON_SMOOTH)
-        glEnable(GL_LINE_SMOOTH)
+        self.gl_state.line_width(line_width)
 
         glDrawElements(GL_LINE_STRIP, indices_len, GL_UNSIGNED_INT, ctypes.c_void_p(0))
-
-        glDisable(GL_LINE_SMOOTH)
-        glDisable(GL_POLYGON_SMOOTH)
-        glDisable(GL_CULL_FACE)
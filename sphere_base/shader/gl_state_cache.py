@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+
+"""
+OpenGL state cache module. Contains the GLStateCache class which remembers the program, vertex array object,
+textures, capabilities and line width last set in OpenGL. All shaders set this state through the cache, so
+calls that would not change anything are not sent to OpenGL.
+
+"""
+
+from collections import Counter
+from OpenGL.GL import *
+
+DEBUG = False
+
+
+class GLStateCache:
+
+    def __init__(self):
+        """
+        Constructor of the ``GLStateCache`` class.
+
+        :Instance Variables:
+
+            - **issued** - ``Counter`` OpenGL function name -> number of calls sent to OpenGL in this frame.
+            - **skipped** - ``Counter`` OpenGL function name -> number of calls left out in this frame.
+            - **frame_stats** - statistics of the last completed frame, see :meth:`get_stats`.
+
+        """
+        self.issued = Counter()
+        self.skipped = Counter()
+        self.frame_stats = self.get_stats()
+
+        self._program = None
+        self._vertex_array = None
+        self._active_texture = None
+        self._textures = {}  # (texture unit, target) -> texture id
+        self._capabilities = {}  # capability -> enabled
+        self._line_width = None
+
+    def _count(self, name: str, changed: bool) -> bool:
+        if changed:
+            self.issued[name] += 1
+        else:
+            self.skipped[name] += 1
+        return changed
+
+    def begin_frame(self):
+        """
+        Stores the counters of the last frame in ``frame_stats`` and resets them. The remembered state is
+        forgotten as well, as Qt may change the OpenGL state between two frames.
+        """
+        self.frame_stats = self.get_stats()
+        self.issued = Counter()
+        self.skipped = Counter()
+        self.invalidate()
+
+        if DEBUG:
+            print("gl state", self.frame_stats)
+
+    def invalidate(self):
+        """
+        Forgets the remembered state. The next call for each state is sent to OpenGL.
+        """
+        self._program = None
+        self._vertex_array = None
+        self._active_texture = None
+        self._textures = {}
+        self._capabilities = {}
+        self._line_width = None
+
+    def use_program(self, program_id: int):
+        """
+        Makes the program current.
+
+        :param program_id: OpenGL program id
+        :type program_id: ``int``
+        """
+        if self._count("glUseProgram", program_id != self._program):
+            glUseProgram(program_id)
+            self._program = program_id
+
+    def bind_vertex_array(self, vertex_array: int):
+        """
+        Binds a vertex array object, 0 unbinds it.
+
+        :param vertex_array: OpenGL vertex array object id
+        :type vertex_array: ``int``
+        """
+        if self._count("glBindVertexArray", vertex_array != self._vertex_array):
+            glBindVertexArray(vertex_array)
+            self._vertex_array = vertex_array
+
+    def active_texture(self, unit=GL_TEXTURE0):
+        """
+        Selects the texture unit used by :meth:`bind_texture`.
+
+        :param unit: texture unit, ``GL_TEXTURE0`` and up
+        :type unit: ``int``
+        """
+        if self._count("glActiveTexture", unit != self._active_texture):
+            glActiveTexture(unit)
+            self._active_texture = unit
+
+    def bind_texture(self, target, texture_id: int, unit=GL_TEXTURE0):
+        """
+        Binds a texture to a target of a texture unit, 0 unbinds it.
+
+        :param target: texture target, for instance ``GL_TEXTURE_2D``
+        :type target: ``int``
+        :param texture_id: OpenGL texture id
+        :type texture_id: ``int``
+        :param unit: texture unit, ``GL_TEXTURE0`` and up
+        :type unit: ``int``
+        """
+        key = (unit, target)
+        if self._count("glBindTexture", texture_id != self._textures.get(key)):
+            self.active_texture(unit)
+            glBindTexture(target, texture_id)
+            self._textures[key] = texture_id
+
+    def set_capability(self, capability, enabled: bool):
+        """
+        Enables or disables an OpenGL capability.
+
+        :param capability: the capability, for instance ``GL_CULL_FACE``
+        :type capability: ``int``
+        :param enabled: ``True`` to enable the capability
+        :type enabled: ``bool``
+        """
+        name = "glEnable" if enabled else "glDisable"
+        if self._count(name, enabled != self._capabilities.get(capability)):
+            if enabled:
+                glEnable(capability)
+            else:
+                glDisable(capability)
+            self._capabilities[capability] = enabled
+
+    def set_capabilities(self, capabilities: dict):
+        """
+        Enables or disables a number of OpenGL capabilities.
+
+        :param capabilities: capability -> ``True`` to enable it, ``False`` to disable it
+        :type capabilities: ``dict``
+        """
+        for capability, enabled in capabilities.items():
+            self.set_capability(capability, enabled)
+
+    def enable(self, capability):
+        self.set_capability(capability, True)
+
+    def disable(self, capability):
+        self.set_capability(capability, False)
+
+    def line_width(self, width: float):
+        """
+        Sets the width of lines.
+
+        :param width: line width in pixels
+        :type width: ``float``
+        """
+        if self._count("glLineWidth", width != self._line_width):
+            glLineWidth(width)
+            self._line_width = width
+
+    def get_stats(self) -> dict:
+        """
+        Returns the statistics of the current frame
+        """
+        issued, skipped = sum(self.issued.values()), sum(self.skipped.values())
+        return {
+            'issued': issued,
+            'skipped': skipped,
+            'skip_rate': skipped / (issued + skipped) if issued + skipped else 0.0,
+            'issued_calls': dict(self.issued),
+            'skipped_calls': dict(self.skipped),
+        }
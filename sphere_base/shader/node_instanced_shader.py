@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+
+"""
+Instanced node shader module. This module contains the instanced node shader class which inherits from the
+base shader class. It renders all node discs and sockets of a sphere in a single instanced draw call.
+
+"""
+
+from OpenGL.GL import *
+from pyrr import matrix44
+from sphere_base.shader.base_shader import BaseShader
+
+
+class NodeInstancedShader(BaseShader):
+
+    def _init_locations(self):
+        """
+        Initiates the OpenGL locations
+
+        """
+        super()._init_locations()
+        self.texture_array_loc = self.get_uniform_location("texture_array")
+
+    def draw_instanced(self, mesh_index: int = 0, indices_len: int = 0, instance_count: int = 0, model_matrix=None):
+        """
+        Renders ``instance_count`` node discs. Transforms, colors, switches and texture layers are
+        read from the instance buffer bound to the vertex array object.
+
+        :param mesh_index: ID of the Mesh
+        :type mesh_index: ``int``
+        :param indices_len: length of Indices
+        :type indices_len: ``int``
+        :param instance_count: number of instances in the instance buffer
+        :type instance_count: ``int``
+        :param model_matrix: rotation and position of the sphere the node discs are on
+        :type model_matrix: 4x4 ``np.array``
+        """
+
+        if instance_count == 0:
+            return
+
+        self.use()
+        self.gl_state.bind_vertex_array(self.config.VAO[mesh_index])
+        glUniformMatrix4fv(self.model_loc, 1, GL_FALSE,
+                           matrix44.create_identity() if model_matrix is None else model_matrix)
+
+        self.gl_state.bind_texture(GL_TEXTURE_2D_ARRAY, self.config.texture_array)
+        glUniform1i(self.texture_array_loc, 0)
+
+        glDrawElementsInstanced(GL_TRIANGLES, indices_len, GL_UNSIGNED_INT, ctypes.c_void_p(0), instance_count)
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+
+"""
+Pick shader module. This module contains the pick shader class which extends the base shader.
+It renders the pick id of each item into the integer color attachment of the picking frame buffer.
+
+"""
+
+from OpenGL.GL import *
+from pyrr import matrix44, Vector3
+from sphere_base.shader.base_shader import BaseShader
+
+
+class PickShader(BaseShader):
+    # pick ids must not be blended with their neighbours, so all smoothing is off
+    capabilities = {GL_CULL_FACE: False, GL_POLYGON_SMOOTH: False, GL_LINE_SMOOTH: False}
+
+    def __init__(self, parent, vertex_shader="vert_pick.glsl", fragment_shader="frag_pick.glsl",
+                 geometry_shader=None):
+        super().__init__(parent, vertex_shader=vertex_shader, fragment_shader=fragment_shader,
+                         geometry_shader=geometry_shader)
+
+    def _init_locations(self):
+        """
+        Initiates the OpenGL locations
+
+        """
+        super()._init_locations()
+        self.pick_id_loc = self.get_uniform_location("pick_id")
+
+    def _set_pose(self, position, orientation, scale=None):
+        glUniformMatrix4fv(self.model_loc, 1, GL_FALSE, matrix44.create_from_translation(Vector3(position)))
+
+        rm = matrix44.create_from_inverse_of_quaternion(orientation)
+        glUniformMatrix4fv(self.transform_loc, 1, GL_FALSE, matrix44.multiply(self.create_scale_matrix(scale), rm))
+
+    def draw_mesh(self, pick_id: int, mesh_index: int = 0, indices_len=0, position=None, orientation=None,
+                  scale=None, depth_offset: float = 0.0):
+        """
+        Renders a mesh with the pick id of its item.
+
+        :param pick_id: pick id of the item, ``0`` is used for nothing
+        :type pick_id: ``int``
+        :param mesh_index: ID of the Mesh
+        :type mesh_index: ``int``
+        :param indices_len: length of Indices
+        :type indices_len: ``int``
+        :param position: Position of the item
+        :type position: ``Vector3``
+        :param orientation: Orientation of the item
+        :type orientation: ``Quaternion``
+        :param scale: item scaling factor
+        :type scale: ``Vector3``
+        :param depth_offset: moves the depth of the mesh away from the camera when positive and towards the
+            camera when negative, so items lying on each other are picked in a fixed order
+        :type depth_offset: ``float``
+        """
+        self.use()
+        self.gl_state.bind_vertex_array(self.config.VAO[mesh_index])
+        self.gl_state.set_capability(GL_POLYGON_OFFSET_FILL, bool(depth_offset))
+        if depth_offset:
+            glPolygonOffset(depth_offset, depth_offset)
+
+        glUniform1ui(self.pick_id_loc, pick_id)
+        self._set_pose(position, orientation, scale)
+
+        glDrawElements(GL_TRIANGLES, indices_len * 3, GL_UNSIGNED_INT, ctypes.c_void_p(0))
+
+    def draw_lines(self, pick_ids, firsts, counts, mesh_index: int = 0, position=None, orientation=None,
+                   line_width=1):
+        """
+        Renders a number of line strips from one vertex buffer, each with its own pick id.
+
+        :param pick_ids: pick id of each line strip
+        :type pick_ids: ``list`` of ``int``
+        :param firsts: first vertex of each line strip
+        :type firsts: ``list`` of ``int``
+        :param counts: number of vertices of each line strip
+        :type counts: ``list`` of ``int``
+        :param mesh_index: index of the vertex array object holding the line strips
+        :type mesh_index: ``int``
+        :param position: Position of the sphere the lines are on
+        :type position: ``Vector3``
+        :param orientation: Orientation of the sphere the lines are on
+        :type orientation: ``Quaternion``
+        :param line_width: width of the lines in pixels
+        :type line_width: ``float``
+        """
+        self.use()
+        self.gl_state.bind_vertex_array(self.config.VAO[mesh_index])
+        self.gl_state.line_width(line_width)
+        self._set_pose(position, orientation)
+
+        for pick_id, first, count in zip(pick_ids, firsts, counts):
+            glUniform1ui(self.pick_id_loc, pick_id)
+            glDrawArrays(GL_LINE_STRIP, first, count)
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+
+"""
+Shader program cache. Linked OpenGL shader programs are stored by the shader source files they were
+built from, so models using the same vertex, fragment and geometry shaders share one program and
+its uniform locations.
+
+"""
+
+from OpenGL.GL import *
+
+
+class ShaderProgramCache:
+
+    def __init__(self):
+        """
+        Constructor of the ``ShaderProgramCache`` class.
+
+        :Instance Variables:
+
+            - **hits** - ``int`` number of times an existing program was reused.
+            - **misses** - ``int`` number of times a new program had to be compiled.
+
+        """
+        self._programs = {}  # (vertex, fragment, geometry) -> program id
+        self._locations = {}  # (program id, uniform name) -> uniform location
+
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def get_key(vertex_shader, fragment_shader, geometry_shader=None) -> tuple:
+        """
+        Returns the key of a program
+
+        :param vertex_shader: vertex shader file name
+        :type vertex_shader: ``str``
+        :param fragment_shader: fragment shader file name
+        :type fragment_shader: ``str``
+        :param geometry_shader: geometry shader file name or ``None``
+        :type geometry_shader: ``str``
+        """
+        return vertex_shader, fragment_shader, geometry_shader
+
+    def get_program(self, shader) -> int:
+        """
+        Returns the program for the shader files of the shader. The program is compiled and linked
+        by the shader the first time it is requested.
+
+        :param shader: the shader requesting the program
+        :type shader: :class:`~sphere_iot.shader.uv_base_shader.BaseShader`
+        :returns: ``int`` OpenGL program id
+        """
+        key = self.get_key(shader.vertex_shader, shader.fragment_shader, shader.geometry_shader)
+
+        if key in self._programs:
+            self.hits += 1
+        else:
+            self.misses += 1
+            self._programs[key] = shader.compile_shader()
+
+        return self._programs[key]
+
+    def get_uniform_location(self, program_id, name) -> int:
+        """
+        Returns the location of a uniform in a program. Locations are only requested from OpenGL once.
+
+        :param program_id: OpenGL program id
+        :type program_id: ``int``
+        :param name: name of the uniform
+        :type name: ``str``
+        """
+        key = (program_id, name)
+        if key not in self._locations:
+            self._locations[key] = glGetUniformLocation(program_id, name)
+        return self._locations[key]
+
+    def get_stats(self) -> dict:
+        """
+        Returns the cache statistics
+        """
+        requests = self.hits + self.misses
+        return {
+            'programs': len(self._programs),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / requests if requests else 0.0,
+        }
+
+    def clear(self):
+        """
+        Deletes all programs and resets the statistics
+        """
+        for program_id in self._programs.values():
+            glDeleteProgram(program_id)
+
+        self._programs = {}
+        self._locations = {}
+        self.hits = 0
+        self.misses = 0
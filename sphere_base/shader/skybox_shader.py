@@ -18,7 +18,7 @@ class SkyboxShader(BaseShader):
 
         """
         super()._init_locations()
-        self.skybox = glGetUniformLocation(self.shader_id, "skybox")
+        self.skybox = self.get_uniform_location("skybox")
 
     @staticmethod
     def load_texture_skybox(faces):
@@ -47,10 +47,8 @@ class SkyboxShader(BaseShader):
     def draw(self, object_index=0, object_type="", mesh_index=0, indices_len=0, position=None, orientation=None,
              scale=None, texture_id=0, color=None, switch=0, line_width=1):
 
-        glUseProgram(self.shader_id)
-        # glUniformMatrix4fv(self.view_loc, 1, GL_FALSE, self.config.view_loc)
-
-        glBindVertexArray(self.config.VAO[mesh_index])
+        self.use()
+        self.gl_state.bind_vertex_array(self.config.VAO[mesh_index])
 
         obj_pos = matrix44.create_from_translation(Vector3(self.config.map.cam.xyz))
         glUniformMatrix4fv(self.model_loc, 1, GL_FALSE, obj_pos)
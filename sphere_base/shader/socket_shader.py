@@ -19,7 +19,7 @@ class SocketShader(BaseShader):
 
         """
         super()._init_locations()
-        self.switcher_loc = glGetUniformLocation(self.shader_id, "switcher")
+        self.switcher_loc = self.get_uniform_location("switcher")
 
     def draw(self, object_index=0, object_type="", mesh_index=0, indices_len=0, position=None, orientation=None,
              scale=None, texture_id=0, color=None, switch=0, line_width=1):
@@ -28,7 +28,7 @@ class SphereEdgeShader(BaseShader):
 
         """
         super()._init_locations()
-        self.switcher_loc = glGetUniformLocation(self.shader_id, "switcher")
+        self.switcher_loc = self.get_uniform_location("switcher")
         self.vertices = []
         self.buffer = np.array(self.vertices, dtype=np.float32)
         self.vertices = np.array(self.vertices, dtype=np.float32)
@@ -65,7 +65,7 @@ class SphereEdgeShader(BaseShader):
 
         # ------------------------------
 
-        glBindVertexArray(self.mesh_index)
+        self.gl_state.bind_vertex_array(self.mesh_index)
 
         glBindBuffer(GL_ARRAY_BUFFER, self.buffer_id)
         glBufferData(GL_ARRAY_BUFFER, len(self.vertices), self.vertices, GL_STATIC_DRAW)
@@ -77,12 +77,12 @@ class SphereEdgeShader(BaseShader):
         # print("mesh_index", mesh_index, self.config.EBO[mesh_index])
         # ------------------------------
 
-        glBindVertexArray(self.config.VAO[mesh_index])
+        self.gl_state.bind_vertex_array(self.config.VAO[mesh_index])
 
         # enable blending
-        glEnable(GL_BLEND)
+        self.gl_state.enable(GL_BLEND)
         glUniform4f(self.a_color, *color)
         glDrawArrays(GL_LINES, 0, 2)
 
         glBindBuffer(GL_ARRAY_BUFFER, 0)
-        glBindVertexArray(0)
+        self.gl_state.bind_vertex_array(0)
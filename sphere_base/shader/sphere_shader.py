@@ -20,8 +20,8 @@ class SphereShader(BaseShader):
 
         """
         super()._init_locations()
-        self.light_id = glGetUniformLocation(self.shader_id, "LightPosition_world_space")
-        self.switcher_loc = glGetUniformLocation(self.shader_id, "switcher")
+        self.light_id = self.get_uniform_location("LightPosition_world_space")
+        self.switcher_loc = self.get_uniform_location("switcher")
 
     def set_buffer_bits(self):
         super().set_buffer_bits()
@@ -11,6 +11,7 @@ from sphere_base.shader.base_shader import BaseShader
 
 
 class SphereSmallShader(BaseShader):
+    capabilities = {GL_CULL_FACE: True, GL_POLYGON_SMOOTH: False, GL_LINE_SMOOTH: False}
 
     def _init_locations(self):
         """
@@ -18,7 +19,7 @@ class SphereSmallShader(BaseShader):
 
         """
         super()._init_locations()
-        self.switcher_loc = glGetUniformLocation(self.shader_id, "switcher")
+        self.switcher_loc = self.get_uniform_location("switcher")
 
     def draw(self, object_index=0, object_type="", mesh_index=0, indices_len=0, position=None, orientation=None,
              scale=None, texture_id=0, color=None, switch=0, line_width=1):
@@ -30,6 +31,4 @@ class SphereSmallShader(BaseShader):
         glUniform1i(self.switcher_loc, 2)
 
         glUniform4f(self.a_color, *color)
-        glEnable(GL_CULL_FACE)
         glDrawElements(GL_TRIANGLES, indices_len * 3, GL_UNSIGNED_INT, ctypes.c_void_p(0))
-        glDisable(GL_CULL_FACE)
@@ -29,7 +29,7 @@ class SquareShader(BaseShader):
 
         """
         super()._init_locations()
-        self.scale_loc = glGetUniformLocation(self.shader_id, "scale")
+        self.scale_loc = self.get_uniform_location("scale")
 
     def draw(self, object_index=0, object_type="", mesh_index=0, indices_len=0, position=None, orientation=None,
              scale=None, texture_id=0, color=None, switch=0, line_width=1):
@@ -38,9 +38,8 @@ class SquareShader(BaseShader):
                      position=position, orientation=orientation, scale=scale, texture_id=texture_id, color=color,
                      switch=switch, line_width=line_width)
 
-        glLineWidth(self.line_width)
+        self.gl_state.line_width(self.line_width)
         glUniform3f(self.scale_loc, *scale)  # sending the size of the box to the geometric shader
 
         glDrawElements(GL_POINTS, indices_len * 3, GL_UNSIGNED_INT, ctypes.c_void_p(0))
         glStencilFunc(GL_ALWAYS, object_index, -1)
-        glLineWidth(1)
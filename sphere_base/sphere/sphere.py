@@ -14,15 +14,17 @@ from collections import OrderedDict
 from sphere_base.node.node import Node
 from sphere_base.edge.edge_drag import EdgeDrag
 from sphere_base.edge.surface_edge import SurfaceEdge
+from sphere_base.edge.edge_batch import EdgeBatch
 from sphere_base.sphere.sphere_lines import SphereLines
 from sphere_base.history import History
-from pyrr import quaternion
+from pyrr import quaternion, matrix44
 from math import pi
 from sphere_base.calc import Calc
 from sphere_base.constants import *
 import numpy as np
 import pyperclip
 import json
+import time
 
 # for testing purposes a number of nodes can be _selected
 NUMBER_OF_TEST_NODES = 0
@@ -38,6 +40,7 @@ class Sphere(Serializable):
     Edge_class = SurfaceEdge
     Calc_class = Calc
     Edge_drag_class = EdgeDrag
+    EdgeBatch_class = EdgeBatch
     History_class = History
 
     def __init__(self, map, position: list = None, texture_id: int = None, sphere_type='sphere_base'):
@@ -58,6 +61,7 @@ class Sphere(Serializable):
             - **calc** - Instance of :class:`~sphere_iot.uv_calc.UvCalc`
             - **config** - Instance of :class:`~sphere_iot.uv_config.UvConfig`
             - **edge_drag** - Instance of :class:`~sphere_iot.uv_edge_drag.EdgeDrag`
+            - **edge_batch** - Instance of :class:`~sphere_iot.edge.edge_batch.EdgeBatch`
             - **history** - Instance of :class:`~sphere_iot.uv_history.History`
             - **shader** - Instance of :class:`~sphere_iot.shader.uv_sphere_shader.SphereShader`
 
@@ -68,12 +72,21 @@ class Sphere(Serializable):
             - **collision_object_id** - ``int`` id of the current 'pybullet' collision object
             - **scale** - scaling used for this model - None
             - **radius** - ``float`` radius of the sphere_base. In this implementation 1.0
-            - **orientation** - ``quaternion`` orientation of the sphere_base
             - **selected_item** - First item _selected
+            - **loaded** - ``True`` when the items of the sphere_base are built. A sphere_base that is not
+              loaded only has its position, radius, orientation, texture and color.
+            - **last_used** - time the sphere_base was last the target or close to the camera
 
         : Properties:
+            - **items** - read-only ``tuple`` with all items on the sphere_base
+            - **nodes** - nodes on the sphere_base, in order of adding
+            - **sockets** - sockets on the sphere_base, in order of adding
+            - **edges** - edges on the sphere_base, in order of adding
+            - **lines** - longitude and latitude line overlays of the sphere_base
             - **dragging** - property flag indicating whether the sphere_base is being rotated by mouse dragging
             - **has_been_modified** - property flag indicating if the sphere_base has had some changes
+            - **orientation** - ``quaternion`` orientation of the sphere_base. Items on the sphere_base are stored
+              in sphere-local coordinates, the orientation is only applied when rendering.
         """
 
         super().__init__(sphere_type)
@@ -92,6 +105,8 @@ class Sphere(Serializable):
         self.radius = SPHERE_RADIUS
         self.scale = [self.radius, self.radius, self.radius]
         self.color = [1, 1, 1, 1]
+        self._orientation = None
+        self._rotation_matrix = None
         self.orientation = quaternion.create_from_eulers([0.0, self.radius, 0.0])
         self.start_socket = None
         self._hovered_item = None
@@ -101,7 +116,23 @@ class Sphere(Serializable):
         self.selected_item = None
         self._last_selected_items = None
 
-        self.items = []
+        self.loaded = True
+        self.last_used = time.monotonic()
+        self._unloaded_data = None  # serialized items of a sphere_base that is not loaded
+
+        # items are kept by type, the dictionaries are used as ordered sets
+        self._nodes = {}
+        self._sockets = {}
+        self._edges = {}
+        self._lines = {}
+        self._other_items = {}
+        self._item_collections = {'sphere_node': self._nodes, 'socket': self._sockets, 'edge': self._edges,
+                                  'sphere_lines': self._lines}
+        self._items = None  # combined tuple of all items, created when needed
+        self._items_by_id = {}  # id -> item, kept in sync by add_item and remove_item
+        self._socket_edges = {}  # socket -> edges connected to the socket, in order of creation
+        self._socket_pair_edges = {}  # frozenset of start and end socket -> edge
+        self._edge_sockets = {}  # edge -> (start socket, end socket) as stored in the indexes
         self.items_selected = []
         self.items_deselected = []
         self._selection_changed_listeners = []
@@ -116,6 +147,7 @@ class Sphere(Serializable):
         self.Edge = self.__class__.Edge_class
         self.calc = self.__class__.Calc_class()
         self.edge_drag = self.__class__.Edge_drag_class(self)
+        self.edge_batch = self.__class__.EdgeBatch_class(self)
         self.history = self.__class__.History_class(self)
 
         self.xyz = position if position else ([randint(-25, 25), randint(-25, 25), randint(-25, 25)])
@@ -124,10 +156,8 @@ class Sphere(Serializable):
         self.collision_shape_id = self.map.mouse_ray.get_collision_shape(self)
         self.collision_object_id = self.map.mouse_ray.create_collision_object(self)
 
-        self.sphere_lines_mayor = SphereLines(self, 20, 20, 0, [0.5, 0, 0, 0.05], 4)  # red lines
-        self.sphere_lines_minor = SphereLines(self, 40, 40, 0, [0.3, 0.3, 0.5, 0.1], 3)  # blue lines
-        self.sphere_lines_micro = SphereLines(self, 100, 100, 0, [0, 0, 0, 0.1], 1)  # black lines
-        self.sphere_lines_nano = SphereLines(self, 200, 200, 0, [0, 0, 0, 0.03], 1, 7)  # close distance only
+        self.sphere_lines_mayor, self.sphere_lines_minor = None, None
+        self.sphere_lines_micro, self.sphere_lines_nano = None, None
 
         # for testing purposes a number of random nodes can be created
         # self.create_test_node(NUMBER_OF_TEST_NODES)
@@ -136,10 +166,101 @@ class Sphere(Serializable):
         self.map.add_sphere(self)
         self.history.store_initial_history_stamp()
 
+    def create_sphere_lines(self):
+        # the longitude and latitude line overlays, created once when the sphere_base is first drawn loaded
+        if self.sphere_lines_mayor is not None:
+            return
+
+        self.sphere_lines_mayor = SphereLines(self, 20, 20, 0, [0.5, 0, 0, 0.05], 4)  # red lines
+        self.sphere_lines_minor = SphereLines(self, 40, 40, 0, [0.3, 0.3, 0.5, 0.1], 3)  # blue lines
+        self.sphere_lines_micro = SphereLines(self, 100, 100, 0, [0, 0, 0, 0.1], 1)  # black lines
+        self.sphere_lines_nano = SphereLines(self, 200, 200, 0, [0, 0, 0, 0.03], 1, 7)  # close distance only
+
+    def load_items(self):
+        """
+        Builds the nodes, sockets, edges and line overlays of a sphere_base that was created as a placeholder
+        or unloaded. Does nothing when the items are already built.
+        """
+        self.last_used = time.monotonic()
+        if self.loaded:
+            return
+
+        self.loaded = True
+        self.create_sphere_lines()
+
+        data, self._unloaded_data = self._unloaded_data, None
+        if data:
+            self.deserialize(data, {})
+        self.history.store_initial_history_stamp()
+
+    def unload_items(self):
+        """
+        Serializes the nodes and edges and removes them, together with their collision objects and history.
+        They are built again by :meth:`load_items`. The line overlays are kept.
+        """
+        if not self.loaded:
+            return
+
+        data = self.serialize()
+        for item in (*self._edges, *self._nodes):
+            item.remove()
+
+        self.items_selected = []
+        self.selected_item = None
+        self._hovered_item = None
+        self._unloaded_data = data
+        self.loaded = False
+        self.history.store_initial_history_stamp()
+
     def get_model(self):
         # likely to be overridden
         self.model = self.map.models.get_model('sphere_base')
 
+    @property
+    def items(self) -> tuple:
+        """
+        All items on the sphere_base. Use :attr:`nodes`, :attr:`sockets`, :attr:`edges` or :attr:`lines` to
+        only go through the items of one type.
+
+        :getter: Returns a read-only ``tuple`` with all items
+        :type: ``tuple``
+        """
+        if self._items is None:
+            self._items = (*self._lines, *self._nodes, *self._sockets, *self._edges, *self._other_items)
+        return self._items
+
+    @property
+    def nodes(self):
+        """
+        :getter: Returns a read-only view of the nodes on the sphere_base
+        :type: ``dict_keys``
+        """
+        return self._nodes.keys()
+
+    @property
+    def sockets(self):
+        """
+        :getter: Returns a read-only view of the sockets on the sphere_base
+        :type: ``dict_keys``
+        """
+        return self._sockets.keys()
+
+    @property
+    def edges(self):
+        """
+        :getter: Returns a read-only view of the edges on the sphere_base
+        :type: ``dict_keys``
+        """
+        return self._edges.keys()
+
+    @property
+    def lines(self):
+        """
+        :getter: Returns a read-only view of the line overlays on the sphere_base
+        :type: ``dict_keys``
+        """
+        return self._lines.keys()
+
     @property
     def dragging(self) -> bool:
         """
@@ -155,6 +276,63 @@ class Sphere(Serializable):
         if not self._dragging and value:
             self._dragging = value
 
+    @property
+    def orientation(self):
+        """
+        Orientation of the sphere_base. Rotating the sphere_base only changes this value, the items on it
+        keep their sphere-local position and orientation.
+
+        :getter: Returns the orientation
+        :setter: Sets the orientation and resets the stored rotation matrix
+        :type: ``quaternion``
+        """
+        return self._orientation
+
+    @orientation.setter
+    def orientation(self, value):
+        self._orientation = value
+        self._rotation_matrix = None
+
+    def get_rotation_matrix(self):
+        """
+        Returns the rotation matrix of the sphere_base. The matrix is only calculated again after the
+        sphere_base has rotated.
+
+        :returns: 4x4 ``np.array``
+        """
+        if self._rotation_matrix is None:
+            self._rotation_matrix = matrix44.create_from_inverse_of_quaternion(self._orientation)
+        return self._rotation_matrix
+
+    def get_model_matrix(self):
+        """
+        Returns the matrix moving sphere-local coordinates to world space, the rotation of
+        the sphere_base followed by the translation to its position.
+
+        :returns: 4x4 ``np.array``
+        """
+        return matrix44.multiply(self.get_rotation_matrix(), matrix44.create_from_translation(self.xyz))
+
+    def get_world_position(self, local_xyz):
+        """
+        Returns the world position of a sphere-local position.
+
+        :param local_xyz: position relative to the center of the sphere_base when it is not rotated
+        :type local_xyz: ``Vector3``
+        :returns: ``np.array`` xyz position
+        """
+        return np.asarray(local_xyz) @ self.get_rotation_matrix()[:3, :3] + np.asarray(self.xyz)
+
+    def get_world_orientation(self, local_orientation):
+        """
+        Returns the world orientation of a sphere-local orientation.
+
+        :param local_orientation: orientation of the item when the sphere_base is not rotated
+        :type local_orientation: ``quaternion``
+        :returns: ``quaternion``
+        """
+        return quaternion.cross(self._orientation, local_orientation)
+
     @property
     def has_been_modified(self) -> bool:
         """
@@ -252,9 +430,9 @@ class Sphere(Serializable):
         :type item_id: ``int``
         :return: :class:`~sphere_iot.uv_node.Node` or :class:`~sphere_iot.uv_edge.SphereSurfaceEdge`
         """
-        for item in self.items:
-            if item.id == item_id:
-                return item
+        item = self._items_by_id.get(item_id)
+        if item is not None and item.id == item_id:
+            return item
         return None
 
     def get_selected_item(self, selected_item_id: int, shift: bool = False):
@@ -268,11 +446,10 @@ class Sphere(Serializable):
         :return: :class:`~sphere_iot.uv_node.Node` or :class:`~sphere_iot.uv_edge.SphereSurfaceEdge`
         """
 
-        for item in self.items:
-            if selected_item_id == item.id:
-                self.select_item(item, shift)
-                return item
-        return None
+        item = self.get_item_by_id(selected_item_id)
+        if item:
+            self.select_item(item, shift)
+        return item
 
     def get_socket_edges(self, socket) -> list:
         """
@@ -283,11 +460,7 @@ class Sphere(Serializable):
         :return: returns a ``list`` with edges of type :class:`~sphere_iot.uv_edge.SphereSurfaceEdge`
         """
 
-        edges = []
-        for item in self.items:
-            if item.type == "edge" and socket in [item.start_socket, item.end_socket]:
-                edges.append(item)
-        return edges
+        return list(self._socket_edges.get(socket, ()))
 
     def add_item(self, item: 'Node or Edge or Socket'):
         """Add :class:`~sphere_iot.uv_node.Node` or :class:`~sphere_iot.uv_edge.SphereSurfaceEdge`
@@ -299,7 +472,32 @@ class Sphere(Serializable):
         """
 
         # adding item to sphere_base
-        self.items.append(item)
+        self._item_collections.get(item.type, self._other_items)[item] = None
+        self._items = None
+        self._items_by_id[item.id] = item
+        self.history.mark_changed(item)
+
+        if item.type == "edge":
+            self._index_edge(item)
+
+    def set_item_id(self, item, item_id: int):
+        """
+        Changes the id of an item on the `Sphere`, for instance when the item is deserialized with its stored id.
+
+        :param item: Node, Edge or Socket on this `Sphere`
+        :type item: :class:`~sphere_iot.uv_node.Node` or :class:`~sphere_iot.uv_edge.SphereSurfaceEdge`
+                    or :class:`~sphere_iot.uv_socket.Socket`
+        :param item_id: the new id of the item
+        :type item_id: ``int``
+        """
+        if self._items_by_id.get(item.id) is item:
+            del self._items_by_id[item.id]
+            self._items_by_id[item_id] = item
+
+        # the history sees the item disappear under its old id and appear under the new one
+        self.history.mark_changed(item)
+        item.id = item_id
+        self.history.mark_changed(item)
 
     def remove_item(self, item: 'Node or Edge or Socket'):
         """Remove :class:`~sphere_iot.uv_node.Node` or :class:`~sphere_iot.uv_edge.SphereEdge`
@@ -310,8 +508,59 @@ class Sphere(Serializable):
 
         """
         # removing item from sphere_base
-        if item in self.items:
-            self.items.remove(item)
+        collection = self._item_collections.get(item.type, self._other_items)
+        if item in collection:
+            del collection[item]
+            self._items = None
+        if self._items_by_id.get(item.id) is item:
+            del self._items_by_id[item.id]
+        self.history.mark_changed(item)
+
+        if item.type == "edge":
+            self._remove_edge_from_index(item)
+            self.edge_batch.remove_edge(item)
+
+    def update_edge_index(self, edge):
+        """
+        Updates the socket to edge indexes after the start or end socket of an edge has changed.
+
+        :param edge: edge on this `Sphere`
+        :type edge: :class:`~sphere_iot.uv_edge.SphereSurfaceEdge`
+        """
+        if self._items_by_id.get(edge.id) is not edge:
+            # the edge is indexed when it is added to the sphere_base
+            return
+
+        self._remove_edge_from_index(edge)
+        self._index_edge(edge)
+        self.history.mark_changed(edge)
+
+    def _index_edge(self, edge):
+        start_socket, end_socket = edge.start_socket, edge.end_socket
+        self._edge_sockets[edge] = (start_socket, end_socket)
+
+        for socket in (start_socket, end_socket):
+            if socket is not None:
+                self._socket_edges.setdefault(socket, {})[edge] = None
+
+        if start_socket is not None and end_socket is not None:
+            self._socket_pair_edges[frozenset((start_socket, end_socket))] = edge
+
+    def _remove_edge_from_index(self, edge):
+        if edge not in self._edge_sockets:
+            return
+
+        start_socket, end_socket = self._edge_sockets.pop(edge)
+        for socket in (start_socket, end_socket):
+            edges = self._socket_edges.get(socket)
+            if edges is not None:
+                edges.pop(edge, None)
+                if not edges:
+                    del self._socket_edges[socket]
+
+        key = frozenset((start_socket, end_socket))
+        if self._socket_pair_edges.get(key) is edge:
+            del self._socket_pair_edges[key]
 
     def has_edge(self, start_socket, end_socket) -> bool:
         """
@@ -324,12 +573,7 @@ class Sphere(Serializable):
         :return: ``True`` or ``False``
         """
 
-        # Could possibly be optimized by not checking all edges on the sphere_base
-        for item in self.items:
-            if item.type == "edge":
-                if item.start_socket in [start_socket, end_socket] and item.end_socket in [start_socket, end_socket]:
-                    return True
-        return False
+        return frozenset((start_socket, end_socket)) in self._socket_pair_edges
 
     def create_edge(self, end_socket):
         """
@@ -347,6 +591,82 @@ class Sphere(Serializable):
 
         return None
 
+    def bulk_add(self, nodes=None, edges=None, node_class=None, description: str = "items imported") -> (list, list):
+        """
+        Adds many nodes and edges at once, for instance when importing an inventory.
+
+        The nodes and edges are created first without collision objects and without edge vertices. The
+        vertices of all edges are then calculated together, the collision objects are created together and
+        the edge batch loads the new edges into OpenGL with the next frame. The import is a single history stamp.
+
+        When building the graph fails, the nodes and edges created so far are removed again, no history stamp is
+        stored and the exception is raised.
+
+        :param nodes: (n, 4) orientation offsets of the new nodes
+        :type nodes: ``np.array`` or ``list``
+        :param edges: (m, 2) socket pairs of the new edges. An ``int`` is the index of a new node in ``nodes``,
+            a :class:`~sphere_iot.uv_socket.Socket` is used as it is. Pairs that already have an edge are skipped.
+        :type edges: ``np.array`` or ``list``
+        :param node_class: class of the new nodes, the ``Node_class`` of the sphere_base when not given
+        :param description: description of the history stamp
+        :type description: ``str``
+        :return: ``list`` with the new nodes and ``list`` with the new edges
+        """
+        self.load_items()
+
+        node_class = node_class if node_class else self.Node
+        orientations = np.asarray(nodes if nodes is not None else [], dtype=np.float64).reshape(-1, 4)
+        new_nodes, new_edges = [], []
+
+        ray = self.map.mouse_ray
+        ray.defer_collision_objects = True
+        try:
+            # build the graph
+            for orientation in orientations:
+                new_nodes.append(node_class(self, np.array(orientation)))
+
+            for pair in (edges if edges is not None else []):
+                start_socket, end_socket = [new_nodes[socket].socket if isinstance(socket, (int, np.integer))
+                                            else socket for socket in pair]
+                if self.has_edge(start_socket, end_socket):
+                    continue
+
+                # without sockets the edge has no vertices yet
+                edge = self.Edge(self)
+                new_edges.append(edge)
+                edge.start_socket = start_socket
+                edge.end_socket = end_socket
+
+            self.Edge.create_edges(new_edges)
+
+        except Exception:
+            # leave the sphere_base as it was before the import
+            self._remove_bulk_items(new_nodes, new_edges)
+            raise
+
+        finally:
+            ray.defer_collision_objects = False
+
+        ray.update_dirty_collision_objects()
+        self.history.store_history(description, True)
+
+        return new_nodes, new_edges
+
+    def _remove_bulk_items(self, nodes: list, edges: list):
+        # removes the items of a failed bulk_add, edges may not have both sockets yet
+        try:
+            for edge in edges:
+                for socket in (edge.start_socket, edge.end_socket):
+                    if socket is not None:
+                        socket.remove_edge(edge)
+                self.remove_item(edge)
+                self.map.mouse_ray.delete_collision_object(edge)
+
+            for node in nodes:
+                node.remove()
+        except Exception as e:
+            dump_exception(e)
+
     def get_edges(self, start_socket=None, end_socket=None):
         """
         find the edge that has the given start and end socket.
@@ -369,14 +689,11 @@ class Sphere(Serializable):
 
         """
 
-        sockets = [start_socket, end_socket]
-        edges = []
-
-        for item in self.items:
-            if item.type == "edge":
-                if item.start_socket in sockets or item.end_socket in sockets:
-                    edges.append(item)
-        return edges
+        edges = {}
+        for socket in (start_socket, end_socket):
+            if socket is not None:
+                edges.update(self._socket_edges.get(socket, {}))
+        return list(edges)
 
     def remove_edges(self, edges: list):
         """
@@ -386,32 +703,31 @@ class Sphere(Serializable):
         :type edges: ``list``
         """
         for item in edges:
-            if item in self.items:
-                self.items.remove(item)
+            self.remove_item(item)
 
     def update_item_positions(self):
         """
-        Update the orientation of all items on the sphere_base.
+        Recalculate the sphere-local position and orientation of all items on the sphere_base.
 
         .. note::
 
             This method only explicitly instructs nodes to update themselves.
             updating nodes will trickle down, causing the connected node socket and connected edges to update as well.
+            Rotating the sphere_base does not need this, the rotation is applied when rendering.
         """
 
-        # update orientation of all nodes on sphere_base
-        for item in self.items:
-            if item.type in ('sphere_node', 'sphere_lines'):
-                # updating the node trickles down to updating sockets and edges"
-                item.update_position()
+        # update position and orientation of all nodes on sphere_base
+        # updating the node trickles down to updating sockets and edges
+        for item in (*self._nodes, *self._lines):
+            item.update_position()
 
     def update_item_collision_objects(self):
         """
-        Update the collision objects of all items on the sphere_base.
+        Update the collision objects of all items on the sphere_base. They are marked as dirty and each
+        collision object is updated once, before the next mouse ray is cast.
         """
-        for item in self.items:
-            if item.type in ('sphere', 'edge', 'sphere_node', 'socket'):
-                item.update_collision_object()
+        for item in (*self._nodes, *self._sockets, *self._edges):
+            self.map.mouse_ray.mark_collision_object_dirty(item)
 
     def rotate_sphere(self, offset_degrees: int):
         """
@@ -430,8 +746,8 @@ class Sphere(Serializable):
 
         pitch = (pi / 180 * offset_degrees)
         rotation = quaternion.create_from_eulers([0.0, pitch, 0.0])
+        # the items keep their sphere-local position, the rotation is applied when rendering
         self.orientation = quaternion.normalize(quaternion.cross(self.orientation, rotation))
-        self.update_item_positions()
 
     def drag_items(self, mouse_ray_collision_point=None):
         """
@@ -497,12 +813,14 @@ class Sphere(Serializable):
         Remove _selected items. If item is node then the socket and the connected edges are also removed.
         """
         for selected_item in self.items_selected:
-            for i, item in enumerate(self.items):
-                if item.id == selected_item.id:
-                    if item.type == "sphere_node":
-                        item.remove(with_edges=True)  # remove node, socket and connected items
-                    elif item.type == "edge":
-                        self.remove_edges([item])
+            item = self.get_item_by_id(selected_item.id)
+            if item is None:
+                # already removed together with a node
+                continue
+            if item.type == "sphere_node":
+                item.remove(with_edges=True)  # remove node, socket and connected items
+            elif item.type == "edge":
+                self.remove_edges([item])
 
         self.items_selected = []
         self.on_item_selected(self.items_selected)
@@ -520,11 +838,9 @@ class Sphere(Serializable):
             self.items_deselected = self.items_selected
             self.items_selected = []
             for selected in item_list:
-                for item in self.items:
-                    if selected == item.id and item.type == 'sphere_node':
-                        self.select_item(item, True)
-                    if selected == item.id and item.type == 'edge':
-                        self.select_item(item, True)
+                item = self.get_item_by_id(selected)
+                if item and item.type in ('sphere_node', 'edge'):
+                    self.select_item(item, True)
 
     def check_for_hover(self, mouse_x, mouse_y):
         """
@@ -547,16 +863,17 @@ class Sphere(Serializable):
             self._hovered_item = None
 
         if hovered_item and hovered_item != self.id:
-            for item in self.items:
-                if item.id == hovered_item:
-                    # set hover
-                    if item.type in ('sphere_node', 'socket', 'edge'):
-                        item.set_hovered(True)
-                        self._hovered_item = item
-                else:
-                    # remove hover
-                    if item.type in ('sphere_node', 'socket', 'edge'):
-                        item.set_hovered(False)
+            item = self.get_item_by_id(hovered_item)
+
+            # remove hover
+            if self._hovered_item and self._hovered_item is not item:
+                self._hovered_item.set_hovered(False)
+                self._hovered_item = None
+
+            # set hover
+            if item and item.type in ('sphere_node', 'socket', 'edge'):
+                item.set_hovered(True)
+                self._hovered_item = item
 
         return self._hovered_item
 
@@ -654,26 +971,44 @@ class Sphere(Serializable):
         if self.animation != 0:
             self.rotate_sphere(self.animation)
 
+        culling = self.map.culling
+        if not culling.is_sphere_visible(self):
+            return
+
         self.model.draw(self, texture_id=self.texture_id, color=self.color)
-        for item in self.items:
-            if item.type == "sphere_node":
-                item.draw()
-            elif item.type == "edge":
+
+        # the line overlays are drawn before the items on it, a placeholder does not build them
+        if self.loaded:
+            self.create_sphere_lines()
+        for item in self._lines:
+            item.draw()
+
+        # nodes behind the horizon of the sphere_base are left out before anything is prepared for them
+        renderer = self.map.instanced_renderer
+        instanced_nodes = []
+        for item in culling.cull_nodes(self, list(self._nodes)):
+            if renderer and renderer.can_draw(item):
+                instanced_nodes.append(item)
+            else:
                 item.draw()
-            elif item.type == "sphere_lines":
+
+        # the edge lines are rendered by the edge batch, only edges overriding draw draw more than that
+        if self.Edge.draw is not SurfaceEdge.draw:
+            for item in self.edge_batch.get_visible_edges(list(self._edges)):
                 item.draw()
 
+        if instanced_nodes:
+            renderer.draw(instanced_nodes, self)
+
+        self.edge_batch.draw()
+
         if self.edge_drag.dragging:
             self.edge_drag.draw()
 
-    def serialize(self):
-        nodes, edges = [], []
-        for item in self.items:
-            if item.type == "sphere_node":
-                nodes.append(item.serialize())
-            elif item.type == "edge":
-                edges.append(item.serialize())
-
+    def serialize_state(self):
+        """
+        Serializes the sphere_base itself, without the items on it.
+        """
         return OrderedDict([
             ('id', self.id),
             ('type', self.type),
@@ -682,10 +1017,39 @@ class Sphere(Serializable):
             ('orientation', self.orientation.tolist()),
             ('texture_id', self.texture_id),
             ('color', self.color),
-            ('sphere_nodes', nodes),
-            ('edges', edges),
         ])
 
+    def deserialize_state(self, data: dict):
+        """
+        Restores the position, radius, orientation, texture and color of the sphere_base from the data created
+        by :meth:`serialize_state`. The items on the sphere_base are not changed.
+
+        :param data: serialized state of the sphere_base
+        :type data: ``dict``
+        """
+        if data == self.serialize_state():
+            return
+
+        self.xyz = data['pos']
+        self.texture_id = data['texture_id']
+        self.color = data['color']
+        self.set_radius(data['radius'])
+        self.orientation = np.array(data['orientation'])
+        self.map.mouse_ray.mark_collision_object_dirty(self)
+        self.update_item_collision_objects()
+
+    def serialize(self):
+        data = self.serialize_state()
+        if not self.loaded and self._unloaded_data:
+            # the items are not built, their data is kept as it was loaded
+            data['sphere_nodes'] = self._unloaded_data['sphere_nodes']
+            data['edges'] = self._unloaded_data['edges']
+            return data
+
+        data['sphere_nodes'] = [item.serialize() for item in self._nodes]
+        data['edges'] = [item.serialize() for item in self._edges]
+        return data
+
     def deserialize(self, data: dict, hashmap: dict = {}, restore_id: bool = True) -> bool:
         if restore_id:
             self.id = data['id']
@@ -697,61 +1061,51 @@ class Sphere(Serializable):
         self.texture_id = data['texture_id']
         self.color = data['color']
         self.set_radius(data['radius'])
-        self.map.mouse_ray.reset_position_collision_object(self)
+        self.map.mouse_ray.mark_collision_object_dirty(self)
+
+        if not self.loaded:
+            # a placeholder keeps the data of its items until they are built by load_items
+            self._unloaded_data = data
+            self.orientation = orientation
+            return True
 
         # -- deserialize nodes on sphere_base
 
         # Instead of recreating all the nodes, reuse existing ones...
-        all_items = self.items.copy()
-
-        # removing socket of the list as each node has precisely 1 socket
-        for item in all_items:
-            if item.type == "socket":
-                all_items.remove(item)
+        # sockets are left out as each node has precisely 1 socket
+        existing_nodes = {item.id: item for item in self._nodes}
+        existing_edges = {item.id: item for item in self._edges}
 
         # go through deserialized nodes:
         for node_data in data['sphere_nodes']:
             # can we find this node in the data?
-            found = None
-            for item in all_items:
-                if item.id == node_data['id']:
-                    found = item
-                    break
-            if not found:
-                try:
-                    new_node = self.get_node_class_from_data(node_data)(self)
-                    new_node.deserialize(node_data, hashmap, restore_id)
-                except Exception as e:
-                    dump_exception(e)
-            else:
-                try:
-                    found.deserialize(node_data, hashmap, restore_id)
-                    all_items.remove(found)
-                except Exception as e:
-                    dump_exception(e)
+            node = existing_nodes.pop(node_data['id'], None)
+            try:
+                if node is None:
+                    node = self.get_node_class_from_data(node_data)(self)
+                node.deserialize(node_data, hashmap, restore_id)
+            except Exception as e:
+                dump_exception(e)
 
         # go through all deserialized edges:
         for edge_data in data['edges']:
             # can we find this edge in the data?
-            found = None
-            for item in all_items:
-                if item.id == edge_data['id']:
-                    found = item
-                    break
-
-            if not found:
-                self.Edge(self).deserialize(edge_data, hashmap, restore_id)
-            else:
-                found.deserialize(edge_data, hashmap, restore_id)
-                all_items.remove(found)
+            edge = existing_edges.pop(edge_data['id'], None)
+            try:
+                if edge is None:
+                    edge = self.Edge(self)
+                edge.deserialize(edge_data, hashmap, restore_id)
+            except Exception as e:
+                dump_exception(e)
 
         # rotate the sphere
         self.orientation = orientation
-        self.update_item_positions()
         self.update_item_collision_objects()
 
         # remove items which are left in the scene and were NOT in the serialized data!
-        while all_items:
-            item = all_items.pop()
-            item.remove()
+        # edges go first, removing a node also removes the edges on its socket
+        for edge in existing_edges.values():
+            edge.remove()
+        for node in existing_nodes.values():
+            node.remove()
         return True
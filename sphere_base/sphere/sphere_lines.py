@@ -17,7 +17,6 @@ class SphereLines(Serializable):
         super().__init__('sphere_lines')
         self.sphere = target_sphere
         self.uv = self.sphere.map
-        self.orientation = self.sphere.orientation
         self.scale = [1.0, 1.0, 1.0]
         self.model = self.set_up_model('sphere_lines')
 
@@ -36,6 +35,16 @@ class SphereLines(Serializable):
         self.sphere.add_item(self)  # register the edge to the base for rendering
         self.create_lines()
 
+    @property
+    def orientation(self):
+        """
+        The lines rotate with the sphere_base.
+
+        :getter: Returns the orientation of the sphere_base
+        :type: ``quaternion``
+        """
+        return self.sphere.orientation
+
     def set_up_model(self, model_name):
         shader, vertex_shader, fragment_shader, geometry_shader = None, None, None, None
 
@@ -62,80 +71,39 @@ class SphereLines(Serializable):
         return model
 
     def update_position(self):
-        """º
-        Recreate the edge when any of the sockets positions change
+        """
+        The lines follow the orientation of the sphere_base, there is nothing to update.
 
         """
-        # sphere rotates - just update the rotation
-        self.orientation = self.sphere.orientation
+        pass
 
     def create_lines(self):
-
-        # create an edge for the first time or recreate it during dragging
-        pass
         r = self.radius
-        pi = math.pi
-
-        count = 1
-        vertices = []  # vertex coordinates
-        buffer = []
-        indices = []
-        tex = [1.0, 1.0]  # made up surface edge, that needs to be added to the buffer
 
         # longitude
-        step = int(360 / self.long_no)
-        for i in range(0, 360, step):
-            theta = i * (pi / 180.0)
-            for j in range(0, 180, 5):
-                phi = j * (pi / 180.0)
-                x = r * math.sin(phi) * math.cos(theta)
-                z = r * math.sin(phi) * math.sin(theta)
-                y = r * math.cos(phi)
-
-                p = Vector3([x, y, z])
-                n = vector.normalize(Vector3(p) - Vector3(self.sphere.xyz))
-                vertices, buffer, indices = self.expand_mesh(vertices, buffer, indices, p, tex, n, count)
-                count += 1
+        theta = np.radians(np.arange(0, 360, int(360 / self.long_no)))
+        phi = np.radians(np.arange(0, 180, 5))
+        theta, phi = [a.ravel() for a in np.meshgrid(theta, phi, indexing='ij')]
+        longitude = np.stack([r * np.sin(phi) * np.cos(theta), r * np.cos(phi), r * np.sin(phi) * np.sin(theta)], 1)
 
         # latitude
-        step = int(360 / self.lat_no)
-        for i in range(0, 360, step):
-            phi = i * (pi / 180.0)
-            for j in range(0, 185, 5):
-                theta = j * (pi / 180.0)
-                x = r * math.sin(phi) * math.cos(theta)
-                z = r * math.sin(phi) * math.sin(theta)
-                y = r * math.cos(phi)
-
-                p = Vector3([x, y, z])
-                n = vector.normalize(Vector3(p) - Vector3(self.sphere.xyz))
-                vertices, buffer, indices = self.expand_mesh(vertices, buffer, indices, p, tex, n, count)
-                count += 1
-
-        self.mesh.vertices = np.array(vertices, dtype=np.float32)
-        self.mesh.indices = np.array(indices, dtype='uint32')
-        self.mesh.buffer = np.array(buffer, dtype=np.float32)
-        self.mesh.indices_len = len(indices)
+        phi = np.radians(np.arange(0, 360, int(360 / self.lat_no)))
+        theta = np.radians(np.arange(0, 185, 5))
+        phi, theta = [a.ravel() for a in np.meshgrid(phi, theta, indexing='ij')]
+        latitude = np.stack([r * np.sin(phi) * np.cos(theta), r * np.cos(phi), r * np.sin(phi) * np.sin(theta)], 1)
+
+        points = np.concatenate([longitude, latitude]).astype(np.float32)
+        buffer = self.sphere.calc.create_line_buffer(points, self.sphere.xyz)
+
+        self.mesh.vertices = points.ravel()
+        self.mesh.indices = np.arange(1, len(points) + 1, dtype='uint32')
+        self.mesh.buffer = buffer.ravel()
+        self.mesh.indices_len = len(points)
 
         self.xyz = self.sphere.xyz
         self.model.loader.load_mesh_into_opengl(self.mesh_id, self.mesh.buffer,
                                                 self.mesh.indices, self.model.shader)
 
-    def expand_mesh(self, vertices, buffer, indices, point, texture, normals, i):
-        # This can be used to expanding each point into a mesh.
-        p = point
-        vertices.extend(p)  # extending the vertices list with the vertex
-        buffer = self.extend_buffer(buffer, point, texture, normals)
-        indices.append(i)
-        return vertices, buffer, indices
-
-    @staticmethod
-    def extend_buffer(buffer, vertex, texture, normal):
-        buffer.extend(vertex)  # extending the buffer with the vertex
-        buffer.extend(texture)  # extending the buffer with the texture
-        buffer.extend(normal)  # extending the buffer with the normal
-        return buffer
-
     def remove(self):
         pass
 
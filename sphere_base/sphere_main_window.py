@@ -223,7 +223,7 @@ class SphereMainWindow(QMainWindow):
     @staticmethod
     def get_file_dialog_filter():
         """Returns ``str`` standard file open/save filter for ``QFileDialog``"""
-        return 'Graph (*.json);;All files (*)'
+        return 'Graph (*.json);;Binary graph (*.spheremap);;All files (*)'
 
     def closeEvent(self, event):
         """
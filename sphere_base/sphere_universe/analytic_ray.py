@@ -0,0 +1,504 @@
+# -*- coding: utf-8 -*-
+
+"""
+This is the ``AnalyticRay`` module. It is an alternative to the :class:`~sphere_iot.uv_mouse_ray.MouseRay`
+that determines which object is under the mouse pointer without a ``PyBullet`` physics simulation.
+
+The ray is intersected with the spheres first. The point where the ray hits a sphere is then moved to the
+sphere-local space of that sphere and tested against the sockets, the node discs and the edges on it. The discs
+are flat and touch the sphere at their center, as they are rendered, so where discs overlap the ray hits the disc
+it reaches first. Edges are hit near any of the line segments they are rendered with.
+All tests are done with NumPy for all items of a sphere at once.
+
+It can replace the ``MouseRay`` by setting the ``Ray_class`` of the :class:`~sphere_iot.uv_universe.Map`:
+
+    Map.Ray_class = AnalyticRay
+
+"""
+
+from sphere_base.sphere_universe.mouse_ray import MouseRay
+from sphere_base.constants import *
+import numpy as np
+
+DEBUG = False
+
+RAY_LENGTH = 100  # the same length as the ray used by the MouseRay
+EDGE_PICK_DISTANCE = 0.025  # distance from an edge that still hits the edge
+MAX_TESTS_PER_CHUNK = 1000000  # limits the size of the arrays when many points are tested against many items
+PICK_BANDS = 32  # many points are tested in bands around the sphere, in the order of their longitude
+
+SPHERE_TYPES = ('sphere_base', 'sphere_small')
+ITEM_TYPES = ('sphere_node', 'socket', 'edge')
+
+
+class AnalyticRay(MouseRay):
+    """
+    Picks the items under the mouse pointer with ray-sphere intersections and angle tests on the surface of
+    the spheres. It has the same methods as the :class:`~sphere_iot.uv_mouse_ray.MouseRay` so the rest of the
+    implementation does not see the difference.
+
+    """
+
+    def __init__(self, universe, pybullet_key=None):
+        """
+        Constructor of the ``AnalyticRay`` class.
+
+        :param universe: The :class:`~sphere_iot.uv_universe.Map` the ray is cast into.
+        :type universe:  :class:`~sphere_iot.uv_universe.Map`
+        :param pybullet_key: Not used, kept to have the same signature as the ``MouseRay``.
+
+        :Instance Attributes:
+
+            - **camera** - Instance of :class:`~sphere_iot.uv_cam.camera`
+            - **map** - Instance of :class:`~sphere_iot.uv_universe.Map`
+
+        :Instance Variables:
+
+            - **abs_pos** - position of the last collision point in world space
+            - **defer_collision_objects** - when ``True`` new nodes, sockets and edges are registered with the
+              next :meth:`update_dirty_collision_objects` instead of right away.
+
+        """
+
+        self.uv = universe
+        self.cam = universe.cam
+
+        self.defer_collision_objects = False
+
+        self.pybullet_key = pybullet_key
+        self.abs_pos = [0.0, 0.0, 0.0]
+
+        self._next_object_id = 0
+        self._spheres = {}  # object id -> sphere
+        self._items = {}  # object id -> node, socket or edge
+        self._sphere_items = {}  # sphere -> {object id: item}
+        self._sphere_data = {}  # sphere -> arrays used for picking, created when needed
+        self._dirty_items = {}  # items with positions that are not updated yet
+        self._init_ray_cache()
+
+    def get_collision_shape(self, obj):
+        """
+        There are no collision shapes, the radius of the object is used instead.
+        """
+        return getattr(obj, 'radius', None)
+
+    def create_collision_object(self, obj, vertices: list = None):
+        """
+        Registers the object so the ray can hit it.
+
+        :param obj: Can be: :class:`~sphere_iot.uv_sphere.Sphere`, :class:`~sphere_iot.uv_node.Node`,
+        :class:`~sphere_iot.uv_socket.Socket`, :class:`~sphere_iot.uv_edge.SphereSurfaceEdge``
+        :param vertices: when lines are drawn, the vertices of the line
+        :param vertices: ``list``
+        :returns: ``int`` object id or ``None``
+        """
+        if obj.type in SPHERE_TYPES:
+            object_id = self._get_new_object_id()
+            self._spheres[object_id] = obj
+            self._scene_version += 1
+            return object_id
+
+        if obj.type not in ITEM_TYPES:
+            return None
+
+        if self.defer_collision_objects:
+            self.mark_collision_object_dirty(obj)
+            return None
+
+        if obj.type == "edge" and not vertices:
+            return None
+
+        object_id = self._get_new_object_id()
+        sphere = self.get_sphere(obj)
+        self._items[object_id] = obj
+        self._sphere_items.setdefault(sphere, {})[object_id] = obj
+        self._drop_sphere_data(sphere)
+        return object_id
+
+    def create_collision_objects(self, items: list):
+        """
+        Registers many items at once.
+
+        :param items: items without a collision object
+        :type items: ``list``
+        """
+        for item in items:
+            item.collision_object_id = self.create_collision_object(item, item.vert if item.type == "edge" else None)
+
+    def has_collision_object(self, item) -> bool:
+        """
+        Returns ``True`` when the item is registered.
+
+        :param item: The model the collision object belongs to.
+        :param item: :class:`~sphere_iot.uv_sphere.Sphere`, :class:`~sphere_iot.uv_node.Node`,
+        :class:`~sphere_iot.uv_socket.Socket`, :class:`~sphere_iot.uv_edge.SphereSurfaceEdge`
+        :returns: ``bool``
+        """
+        object_id = item.collision_object_id
+        return self._spheres.get(object_id) is item or self._items.get(object_id) is item
+
+    def delete_collision_object(self, item):
+        """
+        Removes the item so the ray cannot hit it anymore.
+
+        :param item: The model the collision object belongs to.
+        :param item: :class:`~sphere_iot.uv_sphere.Sphere`, :class:`~sphere_iot.uv_node.Node`,
+        :class:`~sphere_iot.uv_socket.Socket`, :class:`~sphere_iot.uv_edge.SphereSurfaceEdge`
+        """
+        object_id = item.collision_object_id
+        self._dirty_items.pop(item, None)
+
+        if self._spheres.get(object_id) is item:
+            del self._spheres[object_id]
+            self._sphere_items.pop(item, None)
+            self._drop_sphere_data(item)
+
+        elif self._items.get(object_id) is item:
+            del self._items[object_id]
+            sphere = self.get_sphere(item)
+            self._sphere_items.get(sphere, {}).pop(object_id, None)
+            self._drop_sphere_data(sphere)
+
+    def reset_position_collision_object(self, item, vertices=None):
+        """
+        Updates the position of the item. Positions are read from the items when they are needed,
+        so only the stored arrays of the sphere the item is on are dropped.
+
+        :param vertices: The vertices of the model.
+        :param item: The model the collision object belongs to.
+        :param item: :class:`~sphere_iot.uv_sphere.Sphere`, :class:`~sphere_iot.uv_node.Node`,
+        :class:`~sphere_iot.uv_socket.Socket`, :class:`~sphere_iot.uv_edge.SphereSurfaceEdge`
+        """
+        object_id = item.collision_object_id
+
+        if object_id in self._spheres or object_id in self._items:
+            sphere = item if object_id in self._spheres else self.get_sphere(item)
+            self._drop_sphere_data(sphere)
+        else:
+            item.collision_object_id = self.create_collision_object(item, vertices)
+
+        return item.id, item.xyz
+
+    def _cast_mouse_ray(self, mouse_x: float, mouse_y: float) -> (int, list):
+        ray_world = self.get_mouse_point(mouse_x, mouse_y)
+        start = np.asarray(self.cam.xyz, dtype=np.float64)
+
+        items, points = self.cast_rays([start], [start + np.asarray(ray_world) * RAY_LENGTH])
+
+        if items[0] is None:
+            return None, None
+
+        self.abs_pos = tuple(points[0])
+        return items[0].id, self.abs_pos
+
+    def check_mouse_ray_batch(self, sphere, ray_array_start: 'Vector3', ray_array_end: 'Vector3') -> list:
+        """
+        Returns a ``list`` of object id`s of the objects in the path of the rays.
+
+        :param sphere: the sphere, which is left out of the result
+        :type sphere: :class:`~sphere_iot.uv_sphere.Sphere`
+        :param ray_array_start: The ray starting points
+        :type ray_array_start: ``Vector3``
+        :param ray_array_end: The ray ending points
+        :type ray_array_end: ``Vector3``
+        :return: list of object ids
+        """
+        self.update_dirty_collision_objects()
+        items, _ = self.cast_rays(ray_array_start, ray_array_end)
+
+        result_array = []
+        for item in items:
+            if item is not None and item.id != sphere.id and item.id not in result_array:
+                result_array.append(item.id)
+
+        return result_array
+
+    def cast_rays(self, ray_array_start, ray_array_end) -> (list, np.ndarray):
+        """
+        Returns the first object each ray hits and the collision points.
+
+        :param ray_array_start: (n, 3) ray starting points
+        :type ray_array_start: ``list`` or ``np.array``
+        :param ray_array_end: (n, 3) ray ending points
+        :type ray_array_end: ``list`` or ``np.array``
+        :returns: ``list`` with an item or ``None`` for each ray and (n, 3) ``np.array`` with collision points
+        """
+        starts = np.asarray(ray_array_start, dtype=np.float64).reshape(-1, 3)
+        ends = np.asarray(ray_array_end, dtype=np.float64).reshape(-1, 3)
+
+        hits = [None] * len(starts)
+        points = np.zeros((len(starts), 3))
+
+        spheres = list(self._spheres.values())
+        if not spheres:
+            return hits, points
+
+        sphere_index, t = self.intersect_spheres(starts, ends, spheres)
+        points = starts + (ends - starts) * t[:, np.newaxis]
+
+        for i, sphere in enumerate(spheres):
+            rays = np.flatnonzero(sphere_index == i)
+            if len(rays) == 0:
+                continue
+
+            for ray, item in zip(rays, self.pick_items(sphere, points[rays], ends[rays] - starts[rays])):
+                hits[ray] = sphere if item is None else item
+
+        return hits, points
+
+    @staticmethod
+    def intersect_spheres(starts, ends, spheres) -> (np.ndarray, np.ndarray):
+        """
+        Returns for each ray the index of the nearest sphere it hits, or -1, and the fraction of the ray
+        where it hits the sphere.
+
+        :param starts: (n, 3) ray starting points
+        :type starts: ``np.array``
+        :param ends: (n, 3) ray ending points
+        :type ends: ``np.array``
+        :param spheres: the spheres to test
+        :type spheres: ``list`` of :class:`~sphere_iot.uv_sphere.Sphere`
+        :returns: (n,) ``np.array`` sphere index and (n,) ``np.array`` ray fraction
+        """
+        centers = np.array([sphere.xyz for sphere in spheres], dtype=np.float64)
+        radii = np.array([sphere.radius for sphere in spheres], dtype=np.float64)
+
+        # solve |start + t * direction - center| = radius for t, for all rays and spheres at once
+        direction = ends - starts
+        offset = starts[:, np.newaxis, :] - centers[np.newaxis, :, :]
+        a = np.sum(direction * direction, axis=1)[:, np.newaxis]
+        b = np.sum(offset * direction[:, np.newaxis, :], axis=2)
+        c = np.sum(offset * offset, axis=2) - radii ** 2
+        discriminant = b * b - a * c
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            root = np.sqrt(discriminant)
+            t = (-b - root) / a
+            # the ray starts inside the sphere, use the exit point
+            t = np.where(t < 0, (-b + root) / a, t)
+
+        t = np.where((discriminant >= 0) & (t >= 0) & (t <= 1), t, np.inf)
+
+        sphere_index = np.argmin(t, axis=1)
+        t = t[np.arange(len(t)), sphere_index]
+        sphere_index = np.where(np.isfinite(t), sphere_index, -1)
+
+        return sphere_index, np.where(np.isfinite(t), t, 0.0)
+
+    def pick_items(self, sphere, points, directions=None) -> list:
+        """
+        Returns the item at each of the points on the surface of the sphere. Sockets are on top of the node
+        discs and node discs are on top of the edges.
+
+        :param sphere: the sphere the points are on
+        :type sphere: :class:`~sphere_iot.uv_sphere.Sphere`
+        :param points: (n, 3) points on the surface of the sphere in world space
+        :type points: ``np.array``
+        :param directions: (n, 3) directions of the rays hitting the points in world space. When left out the
+            points are seen from straight above.
+        :type directions: ``np.array``
+        :returns: ``list`` with an item or ``None`` for each point
+        """
+        data = self.get_sphere_data(sphere)
+        local_points = self.to_local(sphere, points)
+        if directions is None:
+            local_directions = -self._normalize(local_points)
+        else:
+            local_directions = self._normalize(np.asarray(directions, dtype=np.float64).reshape(-1, 3)
+                                               @ sphere.get_rotation_matrix()[:3, :3].T)
+        picked = np.full(len(points), None, dtype=object)
+
+        # neighbouring points go into the same chunk, so the bounding box of a chunk leaves out most items
+        band = np.floor(np.arccos(np.clip(self._normalize(local_points)[:, 2], -1.0, 1.0)) * PICK_BANDS / np.pi)
+        order = np.lexsort((np.arctan2(local_points[:, 1], local_points[:, 0]), band))
+
+        for kind in ('sockets', 'nodes', 'edges'):
+            items = data[kind]
+            if len(items) == 0:
+                continue
+
+            # only points without an item on top are tested
+            remaining = order[picked[order] == None]  # noqa: E711, elementwise comparison
+            chunk_size = max(1, MAX_TESTS_PER_CHUNK // len(items))
+
+            for first in range(0, len(remaining), chunk_size):
+                rays = remaining[first:first + chunk_size]
+                p = local_points[rays]
+
+                # leave out the items that are not near any of the points
+                low, high = p.min(axis=0), p.max(axis=0)
+                candidates = np.flatnonzero(np.all((data[kind + '_max'] >= low) & (data[kind + '_min'] <= high),
+                                                   axis=1))
+                if len(candidates) == 0:
+                    continue
+
+                if kind == 'edges':
+                    hit = self._pick_edges(p, data['edge_starts'][candidates], data['edge_ends'][candidates])
+                else:
+                    hit = self._pick_discs(p, local_directions[rays], data[kind + '_positions'][candidates],
+                                           data[kind + '_radii'][candidates])
+
+                found = hit >= 0
+                picked[rays[found]] = items[candidates[hit[found]]]
+
+        return picked.tolist()
+
+    @staticmethod
+    def _pick_discs(points, directions, positions, radii) -> np.ndarray:
+        # index of the first flat disc each ray passes through, or -1. The discs touch the sphere at their center.
+        normals = positions / np.maximum(np.linalg.norm(positions, axis=1, keepdims=True), 1e-12)
+        facing = directions @ normals.T
+        with np.errstate(invalid='ignore', divide='ignore'):
+            # where the ray through the point crosses the plane of each disc, negative is before the point
+            s = (np.sum(normals * positions, axis=1)[np.newaxis, :] - points @ normals.T) / facing
+
+        crossing = points[:, np.newaxis, :] + s[:, :, np.newaxis] * directions[:, np.newaxis, :]
+        distance = np.linalg.norm(crossing - positions[np.newaxis, :, :], axis=2)
+        s = np.where((facing < 0) & (distance <= radii[np.newaxis, :]), s, np.inf)
+
+        first = np.argmin(s, axis=1)
+        return np.where(np.isfinite(s[np.arange(len(points)), first]), first, -1)
+
+    @staticmethod
+    def _pick_edges(points, starts, ends) -> np.ndarray:
+        # index of the nearest line segment close enough to each point, or -1
+        segments = ends - starts
+        length = np.maximum(np.sum(segments * segments, axis=1), 1e-12)
+
+        offset = points[:, np.newaxis, :] - starts[np.newaxis, :, :]
+        t = np.clip(np.sum(offset * segments[np.newaxis, :, :], axis=2) / length, 0.0, 1.0)
+        distance = np.linalg.norm(offset - t[:, :, np.newaxis] * segments[np.newaxis, :, :], axis=2)
+
+        distance = np.where(distance <= EDGE_PICK_DISTANCE, distance, np.inf)
+        nearest = np.argmin(distance, axis=1)
+        return np.where(np.isfinite(distance[np.arange(len(points)), nearest]), nearest, -1)
+
+    def get_sphere_data(self, sphere) -> dict:
+        """
+        Returns the arrays with the sphere-local positions of the sockets, node discs and edges on the sphere.
+        Each line segment of an edge is stored on its own, ``edges`` holds the edge of each segment.
+        They are created again after an item on the sphere is added, moved or removed. Rotating the sphere
+        does not change them.
+
+        :param sphere: the sphere
+        :type sphere: :class:`~sphere_iot.uv_sphere.Sphere`
+        :returns: ``dict``
+        """
+        data = self._sphere_data.get(sphere)
+        if data is not None:
+            return data
+
+        sockets, nodes, edges, edge_vertices = [], [], [], []
+        center = np.asarray(sphere.xyz, dtype=np.float64)
+
+        for item in self._sphere_items.get(sphere, {}).values():
+            if item.type == 'socket':
+                sockets.append(item)
+            elif item.type == 'sphere_node':
+                nodes.append(item)
+            elif item.type == 'edge' and len(item.vert) > 1:
+                # the vertices are stored around the center of the sphere
+                edges += [item] * (len(item.vert) - 1)
+                edge_vertices.append(np.asarray(item.vert, dtype=np.float64).reshape(-1, 3) - center)
+
+        # the segments between the vertices of all edges
+        edge_starts = np.concatenate([vertices[:-1] for vertices in edge_vertices]) if edges else np.zeros((0, 3))
+        edge_ends = np.concatenate([vertices[1:] for vertices in edge_vertices]) if edges else np.zeros((0, 3))
+
+        data = {
+            'edges': self._to_object_array(edges),
+            'edges_min': np.minimum(edge_starts, edge_ends) - EDGE_PICK_DISTANCE,
+            'edges_max': np.maximum(edge_starts, edge_ends) + EDGE_PICK_DISTANCE,
+            'edge_starts': edge_starts,
+            'edge_ends': edge_ends,
+        }
+        for kind, items, default_radius in (('sockets', sockets, SOCKET_RADIUS), ('nodes', nodes, NODE_DISC_RADIUS)):
+            positions = self._get_local_positions(sphere, items)
+            radii = self._get_radii(items, default_radius)
+            data[kind] = self._to_object_array(items)
+            data[kind + '_positions'] = positions
+            data[kind + '_radii'] = radii
+            data[kind + '_min'] = positions - radii[:, np.newaxis]
+            data[kind + '_max'] = positions + radii[:, np.newaxis]
+
+        if DEBUG:
+            print("analytic ray data", len(sockets), "sockets,", len(nodes), "nodes,", len(edge_vertices), "edges")
+
+        self._sphere_data[sphere] = data
+        return data
+
+    @staticmethod
+    def _to_object_array(items) -> np.ndarray:
+        array = np.empty(len(items), dtype=object)
+        array[:] = items
+        return array
+
+    def _get_local_positions(self, sphere, items) -> np.ndarray:
+        positions = [item.local_xyz if hasattr(item, 'local_xyz') else self.to_local(sphere, [item.xyz])[0]
+                     for item in items]
+        return np.array(positions, dtype=np.float64).reshape(-1, 3)
+
+    @staticmethod
+    def _get_radii(items, default) -> np.ndarray:
+        return np.array([getattr(item, 'collision_object_radius', default) for item in items], dtype=np.float64)
+
+    @staticmethod
+    def _normalize(vectors) -> np.ndarray:
+        length = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        return vectors / np.where(length > 0, length, 1)
+
+    @staticmethod
+    def to_local(sphere, points) -> np.ndarray:
+        """
+        Moves points in world space to the sphere-local space of the sphere.
+
+        :param sphere: the sphere
+        :type sphere: :class:`~sphere_iot.uv_sphere.Sphere`
+        :param points: (n, 3) points in world space
+        :type points: ``np.array``
+        :returns: (n, 3) ``np.array``
+        """
+        rotation = sphere.get_rotation_matrix()[:3, :3]
+        return (np.asarray(points, dtype=np.float64) - np.asarray(sphere.xyz)) @ rotation.T
+
+    @staticmethod
+    def get_sphere(item):
+        """
+        Returns the sphere the item is on.
+        """
+        return item.node.sphere if item.type == 'socket' else item.sphere
+
+    def _drop_sphere_data(self, sphere):
+        # the arrays are created again the next time a ray hits the sphere
+        self._sphere_data.pop(sphere, None)
+        self._scene_version += 1
+
+    def get_scene_version(self):
+        """
+        Returns a value that changes when an object is created, moved or deleted, or when a sphere moved
+        or rotated. The spheres are read when the ray is cast, so their position and orientation are part of it.
+        """
+        return self._scene_version, tuple((tuple(sphere.xyz), tuple(sphere.orientation))
+                                          for sphere in self._spheres.values())
+
+    def _get_new_object_id(self) -> int:
+        object_id = self._next_object_id
+        self._next_object_id += 1
+        return object_id
+
+    def reset(self):
+        """
+        Removes all objects
+
+        """
+        self._spheres = {}
+        self._items = {}
+        self._sphere_items = {}
+        self._sphere_data = {}
+        self._dirty_items = {}
+        self._scene_version += 1
+
+    def debug_collision_object(self, collision_object_id: int, item):
+        print("\n---------------------------")
+        print("Node id and collision object id  :             ", item.id, collision_object_id)
+        print("Node id and position and rotation :            ", item.xyz, item.orientation)
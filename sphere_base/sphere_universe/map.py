@@ -9,15 +9,21 @@ from collections import OrderedDict
 from sphere_base.utils.serializable import Serializable
 from sphere_base.sphere.sphere import Sphere
 from sphere_base.model.models import Models
+from sphere_base.model.instanced_renderer import InstancedRenderer
+from sphere_base.model.render_queue import RenderQueue
 from sphere_base.sphere_universe.mouse_ray import MouseRay
 from sphere_base.sphere_universe.camera import Camera
+from sphere_base.sphere_universe.view_culling import ViewCulling
 from sphere_base.sphere_universe.skybox import Skybox
 from sphere_base.sphere_universe.rubber_band_box import RubberBand
 from sphere_base.clipboard import Clipboard
 from sphere_base.config import UvConfig
 from sphere_base.shader.default_shader import DefaultShader
 from sphere_base.utils.utils import dump_exception
+from sphere_base.constants import INSTANCED_RENDERING, SPHERE_LOAD_DISTANCE
+import numpy as np
 import os.path
+import time
 
 TEST_SPHERE_NUMBER = 1
 
@@ -26,7 +32,10 @@ class Map(Serializable):
     # This class represents the map or map. It contains all the objects in the space
 
     Camera_class = Camera
+    ViewCulling_class = ViewCulling
     Models_class = Models
+    InstancedRenderer_class = InstancedRenderer
+    RenderQueue_class = RenderQueue
     Sphere_class = Sphere
     Shader_class = DefaultShader
     Ray_class = MouseRay
@@ -51,6 +60,8 @@ class Map(Serializable):
         self.mouse_offset = 0
         self.target_sphere = None
         self._has_been_modified = False
+        self.history_memory_budget = None  # maximum number of bytes used by the history of all spheres
+        self.sphere_unload_timeout = None  # seconds before the items of an unused sphere are released, or None
 
         self._init_listeners()
 
@@ -59,7 +70,10 @@ class Map(Serializable):
                                                   sphere_icon_dir=sphere_icon_dir)
         self.shader = self.__class__.Shader_class(self)
         self.cam = self.__class__.Camera_class(self)
+        self.culling = self.__class__.ViewCulling_class(self)
+        self.render_queue = self.__class__.RenderQueue_class(self)
         self.models = self.__class__.Models_class(self)
+        self.instanced_renderer = self.__class__.InstancedRenderer_class(self) if INSTANCED_RENDERING else None
         self.Sphere = self.__class__.Sphere_class  # not instantiated here!
 
         self.mouse_ray = self.__class__.Ray_class(self, 1)
@@ -142,6 +156,7 @@ class Map(Serializable):
         self._spheres.append(sphere)
         sphere.add_selection_changed_listener(self.on_selection_changed)
         sphere.add_has_been_modified_listener(self.on_modified)
+        sphere.history.add_history_modified_listener(self.request_redraw)
 
     def remove_sphere(self, sphere):
         """
@@ -155,6 +170,36 @@ class Map(Serializable):
         if sphere in self._spheres:
             self._spheres.remove(sphere)
 
+    def get_history_memory_usage(self) -> int:
+        """
+        Returns the number of bytes used by the history of all spheres.
+
+        :returns: ``int``
+        """
+        return sum(sphere.history.get_memory_usage() for sphere in self._spheres)
+
+    def limit_history_memory_usage(self, budget: int):
+        """
+        Removes the oldest history stamps of the spheres using the most memory until the history of all spheres
+        fits in the budget.
+
+        :param budget: maximum number of bytes used by the history of all spheres
+        :type budget: ``int``
+        """
+        usage = {sphere.history: sphere.history.get_memory_usage() for sphere in self._spheres}
+        total = sum(usage.values())
+
+        while total > budget and usage:
+            history = max(usage, key=usage.get)
+            if not history.remove_oldest_stamp():
+                # nothing left to remove from this history
+                del usage[history]
+                continue
+
+            new_usage = history.get_memory_usage()
+            total -= usage[history] - new_usage
+            usage[history] = new_usage
+
     def add_edge(self, edge):
         """
         Add a new edge to the internal list.
@@ -207,6 +252,7 @@ class Map(Serializable):
         :class:`~sphere_iot.uv_edge.SphereSurfaceEdge`
 
         """
+        self.request_redraw()
         for callback in self._selection_changed_listeners:
             callback(sphere, sphere_items)
 
@@ -262,6 +308,7 @@ class Map(Serializable):
         is_sphere = False
         for sphere in self._spheres:
             if selected_sphere_id == sphere.id:
+                sphere.load_items()
                 self.target_sphere.selected = False
                 sphere.selected = True
                 self.target_sphere = sphere
@@ -335,16 +382,58 @@ class Map(Serializable):
         if rotation or angle_up or radius:
             self.cam.process_movement(self.target_sphere, rotation, angle_up, radius=radius)
 
+    def request_redraw(self):
+        """
+        Marks the map as changed, the map widget renders a new frame. Call this after changing the map
+        in a way that does not store history.
+
+        """
+        self.map_widget.request_redraw()
+
+    def is_animating(self) -> bool:
+        """
+        Returns ``True`` while the map changes by itself: a rotating sphere_base, a rotation from the mouse that
+        still needs to be applied or a camera moving to a new target.
+
+        """
+        if self.mouse_offset or self.cam.movement_stack:
+            return True
+        return any(sphere.animation for sphere in self._spheres)
+
     def get_mouse_pos(self):
         # helper function to get the mouse variables
         print("here")
         return self.view.get_mouse_pos()
 
-    def draw(self):
+    def update_sphere_loading(self):
+        """
+        Builds the items of the spheres the camera gets close to. When ``sphere_unload_timeout`` is set the items of
+        spheres that have not been the target or close to the camera for that many seconds are released again.
+        """
+        now = time.monotonic()
+        cam_xyz = np.asarray(self.cam.xyz, dtype=np.float64)
+
         for sphere in self._spheres:
-            sphere.draw()
-        for edge in self._edges:
-            edge.draw()
+            distance = np.linalg.norm(np.asarray(sphere.xyz, dtype=np.float64) - cam_xyz)
+            if sphere is self.target_sphere or distance < SPHERE_LOAD_DISTANCE:
+                sphere.load_items()
+            elif self.sphere_unload_timeout is not None and sphere.loaded and \
+                    now - sphere.last_used > self.sphere_unload_timeout:
+                sphere.unload_items()
+
+    def draw(self):
+        self.update_sphere_loading()
+        self.culling.update()
+
+        # the spheres and items submit their draw calls, they are drawn sorted when the queue is flushed
+        self.render_queue.begin()
+        try:
+            for sphere in self._spheres:
+                sphere.draw()
+            for edge in self._edges:
+                edge.draw()
+        finally:
+            self.render_queue.flush()
 
     def serialize(self):
         spheres = []
@@ -380,14 +469,17 @@ class Map(Serializable):
                 self.skybox.skybox_id = data['skybox_id']
                 self.skybox.create_skybox_faces()
 
-        # deserialize spheres
+        # deserialize spheres, only the target sphere builds its items right away. The other spheres are
+        # unloaded before their data is deserialized, so they keep the data of their items as placeholders.
         for sphere_data in data['spheres']:
-            self.Sphere(self, [0.0, 0.0, 0.0], 0).deserialize(sphere_data, hashmap)
+            sphere = self.Sphere(self, [0.0, 0.0, 0.0], 0)
+            sphere.unload_items()
+            sphere.deserialize(sphere_data, hashmap)
 
         for sphere in self._spheres:
             if data['target_sphere_id'] == sphere.id:
                 self.target_sphere = sphere
-                self.target_sphere.history.store_initial_history_stamp()
+                self.target_sphere.load_items()
 
         # deserialize camera
         for camera in data['camera']:
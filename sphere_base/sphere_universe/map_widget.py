@@ -14,9 +14,11 @@ import json
 
 from OpenGL.GL import *
 from sphere_base.sphere_universe.map import Map
+from sphere_base.sphere_universe.redraw_scheduler import RedrawScheduler
 from sphere_base.utils.key_handler import KeyHandler
 from sphere_base.constants import *
 from sphere_base.utils.utils import dump_exception
+from sphere_base.utils.binary_map import BINARY_MAP_EXTENSION, save_binary_map, load_binary_map, is_binary_map_file
 
 
 class MapWidget(QOpenGLWidget):
@@ -26,6 +28,7 @@ class MapWidget(QOpenGLWidget):
     """
 
     Map_class = Map
+    RedrawScheduler_class = RedrawScheduler
     # keyPressed = pyqtSignal(int)
     keys = {'right': False, 'left': False, 'forward': False, 'back': False,
             'up': False, 'down': False, '_shift': False, '_ctrl': False}
@@ -42,8 +45,12 @@ class MapWidget(QOpenGLWidget):
         self.pybullet_key, self._clicked_on_item, self.mouse_ray_collision_point = None, None, None
         self.mouse_x, self.mouse_y, self.map, self.is_dragging = None, None, None, None
         self.mouse_last_x, self.mouse_last_y = None, None
+        self._hovered_item = None
         self._delayed_init_listeners = []
 
+        # frames are rendered when the map changed, see request_redraw
+        self.redraw = self.__class__.RedrawScheduler_class(self)
+
         self.setMinimumSize(640, 480)
         self.view_width, self.view_height = self.width(), self.height()
 
@@ -80,6 +87,7 @@ class MapWidget(QOpenGLWidget):
         # Initialize PyQt6 OpenGl. After initializing continue with initializing any of the delayed initializations.
         print("here")
         self.map = self.__class__.Map_class(self, pybullet_key=self.pybullet_key)
+        self.map.config.add_view_changed_listener(self.request_redraw)
 
         if not self._is_initialized:
 
@@ -90,6 +98,26 @@ class MapWidget(QOpenGLWidget):
 
         self._is_initialized = True
 
+    def request_redraw(self, *args):
+        # Mark the map as changed, a new frame is rendered as soon as the frame rate cap allows
+        self.redraw.request()
+
+    @property
+    def max_frame_rate(self):
+        return self.redraw.max_frame_rate
+
+    @max_frame_rate.setter
+    def max_frame_rate(self, value):
+        self.redraw.max_frame_rate = value
+
+    def event(self, event):
+        # input changes the map or the camera, any of it needs a new frame
+        if event.type() in (QEvent.Type.MouseButtonPress, QEvent.Type.MouseButtonRelease,
+                            QEvent.Type.MouseButtonDblClick, QEvent.Type.Wheel, QEvent.Type.KeyPress,
+                            QEvent.Type.KeyRelease, QEvent.Type.ContextMenu):
+            self.request_redraw()
+        return super().event(event)
+
     def resizeGL(self, width, height):
         # Resize the screen
 
@@ -218,11 +246,19 @@ class MapWidget(QOpenGLWidget):
 
         if self.map.target_sphere and self.map.cam.distance_to_target < HOVER_MIN_DISTANCE:
             hovered_item = self.map.target_sphere.check_for_hover(self.mouse_x, self.mouse_y)
+            if hovered_item is not self._hovered_item:
+                # the colors of the hovered items changed
+                self._hovered_item = hovered_item
+                self.request_redraw()
+
             if hovered_item:
                 self.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
             else:
                 self.setCursor(QCursor(Qt.CursorShape.ArrowCursor))
 
+        if self._left_mouse_button_down or self._middle_mouse_button_down:
+            self.request_redraw()
+
         if self._left_mouse_button_down:
 
             if self._clicked_on_item and self.map.target_sphere.selected_item:
@@ -384,12 +420,20 @@ class MapWidget(QOpenGLWidget):
         #     self.map.target_sphere.create_new_node(1, self.mouse_ray_collision_point)
 
     def save_to_file(self, file_name: str):
-        # Save json to file
+        # Save json to file, or the binary map format when the file has its extension
+        if file_name.endswith(BINARY_MAP_EXTENSION):
+            save_binary_map(self.map.serialize(), file_name)
+            return
+
         with open(file_name, "w") as file:
             file.write(json.dumps(self.map.serialize(), indent=4))
 
     def load_from_file(self, file_name):
-        # Load json from file
+        # Load json or a binary map from file
+        self.request_redraw()
+        if is_binary_map_file(file_name):
+            self.map.deserialize(load_binary_map(file_name))
+            return
 
         with open(file_name, "r") as file:
             raw_data = file.read()
@@ -401,6 +445,7 @@ class MapWidget(QOpenGLWidget):
     def uv_new(self):
         # re-create the map
         self.map.uv_new()
+        self.request_redraw()
 
     def on_edit_undo(self):
         self.map.target_sphere.on_edit_undo()
@@ -424,24 +469,33 @@ class MapWidget(QOpenGLWidget):
 
     def paintGL(self):
         """
-        The main loop for rendering all objects
+        Renders a frame. Frames are scheduled by the redraw scheduler, only when the map changed or while it
+        is animating.
 
         """
+        self.redraw.begin_frame()
+        try:
+            # checking if the camera is moved with the keyboard
+            self.map.do_camera_movement()
 
-        # checking if the camera is moved with the keyboard
-        self.map.do_camera_movement()
+            # checking if the target sphere is rotated with the keyboard
+            self.map.rotate_target_sphere()
 
-        # checking if the target sphere is rotated with the keyboard
-        self.map.rotate_target_sphere()
+            glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT | GL_STENCIL_BUFFER_BIT)
+            self.map.config.gl_state.begin_frame()
 
-        glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT | GL_STENCIL_BUFFER_BIT)
+            self.map.cam.draw()
 
-        self.map.cam.draw()
-        self.map.skybox.draw()
+            # the view and projection of this frame are loaded once for all shader programs
+            self.map.config.camera_uniforms.update()
+            self.map.skybox.draw()
 
-        self.map.draw()
+            self.map.draw()
 
-        if self.map.rubber_band_box:
-            self.map.rubber_band_box.draw()
+            if self.map.rubber_band_box:
+                self.map.rubber_band_box.draw()
 
-        self.update()
+            # collision objects changed during this frame are updated once
+            self.map.mouse_ray.update_dirty_collision_objects()
+        finally:
+            self.redraw.end_frame()
@@ -17,6 +17,7 @@ from pyrr import Vector3, Vector4, vector, matrix44
 from sphere_base.constants import *
 from sphere_base.utils.utils import dump_exception
 from pybullet_utils import bullet_client as bc
+import numpy as np
 
 DEBUG = False
 DEBUG_SHOW_GUI = False
@@ -34,6 +35,11 @@ COLLISION_SHAPES = {
                      "baseVisualShapeIndex": -1},
           }
 
+# items of which the creation of the collision object can be deferred
+DEFERRED_TYPES = ('sphere_node', 'socket', 'edge')
+
+RAY_SEED = 13  # rays per side of a selection rectangle, 10 creates 10 x 10 = 100 rays, x creates x**2 rays
+
 
 class MouseRay:
     """
@@ -56,21 +62,39 @@ class MouseRay:
             - **camera** - Instance of :class:`~sphere_iot.uv_cam.camera`
             - **map** - Instance of :class:`~sphere_iot.uv_universe.Map`
 
+        :Instance Variables:
+
+            - **defer_collision_objects** - when ``True`` new nodes, sockets and edges get their collision object
+              with the next :meth:`update_dirty_collision_objects` instead of right away.
+
         """
 
         self.uv = universe
         self.cam = universe.cam
 
+        self.defer_collision_objects = False
         self.client_id = 0
         self.pybullet_key = pybullet_key
         self.abs_pos = [0.0, 0.0, 0.0]  # position of mouse ray collision point in world space
 
-        self._collision_objects = {}
+        self._collision_objects = {}  # collision object id -> item id
+        self._collision_object_shapes = {}  # collision object id -> collision shape id or vertices of the edge mesh
         self._collision_shapes = {}
+        self._dirty_items = {}  # items with collision objects that are not updated yet, in the order they changed
+        self._init_ray_cache()
 
         self._open_bullet_client(self.pybullet_key)
         self._create_collision_shapes()
 
+    def _init_ray_cache(self):
+        # the result of the last mouse ray is used again while the mouse, camera and scene do not change
+        self._scene_version = 0  # changes when a collision object is created, moved or deleted
+        self._last_ray = (None, None)  # key and result of the last mouse ray
+        self._projection_matrix = None
+        self._inverse_projection_matrix = None
+        self._view_key = None
+        self._view_matrix = None
+
     def _open_bullet_client(self, pybullet_key):
         try:
             if DEBUG_SHOW_GUI:
@@ -122,6 +146,11 @@ class MouseRay:
         :param vertices: when lines are drawn, the vertices determine the collision shape
         :param vertices: ``list``
         """
+        if self.defer_collision_objects and obj.type in DEFERRED_TYPES:
+            # created together with the other new items by update_dirty_collision_objects
+            self.mark_collision_object_dirty(obj)
+            return None
+
         cs = COLLISION_SHAPES
 
         for key in cs.keys():
@@ -132,14 +161,21 @@ class MouseRay:
                         # print("edge with no vertex list")
                         return None
 
-                    collision_shape_id = self.bullet.createCollisionShape(p.GEOM_MESH, vertices=vertices,
+                    # the mesh is kept in the sphere-local space of the sphere the edge is on, rotating the
+                    # sphere only changes the position and orientation of the collision object
+                    sphere_xyz = obj.sphere.xyz
+                    local_vertices = (np.asarray(vertices, dtype=np.float64) - sphere_xyz).tolist()
+                    collision_shape_id = self.bullet.createCollisionShape(p.GEOM_MESH, vertices=local_vertices,
                                                                           flags=p.GEOM_FORCE_CONCAVE_TRIMESH)
                     # print(obj.type, collision_shape_id)
                     object_id = self.bullet.createMultiBody(baseMass=cs[key]["base_mass"],
                                                             baseCollisionShapeIndex=collision_shape_id,
                                                             baseVisualShapeIndex=cs[key]["baseVisualShapeIndex"],
-                                                            baseOrientation=obj.orientation,
+                                                            basePosition=[sphere_xyz[0], sphere_xyz[1],
+                                                                          sphere_xyz[2]],
+                                                            baseOrientation=obj.sphere.orientation,
                                                             physicsClientId=self.client_id)
+                    self._collision_object_shapes[object_id] = vertices
                 elif key == "sphere_base":
                     object_id = self.bullet.createMultiBody(baseMass=cs[key]["base_mass"],
                                                             baseCollisionShapeIndex=obj.collision_shape_id,
@@ -147,6 +183,7 @@ class MouseRay:
                                                             basePosition=[obj.xyz[0], obj.xyz[1], obj.xyz[2]],
                                                             baseOrientation=obj.orientation,
                                                             physicsClientId=self.client_id)
+                    self._collision_object_shapes[object_id] = obj.collision_shape_id
                 else:
 
                     object_id = self.bullet.createMultiBody(baseMass=cs[key]["base_mass"],
@@ -157,6 +194,7 @@ class MouseRay:
                                                             physicsClientId=self.client_id)
 
                 self._collision_objects[object_id] = obj.id
+                self._scene_version += 1
                 return object_id
 
     def delete_collision_object(self, item):
@@ -167,45 +205,121 @@ class MouseRay:
         :param item: :class:`~sphere_iot.uv_sphere.Sphere`, :class:`~sphere_iot.uv_node.Node`,
         :class:`~sphere_iot.uv_socket.Socket`, :class:`~sphere_iot.uv_edge.SphereSurfaceEdge`
         """
+        self._dirty_items.pop(item, None)
+        if not self.has_collision_object(item):
+            return
+
         self.bullet.removeBody(item.collision_object_id, physicsClientId=self.client_id)
+        del self._collision_objects[item.collision_object_id]
+        self._scene_version += 1
+        self._collision_object_shapes.pop(item.collision_object_id, None)
 
-    def reset_position_collision_object(self, item, vertices=None):
+    def has_collision_object(self, item) -> bool:
         """
-        Reset the collision object of the item
+        Returns ``True`` when the collision object of the item exists.
 
-        :param vertices: The vertices of the model.
         :param item: The model the collision object belongs to.
         :param item: :class:`~sphere_iot.uv_sphere.Sphere`, :class:`~sphere_iot.uv_node.Node`,
         :class:`~sphere_iot.uv_socket.Socket`, :class:`~sphere_iot.uv_edge.SphereSurfaceEdge`
+        :returns: ``bool``
+        """
+        object_id = item.collision_object_id
+        return object_id is not None and self._collision_objects.get(object_id) == item.id
 
-        .. warning::
+    def mark_collision_object_dirty(self, item):
+        """
+        Marks the collision object of the item as no longer up to date. It is updated only once by
+        :meth:`update_dirty_collision_objects`, however often the item changes before that.
 
-            The build in 'reset method' of PyBullet does not give the desired result. It did not work for me.
-            The workaround is to delete the current collision object and create a new one. This is likely
-            more expensive.
+        :param item: The model the collision object belongs to.
+        :param item: :class:`~sphere_iot.uv_sphere.Sphere`, :class:`~sphere_iot.uv_node.Node`,
+        :class:`~sphere_iot.uv_socket.Socket`, :class:`~sphere_iot.uv_edge.SphereSurfaceEdge`
+        """
+        self._dirty_items[item] = None
 
-            It is also executed quite often and more than is strictly needed. When the position
-            of the model changes the position of the collision object is updated too. This might be changed in
-            an update that only takes place when dragging stops or when a button is released.
+    def update_dirty_collision_objects(self):
+        """
+        Updates the collision objects of all items marked as dirty. This is done before the mouse ray is cast
+        and at the end of each frame.
+        """
+        if self.defer_collision_objects:
+            return
 
+        new_items, items = [], []
+        for item in self._dirty_items:
+            (items if self.has_collision_object(item) else new_items).append(item)
+        self._dirty_items = {}
+
+        self.create_collision_objects(new_items)
+        for item in items:
+            self.reset_position_collision_object(item, item.vert if item.type == "edge" else None)
+
+    def create_collision_objects(self, items: list):
         """
-        # TODO: resetting does not work correctly and we are using a workaround: destroying
-        #       the current collision object and re-creating it
-        #
+        Creates the collision objects of many items at once. The nodes and sockets of each type are created
+        with a single ``createMultiBody`` call and turned to their orientation afterwards.
 
-        try:
-            # This does not work:
-            # self.bullet.resetBasePositionAndOrientation(bodyUniqueId=item.collision_object_id,
-            #                                   posObj=[item.xyz[0], item.xyz[1], item.xyz[2]],
-            #                                   ornObj=item.orientation,
-            #                                   physicsClientId=self.client_id)
+        :param items: items without a collision object
+        :type items: ``list``
+        """
+        batches = {}
+        for item in items:
+            if item.type in ('sphere_node', 'socket'):
+                batches.setdefault(item.type, []).append(item)
+            else:
+                item.collision_object_id = self.create_collision_object(item, item.vert if item.type == "edge"
+                                                                        else None)
+
+        cs = COLLISION_SHAPES
+        for key, batch in batches.items():
+            try:
+                positions = [list(item.xyz) for item in batch]
+                object_ids = self.bullet.createMultiBody(baseMass=cs[key]["base_mass"],
+                                                         baseCollisionShapeIndex=self._collision_shapes[key],
+                                                         baseVisualShapeIndex=cs[key]["baseVisualShapeIndex"],
+                                                         batchPositions=positions,
+                                                         physicsClientId=self.client_id)
+
+                for item, object_id, position in zip(batch, object_ids, positions):
+                    self.bullet.resetBasePositionAndOrientation(bodyUniqueId=object_id, posObj=position,
+                                                               ornObj=item.orientation,
+                                                               physicsClientId=self.client_id)
+                    item.collision_object_id = object_id
+                    self._collision_objects[object_id] = item.id
+
+                self._scene_version += 1
+
+            except Exception as e:
+                dump_exception(e)
+
+    def reset_position_collision_object(self, item, vertices=None):
+        """
+        Moves the collision object of the item to the position and orientation of the item.
 
-            # the below works for now.... But I imagine it will to have too much overhead. Instead of moving an
-            # object we are destroying and then recreating it.
+        The collision object is only created again when its shape changed, which is when the radius of the
+        sphere changed or when the edge has new vertices.
 
-            if item.collision_object_id:
-                self.bullet.removeBody(item.collision_object_id, physicsClientId=self.client_id)
-            self.create_collision_object(item, vertices)
+        :param vertices: The vertices of the model.
+        :param item: The model the collision object belongs to.
+        :param item: :class:`~sphere_iot.uv_sphere.Sphere`, :class:`~sphere_iot.uv_node.Node`,
+        :class:`~sphere_iot.uv_socket.Socket`, :class:`~sphere_iot.uv_edge.SphereSurfaceEdge`
+
+        .. note::
+
+            The mesh of an edge is kept in the sphere-local space of its sphere. Rotating the sphere only
+            changes the position and orientation of the collision object of the edge.
+
+        """
+        try:
+            if not self.has_collision_object(item) or self._shape_changed(item, vertices):
+                self.delete_collision_object(item)
+                item.collision_object_id = self.create_collision_object(item, vertices)
+            else:
+                position, orientation = self.get_collision_object_pose(item)
+                self.bullet.resetBasePositionAndOrientation(bodyUniqueId=item.collision_object_id,
+                                                           posObj=position, ornObj=orientation,
+                                                           physicsClientId=self.client_id)
+                self._scene_version += 1
 
         except Exception as e:
             print("item", item)
@@ -217,6 +331,26 @@ class MouseRay:
 
         return item.id, item.xyz
 
+    def _shape_changed(self, item, vertices) -> bool:
+        shape = self._collision_object_shapes.get(item.collision_object_id)
+        if item.type == "edge":
+            return vertices is not None and vertices != shape
+        if item.type == "sphere_base":
+            return item.collision_shape_id != shape
+        return False
+
+    @staticmethod
+    def get_collision_object_pose(item) -> (list, list):
+        """
+        Returns the position and orientation of the collision object of the item in world space.
+        The collision object of an edge has the position and orientation of its sphere.
+
+        :param item: The model the collision object belongs to.
+        :returns: position and orientation
+        """
+        obj = item.sphere if item.type == "edge" else item
+        return [obj.xyz[0], obj.xyz[1], obj.xyz[2]], list(obj.orientation)
+
     def check_mouse_ray(self, mouse_x: float, mouse_y: float) -> (int, list):
         """
         returns name and position of the collision object the mouse ray collides with.
@@ -227,6 +361,18 @@ class MouseRay:
         :type mouse_y: ``float``
         :returns: id of the collision object id and its position
         """
+        self.update_dirty_collision_objects()
+
+        # the same ray is cast more than once for a single mouse event
+        key = (mouse_x, mouse_y, self.get_scene_version(), self.get_view_key())
+        if self._last_ray[0] == key and self.uv.shader.projection_matrix is self._projection_matrix:
+            return self._last_ray[1]
+
+        result = self._cast_mouse_ray(mouse_x, mouse_y)
+        self._last_ray = (key, result)
+        return result
+
+    def _cast_mouse_ray(self, mouse_x: float, mouse_y: float) -> (int, list):
         ray_world = self.get_mouse_point(mouse_x, mouse_y)
 
         intersection = self.bullet.rayTest(self.cam.xyz, self.cam.xyz + (ray_world * 100),
@@ -260,6 +406,7 @@ class MouseRay:
         """
 
         # used by rubber band box
+        self.update_dirty_collision_objects()
         result_array = []
         point_at = self.bullet.rayTestBatch(ray_array_start, ray_array_end, physicsClientId=self.client_id)
 
@@ -270,6 +417,73 @@ class MouseRay:
 
         return result_array
 
+    def check_mouse_rectangle(self, sphere, start_point: list, end_point: list) -> list:
+        """
+        Returns a ``list`` of object id`s of the collision objects within a rectangle on the screen.
+        A grid of ``RAY_SEED`` x ``RAY_SEED`` rays is sent through the rectangle.
+
+        More rays give a higher rate of success in selecting edges, but also take up more resources.
+
+        :param sphere: the sphere, which is left out of the result
+        :type sphere: :class:`~sphere_iot.uv_sphere.Sphere`
+        :param start_point: mouse position of one corner of the rectangle
+        :type start_point: ``list``
+        :param end_point: mouse position of the opposite corner of the rectangle
+        :type end_point: ``list``
+        :return: list of collision object ids
+        """
+        ray_array_start = []
+        ray_array_end = []
+
+        step_x = ((end_point[0] - start_point[0]) / RAY_SEED)
+        step_y = ((end_point[1] - start_point[1]) / RAY_SEED)
+
+        for x in range(RAY_SEED):
+            for y in range(RAY_SEED):
+                ray_start = self.cam.xyz
+                ray_world = self.get_mouse_point(start_point[0] + x * step_x, start_point[1] + y * step_y)
+                ray_end = self.cam.xyz + ray_world * 30
+                ray_array_start.append(ray_start)
+                ray_array_end.append(ray_end)
+
+        return self.check_mouse_ray_batch(sphere, ray_array_start, ray_array_end)
+
+    def get_scene_version(self):
+        """
+        Returns a value that changes when a collision object is created, moved or deleted.
+        """
+        return self._scene_version
+
+    def get_view_key(self) -> tuple:
+        """
+        Returns the camera position and target together with the window size. The view matrix and
+        the mouse ray only change when one of these changes.
+        """
+        target_sphere = self.cam.target_sphere
+        return (tuple(self.cam.xyz), tuple(self.cam.target), tuple(target_sphere.xyz) if target_sphere else None,
+                self.uv.map_widget.view_width, self.uv.map_widget.view_height)
+
+    def get_inverse_projection_matrix(self) -> 'matrix44':
+        """
+        Returns the inverse of the projection matrix. It is only calculated again after the projection
+        matrix changed.
+        """
+        projection_matrix = self.uv.shader.projection_matrix
+        if projection_matrix is not self._projection_matrix:
+            self._projection_matrix = projection_matrix
+            self._inverse_projection_matrix = matrix44.inverse(projection_matrix)
+        return self._inverse_projection_matrix
+
+    def get_view_matrix(self) -> 'matrix44':
+        """
+        Returns the view matrix of the camera. It is only calculated again after the camera moved.
+        """
+        key = self.get_view_key()
+        if key != self._view_key:
+            self._view_key = key
+            self._view_matrix = self.cam.get_view_matrix()
+        return self._view_matrix
+
     def get_ray_clip(self, mouse_x: float, mouse_y: float, mouse_z: float = -1.0) -> 'Vector4':
         """
         Mouse position in opengl clip space
@@ -304,13 +518,12 @@ class MouseRay:
         ray_clip = self.get_ray_clip(mouse_x, mouse_y, mouse_z=-1.0)
 
         # projection_matrix: camera parameters (ratio, field of view, near and far planes)
-        projection_matrix = self.uv.shader.projection_matrix
-        inverse_projection_matrix = matrix44.inverse(projection_matrix)
+        inverse_projection_matrix = self.get_inverse_projection_matrix()
 
         ray_eye = Vector4(matrix44.multiply(inverse_projection_matrix, ray_clip))
         ray_eye = Vector4([ray_eye.x, ray_eye.y, -1.0, 0.0])
 
-        view_matrix = self.cam.get_view_matrix()
+        view_matrix = self.get_view_matrix()
 
         ray_world = Vector4(matrix44.multiply(view_matrix, ray_eye)).xyz
         ray_world = Vector3(ray_world)
@@ -324,6 +537,10 @@ class MouseRay:
 
         """
         self.bullet.resetSimulation(physicsClientId=self.client_id)
+        self._collision_objects = {}
+        self._collision_object_shapes = {}
+        self._dirty_items = {}
+        self._scene_version += 1
         self._create_collision_shapes()
 
     def debug_collision_object(self, collision_object_id: int, item):
@@ -0,0 +1,313 @@
+# -*- coding: utf-8 -*-
+
+"""
+This is the ``PickingRay`` module. It is an alternative to the :class:`~sphere_iot.uv_analytic_ray.AnalyticRay`
+that determines which object is under the mouse pointer by reading it back from the GPU.
+
+All spheres, node discs, sockets and edges are rendered into an offscreen frame buffer with an integer color
+attachment. Each object writes its pick id instead of a color. The frame buffer is only rendered again when
+the scene or the camera changed. Hovering and clicking read a few pixels around the mouse pointer, the rubber
+band box reads the whole box, so each item within the box is found.
+
+The objects are registered the same way as with the ``AnalyticRay``. Their object id + 1 is their pick id,
+0 is nothing.
+
+It can replace the ``MouseRay`` by setting the ``Ray_class`` of the :class:`~sphere_iot.uv_universe.Map`:
+
+    Map.Ray_class = PickingRay
+
+"""
+
+from PyQt6.QtGui import QOpenGLContext
+from OpenGL.GL import *
+from sphere_base.sphere_universe.analytic_ray import AnalyticRay, RAY_LENGTH
+from sphere_base.shader.pick_shader import PickShader
+from sphere_base.utils.utils import dump_exception
+import numpy as np
+
+DEBUG = False
+
+PICK_RADIUS = 2  # pixels around the mouse pointer searched for an item when the pointer is just next to it
+EDGE_PICK_WIDTH = 5  # width of the edges in the picking frame buffer in pixels
+
+# depth offsets keeping sockets on top of node discs, node discs on top of edges and all on top of the sphere
+SPHERE_DEPTH_OFFSET = 1.0
+NODE_DEPTH_OFFSET = -1.0
+SOCKET_DEPTH_OFFSET = -2.0
+
+
+class PickingRay(AnalyticRay):
+    """
+    Picks the items under the mouse pointer by rendering their pick ids into an offscreen frame buffer and
+    reading the pixels under the mouse pointer. It has the same methods as the
+    :class:`~sphere_iot.uv_mouse_ray.MouseRay` so the rest of the implementation does not see the difference.
+
+    """
+
+    def __init__(self, universe, pybullet_key=None):
+        """
+        Constructor of the ``PickingRay`` class.
+
+        :param universe: The :class:`~sphere_iot.uv_universe.Map` the ray is cast into.
+        :type universe:  :class:`~sphere_iot.uv_universe.Map`
+        :param pybullet_key: Not used, kept to have the same signature as the ``MouseRay``.
+
+        :Instance Attributes:
+
+            - **shader** - Instance of :class:`~sphere_iot.shader.pick_shader.PickShader`
+
+        :Instance Variables:
+
+            - **frame_buffer** - id of the OpenGL frame buffer, created with the first refresh.
+            - **refreshes** - ``int`` number of times the frame buffer was rendered.
+
+        """
+        super().__init__(universe, pybullet_key)
+
+        self.config = universe.config
+        self.shader = PickShader(self)
+
+        self.frame_buffer = None
+        self.refreshes = 0
+
+        self._render_buffers = None  # color and depth render buffer
+        self._size = (0, 0)
+        self._refresh_key = None
+        self._refresh_projection = None
+
+    def _create_frame_buffer(self, width: int, height: int):
+        if self.frame_buffer is None:
+            self.frame_buffer = glGenFramebuffers(1)
+            self._render_buffers = glGenRenderbuffers(2)
+
+        color, depth = self._render_buffers
+        glBindRenderbuffer(GL_RENDERBUFFER, color)
+        glRenderbufferStorage(GL_RENDERBUFFER, GL_R32UI, width, height)
+        glBindRenderbuffer(GL_RENDERBUFFER, depth)
+        glRenderbufferStorage(GL_RENDERBUFFER, GL_DEPTH_COMPONENT24, width, height)
+        glBindRenderbuffer(GL_RENDERBUFFER, 0)
+
+        glBindFramebuffer(GL_FRAMEBUFFER, self.frame_buffer)
+        glFramebufferRenderbuffer(GL_FRAMEBUFFER, GL_COLOR_ATTACHMENT0, GL_RENDERBUFFER, color)
+        glFramebufferRenderbuffer(GL_FRAMEBUFFER, GL_DEPTH_ATTACHMENT, GL_RENDERBUFFER, depth)
+        status = glCheckFramebufferStatus(GL_FRAMEBUFFER)
+        if status != GL_FRAMEBUFFER_COMPLETE:
+            # nothing is rendered into or read from the frame buffer, it is created again with the next refresh
+            self._size = (0, 0)
+            raise RuntimeError("picking frame buffer is not complete, status %s" % status)
+
+        self._size = (width, height)
+
+    def _make_current(self) -> bool:
+        # mouse events arrive outside paintGL, the context of the widget needs to be made current
+        map_widget = self.uv.map_widget
+        if QOpenGLContext.currentContext() is map_widget.context():
+            return False
+
+        map_widget.makeCurrent()
+        return True
+
+    def refresh(self):
+        """
+        Renders the pick ids of all objects into the frame buffer when the scene or the camera changed since
+        the last time.
+        """
+        key = (self.get_scene_version(), self.get_view_key())
+        projection_matrix = self.uv.shader.projection_matrix
+        if key == self._refresh_key and projection_matrix is self._refresh_projection:
+            return
+
+        width, height = int(self.uv.map_widget.view_width), int(self.uv.map_widget.view_height)
+        if width <= 0 or height <= 0:
+            return
+
+        done_current = self._make_current()
+        viewport = glGetIntegerv(GL_VIEWPORT)
+        try:
+            if self.frame_buffer is None or self._size != (width, height):
+                self._create_frame_buffer(width, height)
+
+            # Qt may have changed the OpenGL state since the last frame
+            self.config.gl_state.invalidate()
+            self.config.camera_uniforms.set_view(self.get_view_matrix())
+            self.config.camera_uniforms.update()
+
+            glBindFramebuffer(GL_FRAMEBUFFER, self.frame_buffer)
+            glViewport(0, 0, width, height)
+            glClearBufferuiv(GL_COLOR, 0, np.zeros(4, dtype=np.uint32))
+            glClearBufferfv(GL_DEPTH, 0, np.ones(1, dtype=np.float32))
+            self.config.gl_state.enable(GL_DEPTH_TEST)
+
+            self._render_pick_ids()
+
+            self.config.gl_state.disable(GL_POLYGON_OFFSET_FILL)
+            self._refresh_key, self._refresh_projection = key, projection_matrix
+            self.refreshes += 1
+        except Exception as e:
+            dump_exception(e)
+        finally:
+            glBindFramebuffer(GL_FRAMEBUFFER, self.uv.map_widget.defaultFramebufferObject())
+            glViewport(*viewport)
+            if done_current:
+                self.uv.map_widget.doneCurrent()
+
+        if DEBUG:
+            print("picking frame buffer rendered", self.refreshes)
+
+    def _render_pick_ids(self):
+        for object_id, sphere in self._spheres.items():
+            model = getattr(sphere, 'model', None)
+            if model is not None:
+                for mesh in model.meshes:
+                    self.shader.draw_mesh(object_id + 1, mesh_index=mesh.mesh_id, indices_len=mesh.indices_len,
+                                          position=sphere.xyz, orientation=sphere.orientation, scale=sphere.scale,
+                                          depth_offset=SPHERE_DEPTH_OFFSET)
+
+            pick_ids = {}  # item -> pick id
+            for item_id, item in self._sphere_items.get(sphere, {}).items():
+                pick_ids[item] = item_id + 1
+                if item.type == 'sphere_node':
+                    self._render_item(item_id + 1, item, item.node_disc, NODE_DEPTH_OFFSET)
+                elif item.type == 'socket':
+                    self._render_item(item_id + 1, item, item.socket_disc, SOCKET_DEPTH_OFFSET)
+
+            edge_batch = getattr(sphere, 'edge_batch', None)
+            if edge_batch is not None and len(edge_batch):
+                edge_batch.update_buffers()
+                edge_ranges = [edge_range for edge_range in edge_batch.get_edge_ranges() if edge_range[0] in pick_ids]
+                self.shader.draw_lines([pick_ids[edge] for edge, _, _ in edge_ranges],
+                                       [first for _, first, _ in edge_ranges],
+                                       [count for _, _, count in edge_ranges],
+                                       mesh_index=edge_batch.mesh_id, position=sphere.xyz,
+                                       orientation=sphere.orientation, line_width=EDGE_PICK_WIDTH)
+
+    def _render_item(self, pick_id: int, item, model, depth_offset: float):
+        for mesh in model.meshes:
+            self.shader.draw_mesh(pick_id, mesh_index=mesh.mesh_id, indices_len=mesh.indices_len,
+                                  position=item.xyz, orientation=item.orientation, scale=item.scale,
+                                  depth_offset=depth_offset)
+
+    def read_pick_ids(self, x: int, y: int, width: int, height: int) -> np.ndarray:
+        """
+        Reads the pick ids of a rectangle of the frame buffer with one ``glReadPixels``. The rectangle is
+        clipped to the frame buffer.
+
+        :param x: mouse x position of the left side of the rectangle
+        :type x: ``int``
+        :param y: mouse y position of the top of the rectangle
+        :type y: ``int``
+        :param width: width of the rectangle in pixels
+        :type width: ``int``
+        :param height: height of the rectangle in pixels
+        :type height: ``int``
+        :returns: (height, width) ``np.array`` of pick ids, the first row is the top of the rectangle
+        """
+        x0, y0 = max(int(x), 0), max(int(y), 0)
+        x1, y1 = min(int(x) + width, self._size[0]), min(int(y) + height, self._size[1])
+        if self.frame_buffer is None or x1 <= x0 or y1 <= y0:
+            return np.zeros((0, 0), dtype=np.uint32)
+
+        pick_ids = np.zeros((y1 - y0, x1 - x0), dtype=np.uint32)
+
+        done_current = self._make_current()
+        try:
+            glBindFramebuffer(GL_READ_FRAMEBUFFER, self.frame_buffer)
+            glPixelStorei(GL_PACK_ALIGNMENT, 1)
+            # OpenGL counts rows from the bottom of the frame buffer
+            glReadPixels(x0, self._size[1] - y1, x1 - x0, y1 - y0, GL_RED_INTEGER, GL_UNSIGNED_INT, pick_ids)
+        except Exception as e:
+            dump_exception(e)
+        finally:
+            glBindFramebuffer(GL_READ_FRAMEBUFFER, self.uv.map_widget.defaultFramebufferObject())
+            if done_current:
+                self.uv.map_widget.doneCurrent()
+
+        return pick_ids[::-1]
+
+    def get_object(self, pick_id: int):
+        """
+        Returns the sphere or item with the pick id, or ``None``.
+        """
+        if not pick_id:
+            return None
+        return self._items.get(int(pick_id) - 1) or self._spheres.get(int(pick_id) - 1)
+
+    def _cast_mouse_ray(self, mouse_x: float, mouse_y: float) -> (int, list):
+        self.refresh()
+
+        x, y = int(mouse_x), int(mouse_y)
+        pick_ids = self.read_pick_ids(x - PICK_RADIUS, y - PICK_RADIUS, 2 * PICK_RADIUS + 1, 2 * PICK_RADIUS + 1)
+        if not pick_ids.size:
+            return None, None
+
+        # position of the mouse pointer in the clipped rectangle
+        row, column = y - max(y - PICK_RADIUS, 0), x - max(x - PICK_RADIUS, 0)
+        obj = None
+        if row < pick_ids.shape[0] and column < pick_ids.shape[1]:
+            obj = self.get_object(pick_ids[row, column])
+
+        if obj is None or obj.type not in ('sphere_node', 'socket', 'edge'):
+            # an item right next to the mouse pointer is preferred over the sphere it is on
+            rows, columns = np.nonzero(pick_ids)
+            for i in np.argsort((rows - row) ** 2 + (columns - column) ** 2, kind='stable'):
+                item = self._items.get(int(pick_ids[rows[i], columns[i]]) - 1)
+                if item is not None:
+                    obj = item
+                    break
+
+        if obj is None:
+            return None, None
+
+        self.abs_pos = tuple(self.get_collision_point(mouse_x, mouse_y, obj))
+        return obj.id, self.abs_pos
+
+    def get_collision_point(self, mouse_x: float, mouse_y: float, obj) -> np.ndarray:
+        """
+        Returns the point where the mouse ray hits the spheres, or the position of the object when it misses them.
+        """
+        start = np.asarray(self.cam.xyz, dtype=np.float64).reshape(1, 3)
+        end = start + np.asarray(self.get_mouse_point(mouse_x, mouse_y)) * RAY_LENGTH
+
+        spheres = list(self._spheres.values())
+        if spheres:
+            sphere_index, t = self.intersect_spheres(start, end, spheres)
+            if sphere_index[0] >= 0:
+                return (start + (end - start) * t[0])[0]
+
+        return np.asarray(obj.xyz, dtype=np.float64)
+
+    def check_mouse_rectangle(self, sphere, start_point: list, end_point: list) -> list:
+        """
+        Returns a ``list`` of object id`s of all objects visible within a rectangle on the screen.
+        The whole rectangle is read from the frame buffer.
+
+        :param sphere: the sphere, which is left out of the result
+        :type sphere: :class:`~sphere_iot.uv_sphere.Sphere`
+        :param start_point: mouse position of one corner of the rectangle
+        :type start_point: ``list``
+        :param end_point: mouse position of the opposite corner of the rectangle
+        :type end_point: ``list``
+        :return: list of object ids
+        """
+        self.update_dirty_collision_objects()
+        self.refresh()
+
+        x0, x1 = sorted((int(start_point[0]), int(end_point[0])))
+        y0, y1 = sorted((int(start_point[1]), int(end_point[1])))
+        pick_ids = self.read_pick_ids(x0, y0, x1 - x0 + 1, y1 - y0 + 1)
+
+        result_array = []
+        for pick_id in np.unique(pick_ids):
+            obj = self.get_object(pick_id)
+            if obj is not None and obj.id != sphere.id:
+                result_array.append(obj.id)
+
+        return result_array
+
+    def reset(self):
+        """
+        Removes all objects
+
+        """
+        super().reset()
+        self._refresh_key = None
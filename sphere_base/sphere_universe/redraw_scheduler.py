@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+
+"""
+Redraw scheduler module. Contains the RedrawScheduler class which decides when the map widget renders a frame.
+
+A frame is only rendered when the scene has been marked dirty, or while something keeps changing on its own: a
+rotating sphere_base, a camera flying to a new target or a held movement key. Frames are never rendered more
+often than the frame rate cap.
+
+"""
+
+from PyQt6.QtCore import QTimer
+from sphere_base.constants import *
+import time
+
+DEBUG = False
+
+# flags of the map widget moving the camera or rotating the target sphere_base while a key is held
+MOVEMENT_KEYS = ('left', 'right', 'forward', 'back', 'up', 'down', 'arrow_left', 'arrow_right')
+
+
+class RedrawScheduler:
+
+    def __init__(self, map_widget, max_frame_rate=MAX_FRAME_RATE):
+        """
+        Constructor of the ``RedrawScheduler`` class.
+
+        :param map_widget: the widget rendering the map
+        :type map_widget: :class:`~sphere_iot.uv_map_widget.MapWidget`
+        :param max_frame_rate: maximum number of frames per second, ``0`` or ``None`` for no cap
+        :type max_frame_rate: ``float``
+
+        :Instance Variables:
+
+            - **dirty** - ``bool`` the scene changed since the last frame.
+            - **max_frame_rate** - maximum number of frames per second, ``0`` or ``None`` for no cap.
+            - **frames** - ``int`` number of frames rendered.
+
+        """
+        self.map_widget = map_widget
+        self.max_frame_rate = max_frame_rate
+
+        self.dirty = True
+        self.frames = 0
+
+        self._painting = False
+        self._last_frame = 0.0
+
+        self._timer = QTimer()
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.map_widget.update)
+
+    def request(self, *args):
+        """
+        Marks the scene dirty and schedules a frame. Changes made while a frame is rendered are part of that
+        frame, so they do not schedule another one. Accepts and ignores the arguments of listeners.
+        """
+        if self._painting:
+            return
+
+        self.dirty = True
+        self._schedule()
+
+    def _schedule(self):
+        if self._timer.isActive():
+            return
+
+        wait = 0.0
+        if self.max_frame_rate:
+            wait = self._last_frame + 1.0 / self.max_frame_rate - time.monotonic()
+
+        if wait > 0:
+            self._timer.start(int(wait * 1000) + 1)
+        else:
+            self.map_widget.update()
+
+    def begin_frame(self):
+        """
+        Called at the start of each frame.
+        """
+        self._painting = True
+
+    def end_frame(self):
+        """
+        Called at the end of each frame. Schedules the next frame while the scene keeps changing.
+        """
+        self._painting = False
+        self._last_frame = time.monotonic()
+        self.frames += 1
+        self.dirty = False
+
+        if self.is_active():
+            self.dirty = True
+            self._schedule()
+
+        if DEBUG:
+            print("frame", self.frames, "next frame scheduled:", self.dirty)
+
+    def is_active(self) -> bool:
+        """
+        Returns ``True`` while the scene changes without input: a held movement key, a sphere_base rotated by
+        the mouse or an animation, or a camera moving to a new target.
+        """
+        widget = self.map_widget
+        map = widget.map
+        if map is None:
+            return False
+
+        if any(getattr(widget, key, False) for key in MOVEMENT_KEYS):
+            return True
+        if any(value for key, value in widget.keys.items() if not key.startswith('_')):
+            return True
+        return map.is_animating()
@@ -7,8 +7,6 @@ for drawing a square selection box. Selecting all the items within the box.
 
 from sphere_base.sphere_universe.graphic_item import GraphicItem
 
-RAY_SEED = 13  # 10 creates 10 x 10 = 100 rays, x creates x**2 rays
-
 
 class RubberBand(GraphicItem):
     """
@@ -36,13 +34,11 @@ class RubberBand(GraphicItem):
             - **mouse_y** - current y-position (``float``) of the mouse pointer.
             - **mouse_offset** - ``float`` used when dragging the sphere_base over its axis.
 
-        .. warning::
-
-            module uses a ´´RAY_SEED´´ constant to determine how many rays are located within the rubber band box.
-            10 creates 10 x 10 = 100 rays, x creates x**2 rays.
+        .. note::
 
-            More rays mean gives higher density of rays and gives a higher rate of success in selecting edges.
-            However, more rays also takes up more resources and may slow down processing.
+            The items within the box are found by the mouse ray of the map, see
+            :meth:`~sphere_iot.uv_mouse_ray.MouseRay.check_mouse_rectangle`. The ``MouseRay`` sends a grid of
+            rays through the box, the ``PickingRay`` reads the whole box from its picking frame buffer.
 
         """
         super().__init__(self, 'rubber_band_box')
@@ -146,32 +142,17 @@ class RubberBand(GraphicItem):
 
     def get_selection(self) -> list:
         """
-        send out a collection of rays through the rubber band box.
-        First create an array of "ray starting points" then a second array with ray ending points
-        check for unique collisions that are not spheres. Select those items and deselect all other objects.
+        Finds the unique items within the rubber band box that are not spheres.
+        Select those items and deselect all other objects.
 
         Return an array with _selected sphere_base items.
 
         """
-
-        ray_array_start = []
-        ray_array_end = []
         selection = None
 
         if self._dragging:
-            step_x = ((self.mouse_end_point[0] - self.mouse_start_point[0]) / RAY_SEED)
-            step_y = ((self.mouse_end_point[1] - self.mouse_start_point[1]) / RAY_SEED)
-
-            for x in range(RAY_SEED):
-                for y in range(RAY_SEED):
-                    ray_start = self.uv.cam.xyz
-                    ray_world = self.uv.mouse_ray.get_mouse_point(self.mouse_start_point[0] + x * step_x,
-                                                                  self.mouse_start_point[1] + y * step_y)
-                    ray_end = self.uv.cam.xyz + ray_world * 30
-                    ray_array_start.append(ray_start)
-                    ray_array_end.append(ray_end)
-
-            selection = self.uv.mouse_ray.check_mouse_ray_batch(self.uv.target_sphere, ray_array_start, ray_array_end)
+            selection = self.uv.mouse_ray.check_mouse_rectangle(self.uv.target_sphere, self.mouse_start_point,
+                                                                self.mouse_end_point)
 
         self._dragging = False
 
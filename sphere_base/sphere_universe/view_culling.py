@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+
+"""
+View culling module. Contains the ViewCulling class which decides each frame which spheres are inside the
+view frustum and which items on a sphere are in front of its horizon. Items on the far side of a sphere are
+hidden by the depth test anyway, leaving them out saves preparing them for rendering.
+
+"""
+
+from sphere_base.constants import *
+import numpy as np
+
+DEBUG = False
+
+# distance over the surface added to the horizon, items partly in front of the horizon are still drawn
+HORIZON_MARGIN = 0.2
+
+# part of the radius added to the bounding sphere of a sphere_base for the items on it
+SPHERE_MARGIN = 0.1
+
+
+class ViewCulling:
+    """
+    Class doing the frustum test for spheres and the horizon test for the items on a sphere.
+
+    The horizon test compares the direction of each item, seen from the center of the sphere, with the
+    direction of the camera. Seen from a camera at distance d from the center, only the items within
+    ``acos(radius / d)`` of the camera direction are in front of the horizon.
+
+    """
+
+    def __init__(self, map):
+        """
+        Constructor of the ``ViewCulling`` class.
+
+        :param map: reference to the :class:`~sphere_iot.uv_universe.Map`
+        :type map: :class:`~sphere_iot.uv_universe.Map`
+
+        :Instance Variables:
+
+            - **enabled** - ``bool`` when ``False`` all spheres and items are drawn.
+            - **planes** - (6, 4) ``np.array`` with the normalized planes of the view frustum, ``None`` when
+              the view or projection is not known yet.
+            - **cam_xyz** - ``np.array`` with the position of the camera in this frame.
+
+        """
+        self.map = map
+        self.config = map.config
+        self.enabled = VIEW_CULLING
+
+        self.planes = None
+        self.cam_xyz = None
+
+    def update(self):
+        """
+        Updates the view frustum and the camera position. Called once at the start of each frame.
+        """
+        self.planes, self.cam_xyz = None, None
+
+        projection = self.map.shader.projection_matrix
+        view = self.config.view_loc
+        if not self.enabled or projection is None or view is None:
+            return
+
+        self.cam_xyz = np.array(self.map.cam.xyz, dtype=np.float64)
+
+        # pyrr matrices multiply row vectors, the planes are taken from the columns of view * projection
+        m = np.asarray(view, dtype=np.float64) @ np.asarray(projection, dtype=np.float64)
+        planes = np.array([m[:, 3] + m[:, i] for i in range(3)] + [m[:, 3] - m[:, i] for i in range(3)])
+        self.planes = planes / np.linalg.norm(planes[:, :3], axis=1, keepdims=True)
+
+    def is_sphere_visible(self, sphere) -> bool:
+        """
+        Returns ``True`` when the sphere_base is at least partly inside the view frustum.
+
+        :param sphere: the sphere_base to test
+        :type sphere: :class:`~sphere_iot.uv_sphere.Sphere`
+        """
+        if self.planes is None:
+            return True
+
+        radius = sphere.radius * (1 + SPHERE_MARGIN)
+        distances = self.planes[:, :3] @ np.asarray(sphere.xyz, dtype=np.float64) + self.planes[:, 3]
+        return bool(np.all(distances >= -radius))
+
+    def get_visible(self, sphere, directions, angles=0.0) -> np.ndarray:
+        """
+        Returns which items are in front of the horizon of the sphere_base.
+
+        :param sphere: the sphere_base the items are on
+        :type sphere: :class:`~sphere_iot.uv_sphere.Sphere`
+        :param directions: (n, 3) sphere-local positions or directions of the items
+        :type directions: ``np.array``
+        :param angles: angle in radians each item reaches around its direction, one value or (n,) values
+        :type angles: ``float`` or ``np.array``
+        :returns: (n,) ``np.array`` of ``bool``
+        """
+        directions = np.asarray(directions, dtype=np.float64).reshape(-1, 3)
+        if self.cam_xyz is None:
+            return np.ones(len(directions), dtype=bool)
+
+        # the camera in the sphere-local space of the sphere_base
+        local_cam = (self.cam_xyz - np.asarray(sphere.xyz, dtype=np.float64)) @ sphere.get_rotation_matrix()[:3, :3].T
+        distance = np.linalg.norm(local_cam)
+        if distance <= sphere.radius:
+            return np.ones(len(directions), dtype=bool)
+
+        lengths = np.maximum(np.linalg.norm(directions, axis=1), 1e-12)
+        cos = directions @ local_cam / (lengths * distance)
+        horizon = np.arccos(sphere.radius / distance) + HORIZON_MARGIN / sphere.radius
+        return np.arccos(np.clip(cos, -1.0, 1.0)) <= horizon + angles
+
+    def cull_nodes(self, sphere, nodes: list) -> list:
+        """
+        Returns the nodes in front of the horizon of the sphere_base.
+
+        :param sphere: the sphere_base the nodes are on
+        :type sphere: :class:`~sphere_iot.uv_sphere.Sphere`
+        :param nodes: nodes on the sphere_base
+        :type nodes: ``list`` of :class:`~sphere_iot.uv_node.Node`
+        """
+        if self.cam_xyz is None or not nodes:
+            return nodes
+
+        visible = self.get_visible(sphere, [node.local_xyz for node in nodes])
+        if DEBUG:
+            print("culled", len(nodes) - int(visible.sum()), "of", len(nodes), "nodes")
+        return [node for node, node_visible in zip(nodes, visible) if node_visible]
@@ -0,0 +1,219 @@
+# -*- coding: utf-8 -*-
+
+"""
+Binary map module. Stores a serialized :class:`~sphere_iot.uv_universe.Map` in a binary container instead of
+json. The container is a NumPy ``.npz`` file.
+
+For each sphere the node ids, socket ids, node orientations, edge ids and edge socket pairs are stored as
+contiguous NumPy arrays. The detail scenes of the nodes, sockets and edges are stored as opaque blobs: one
+array with all the bytes and one array with the offset of each blob. The map, camera and sphere settings
+are stored as a small json header.
+
+The functions work on the same data as ``Map.serialize`` and ``Map.deserialize``, so a binary file can be
+converted to json and back:
+
+    binary_to_json("map.spheremap", "map.json")
+    json_to_binary("map.json", "map.spheremap")
+
+"""
+
+from collections import OrderedDict
+import numpy as np
+import zipfile
+import json
+
+BINARY_MAP_EXTENSION = ".spheremap"
+BINARY_MAP_VERSION = 1
+
+# keys of the serialized items stored in arrays, any other key is kept in the 'extra' blob of the item
+NODE_KEYS = ('id', 'node_type_name', 'img_name', 'orientation_offset', 'scene', 'socket_id', 'socket')
+EDGE_KEYS = ('id', 'type', 'edge_type', 'start_socket_id', 'end_socket_id', 'scene')
+
+
+def is_binary_map_file(file_name: str) -> bool:
+    """
+    Returns ``True`` when the file is a binary map file and not json.
+
+    :param file_name: path and name of the file
+    :type file_name: ``str``
+    """
+    return zipfile.is_zipfile(file_name)
+
+
+def save_binary_map(data: dict, file_name: str):
+    """
+    Saves the serialized map in a binary map file.
+
+    :param data: serialized map as created by ``Map.serialize``
+    :type data: ``dict``
+    :param file_name: path and name of the file
+    :type file_name: ``str``
+    """
+    with open(file_name, "wb") as file:
+        np.savez(file, **map_to_arrays(data))
+
+
+def load_binary_map(file_name: str) -> dict:
+    """
+    Loads a binary map file.
+
+    :param file_name: path and name of the file
+    :type file_name: ``str``
+    :returns: serialized map to be used by ``Map.deserialize``
+    """
+    with np.load(file_name, allow_pickle=False) as arrays:
+        return arrays_to_map(arrays)
+
+
+def json_to_binary(json_file_name: str, binary_file_name: str):
+    """
+    Converts a json map file to a binary map file.
+    """
+    with open(json_file_name, "r") as file:
+        save_binary_map(json.load(file), binary_file_name)
+
+
+def binary_to_json(binary_file_name: str, json_file_name: str, indent: int = 4):
+    """
+    Converts a binary map file to a json map file.
+    """
+    with open(json_file_name, "w") as file:
+        file.write(json.dumps(load_binary_map(binary_file_name), indent=indent))
+
+
+def map_to_arrays(data: dict) -> dict:
+    """
+    Converts the serialized map to the arrays stored in the binary map file.
+
+    :param data: serialized map as created by ``Map.serialize``
+    :type data: ``dict``
+    :returns: ``dict`` name -> ``np.array``
+    """
+    header = OrderedDict((key, value) for key, value in data.items() if key != 'spheres')
+    header['version'] = BINARY_MAP_VERSION
+    header['spheres'] = []
+
+    arrays = {}
+    for i, sphere_data in enumerate(data['spheres']):
+        header['spheres'].append(OrderedDict((key, value) for key, value in sphere_data.items()
+                                             if key not in ('sphere_nodes', 'edges')))
+        prefix = "sphere_%d_" % i
+
+        nodes = sphere_data['sphere_nodes']
+        arrays[prefix + 'node_ids'] = np.array([node['id'] for node in nodes], dtype=np.int64)
+        arrays[prefix + 'socket_ids'] = np.array([node['socket_id'] for node in nodes], dtype=np.int64)
+        arrays[prefix + 'node_orientations'] = np.array([node['orientation_offset'] for node in nodes],
+                                                        dtype=np.float64).reshape(-1, 4)
+        arrays[prefix + 'node_type_names'] = np.array([node['node_type_name'] for node in nodes], dtype=str)
+        arrays[prefix + 'node_img_names'] = np.array([node.get('img_name', '') for node in nodes], dtype=str)
+        arrays[prefix + 'node_has_img_names'] = np.array(['img_name' in node for node in nodes], dtype=bool)
+        _add_blobs(arrays, prefix + 'node_scenes', [node['scene'] for node in nodes])
+        _add_blobs(arrays, prefix + 'node_sockets', [node.get('socket') for node in nodes])
+        _add_blobs(arrays, prefix + 'node_extra', [_get_extra(node, NODE_KEYS) for node in nodes])
+
+        edges = sphere_data['edges']
+        arrays[prefix + 'edge_ids'] = np.array([edge['id'] for edge in edges], dtype=np.int64)
+        arrays[prefix + 'edge_sockets'] = np.array([[edge['start_socket_id'], edge['end_socket_id']]
+                                                    for edge in edges], dtype=np.int64).reshape(-1, 2)
+        arrays[prefix + 'edge_types'] = np.array([edge['edge_type'] for edge in edges], dtype=np.int64)
+        arrays[prefix + 'edge_item_types'] = np.array([edge.get('type', 'edge') for edge in edges], dtype=str)
+        _add_blobs(arrays, prefix + 'edge_scenes', [edge['scene'] for edge in edges])
+        _add_blobs(arrays, prefix + 'edge_extra', [_get_extra(edge, EDGE_KEYS) for edge in edges])
+
+    arrays['header'] = np.frombuffer(json.dumps(header).encode(), dtype=np.uint8)
+    return arrays
+
+
+def arrays_to_map(arrays) -> dict:
+    """
+    Converts the arrays of a binary map file to the serialized map.
+
+    :param arrays: the arrays stored in the binary map file
+    :type arrays: ``dict`` or ``NpzFile``
+    :returns: serialized map to be used by ``Map.deserialize``
+    """
+    header = json.loads(arrays['header'].tobytes().decode(), object_pairs_hook=OrderedDict)
+    header.pop('version', None)
+    spheres = header.pop('spheres')
+
+    data = OrderedDict(header)
+    data['spheres'] = []
+
+    for i, sphere_header in enumerate(spheres):
+        prefix = "sphere_%d_" % i
+
+        node_ids = arrays[prefix + 'node_ids'].tolist()
+        socket_ids = arrays[prefix + 'socket_ids'].tolist()
+        orientations = arrays[prefix + 'node_orientations'].tolist()
+        type_names = arrays[prefix + 'node_type_names'].tolist()
+        img_names = arrays[prefix + 'node_img_names'].tolist()
+        has_img_names = arrays[prefix + 'node_has_img_names'].tolist()
+        scenes = _get_blobs(arrays, prefix + 'node_scenes')
+        sockets = _get_blobs(arrays, prefix + 'node_sockets')
+        extras = _get_blobs(arrays, prefix + 'node_extra')
+
+        nodes = []
+        for node_id, type_name, img_name, has_img_name, orientation, scene, socket_id, socket, extra in zip(
+                node_ids, type_names, img_names, has_img_names, orientations, scenes, socket_ids, sockets, extras):
+            node = {'id': node_id, 'node_type_name': type_name, 'img_name': img_name,
+                    'orientation_offset': orientation, 'scene': scene, 'socket_id': socket_id, 'socket': socket}
+            if not has_img_name:
+                del node['img_name']
+            if extra:
+                node.update(extra)
+            nodes.append(node)
+
+        edge_ids = arrays[prefix + 'edge_ids'].tolist()
+        edge_sockets = arrays[prefix + 'edge_sockets'].tolist()
+        edge_types = arrays[prefix + 'edge_types'].tolist()
+        item_types = arrays[prefix + 'edge_item_types'].tolist()
+        scenes = _get_blobs(arrays, prefix + 'edge_scenes')
+        extras = _get_blobs(arrays, prefix + 'edge_extra')
+
+        edges = []
+        for edge_id, item_type, edge_type, (start_socket_id, end_socket_id), scene, extra in zip(
+                edge_ids, item_types, edge_types, edge_sockets, scenes, extras):
+            edge = {'id': edge_id, 'type': item_type, 'edge_type': edge_type, 'start_socket_id': start_socket_id,
+                    'end_socket_id': end_socket_id, 'scene': scene}
+            if extra:
+                edge.update(extra)
+            edges.append(edge)
+
+        sphere_data = OrderedDict(sphere_header)
+        sphere_data['sphere_nodes'] = nodes
+        sphere_data['edges'] = edges
+        data['spheres'].append(sphere_data)
+
+    return data
+
+
+def _get_extra(item: dict, keys: tuple) -> dict:
+    # keys added by subclasses of the nodes and edges
+    return OrderedDict((key, value) for key, value in item.items() if key not in keys)
+
+
+def _add_blobs(arrays: dict, name: str, values: list):
+    # the values are opaque to the binary format, each is stored as json bytes. The blobs are separated
+    # by commas inside brackets, so all of them are read with a single json call.
+    blobs = [json.dumps(value).encode() for value in values]
+    offsets = np.ones(len(blobs) + 1, dtype=np.int64)
+    offsets[1:] += np.cumsum([len(blob) + 1 for blob in blobs], dtype=np.int64)
+
+    arrays[name] = np.frombuffer(b"[" + b",".join(blobs) + b"]", dtype=np.uint8)
+    arrays[name + '_offsets'] = offsets
+
+
+def get_blob(arrays, name: str, index: int):
+    """
+    Returns a single blob without reading the others.
+
+    :param arrays: the arrays stored in the binary map file
+    :param name: name of the blob array, for instance 'sphere_0_node_scenes'
+    :param index: index of the node or edge
+    """
+    offsets = arrays[name + '_offsets']
+    return json.loads(arrays[name][offsets[index]:offsets[index + 1] - 1].tobytes())
+
+
+def _get_blobs(arrays, name: str) -> list:
+    return json.loads(arrays[name].tobytes())
@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+
+"""Tests for the binary map file of the `sphere_base` package."""
+
+
+import json
+import os
+import tempfile
+import unittest
+
+from sphere_base.utils.binary_map import save_binary_map, load_binary_map
+
+
+def create_node(node_id, socket_id):
+    return {
+        'id': node_id,
+        'node_type_name': 'node',
+        'img_name': 'img_1',
+        'orientation_offset': [0.0, 0.0, 0.0, 1.0],
+        'scene': {'name': 'node %d' % node_id},
+        'socket_id': socket_id,
+        'socket': {'id': socket_id, 'type': 'socket', 'scene': {}},
+    }
+
+
+def create_map(spheres):
+    return {
+        'id': 1,
+        'camera': {'xyz': [0.0, 0.0, 10.0]},
+        'spheres': [dict({'id': 100 + i, 'type': 'sphere_base'}, **items) for i, items in enumerate(spheres)],
+    }
+
+
+class TestBinaryMap(unittest.TestCase):
+    """Tests for `sphere_base.utils.binary_map`."""
+
+    def setUp(self):
+        """Set up test fixtures, if any."""
+        file, self.file_name = tempfile.mkstemp(suffix=".spheremap")
+        os.close(file)
+
+    def tearDown(self):
+        """Tear down test fixtures, if any."""
+        os.remove(self.file_name)
+
+    def round_trip(self, data):
+        save_binary_map(data, self.file_name)
+        return json.loads(json.dumps(load_binary_map(self.file_name)))
+
+    def test_000_round_trip(self):
+        """Test if a map with nodes and edges is loaded unchanged"""
+        data = create_map([{
+            'sphere_nodes': [create_node(1, 2), create_node(3, 4)],
+            'edges': [{'id': 5, 'type': 'edge', 'edge_type': 1, 'start_socket_id': 2, 'end_socket_id': 4,
+                       'scene': {'name': 'edge'}}],
+        }])
+        self.assertEqual(self.round_trip(data), json.loads(json.dumps(data)))
+
+    def test_001_round_trip_empty_spheres(self):
+        """Test if spheres without nodes or without edges are loaded unchanged"""
+        data = create_map([
+            {'sphere_nodes': [], 'edges': []},
+            {'sphere_nodes': [create_node(1, 2)], 'edges': []},
+        ])
+        self.assertEqual(self.round_trip(data), json.loads(json.dumps(data)))
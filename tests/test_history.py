@@ -0,0 +1,219 @@
+#!/usr/bin/env python
+
+"""Tests for the undo and redo history of the `sphere_base` package."""
+
+
+import unittest
+from types import SimpleNamespace
+
+from sphere_base.history import History
+
+
+class StubNode:
+    """A node holding only a position, added to the sphere when created like the ``Node``."""
+
+    type = 'sphere_node'
+
+    def __init__(self, sphere, node_id=None, xyz=0.0):
+        self.sphere = sphere
+        self.id = node_id if node_id is not None else sphere.new_id()
+        self.xyz = xyz
+        self.selected = False
+        self.sphere.add_item(self)
+
+    def move(self, xyz):
+        self.xyz = xyz
+        self.sphere.history.mark_changed(self)
+
+    def remove(self):
+        for edge in [edge for edge in self.sphere.edges if self.id in (edge.start, edge.end)]:
+            edge.remove()
+        self.sphere.remove_item(self)
+
+    def on_selected_event(self, event):
+        self.selected = event
+
+    def serialize(self):
+        return {'id': self.id, 'xyz': self.xyz}
+
+    def deserialize(self, data, hashmap=None, restore_id=True):
+        if restore_id:
+            self.sphere.set_item_id(self, data['id'])
+        self.move(data['xyz'])
+
+
+class StubEdge:
+    """An edge between the ids of two nodes."""
+
+    type = 'edge'
+
+    def __init__(self, sphere, start=None, end=None):
+        self.sphere = sphere
+        self.id = sphere.new_id()
+        self.start = start
+        self.end = end
+        self.selected = False
+        self.sphere.add_item(self)
+
+    def remove(self):
+        self.sphere.remove_item(self)
+
+    def on_selected_event(self, event):
+        self.selected = event
+
+    def serialize(self):
+        return {'id': self.id, 'start': self.start, 'end': self.end}
+
+    def deserialize(self, data, hashmap=None, restore_id=True):
+        if restore_id:
+            self.sphere.set_item_id(self, data['id'])
+        self.start = data['start']
+        self.end = data['end']
+        self.sphere.history.mark_changed(self)
+
+
+class StubSphere:
+    """The part of the ``Sphere`` used by the ``History``."""
+
+    Edge = StubEdge
+
+    def __init__(self):
+        self.map = SimpleNamespace()
+        self.items = {}
+        self.items_selected = []
+        self._last_selected_items = []
+        self.has_been_modified = False
+        self.last_id = 0
+        self.history = History(self)
+
+    @property
+    def nodes(self):
+        return [item for item in self.items.values() if item.type == 'sphere_node']
+
+    @property
+    def edges(self):
+        return [item for item in self.items.values() if item.type == 'edge']
+
+    def new_id(self):
+        self.last_id += 1
+        return self.last_id
+
+    def add_item(self, item):
+        self.items[item.id] = item
+        self.history.mark_changed(item)
+
+    def remove_item(self, item):
+        if self.items.get(item.id) is item:
+            del self.items[item.id]
+        self.history.mark_changed(item)
+
+    def set_item_id(self, item, item_id):
+        if self.items.get(item.id) is item:
+            del self.items[item.id]
+            self.items[item_id] = item
+        self.history.mark_changed(item)
+        item.id = item_id
+        self.history.mark_changed(item)
+
+    def get_item_by_id(self, item_id):
+        return self.items.get(item_id)
+
+    def select_item(self, item, shift=False):
+        if item not in self.items_selected:
+            self.items_selected.append(item)
+        item.on_selected_event(True)
+
+    def get_node_class_from_data(self, data):
+        return StubNode
+
+    @staticmethod
+    def serialize_state():
+        return {'id': 0, 'radius': 1.0}
+
+    def deserialize_state(self, data):
+        pass
+
+    def get_state(self):
+        # the nodes and edges on the sphere as they would be serialized
+        return sorted((item.type, item.serialize()['id'], tuple(sorted(item.serialize().items())))
+                      for item in self.items.values())
+
+
+class TestHistory(unittest.TestCase):
+    """Tests for `sphere_base.history`."""
+
+    def setUp(self):
+        """Set up test fixtures, if any."""
+        self.sphere = StubSphere()
+        self.history = self.sphere.history
+        self.node = StubNode(self.sphere, xyz=0.0)
+        self.history.store_initial_history_stamp()
+
+    def test_000_undo_redo_add_move_remove(self):
+        """Undo and redo adding, moving and removing a node with its edges."""
+        states = [self.sphere.get_state()]
+
+        node = StubNode(self.sphere, xyz=1.0)
+        StubEdge(self.sphere, self.node.id, node.id)
+        self.history.store_history("added", True)
+        states.append(self.sphere.get_state())
+
+        node.move(2.0)
+        self.history.store_history("moved", True)
+        states.append(self.sphere.get_state())
+
+        node.remove()
+        self.history.store_history("removed", True)
+        states.append(self.sphere.get_state())
+
+        self.assertEqual(len(self.sphere.edges), 0)
+        self.assertEqual(set(self.history.history_stack[-1]['changes']),
+                         {('sphere_nodes', node.id), ('edges', node.id + 1)})
+
+        for state in reversed(states[:-1]):
+            self.history.undo()
+            self.assertEqual(self.sphere.get_state(), state)
+        self.assertFalse(self.history.can_undo())
+
+        for state in states[1:]:
+            self.history.redo()
+            self.assertEqual(self.sphere.get_state(), state)
+        self.assertFalse(self.history.can_redo())
+
+    def test_001_undo_with_unsaved_changes(self):
+        """Undo also drops the changes made after the last history stamp."""
+        initial_state = self.sphere.get_state()
+        self.node.move(1.0)
+        self.history.store_history("moved", True)
+        moved_state = self.sphere.get_state()
+
+        # changes without a history stamp
+        self.node.move(5.0)
+        StubNode(self.sphere, xyz=3.0)
+
+        self.history.undo()
+        self.assertEqual(self.sphere.get_state(), initial_state)
+
+        self.history.redo()
+        self.assertEqual(self.sphere.get_state(), moved_state)
+
+    def test_002_selection_changed(self):
+        """A history stamp with only a new selection holds no item changes."""
+        state = self.sphere.get_state()
+        self.sphere.select_item(self.node, True)
+        self.history.store_history("Selection Changed")
+
+        self.assertEqual(self.history.history_stack[-1]['changes'], {})
+        self.assertEqual(self.history.history_stack[-1]['selection']['sphere_nodes'], [self.node.id])
+
+        self.history.undo()
+        self.assertFalse(self.node.selected)
+        self.assertEqual(self.sphere.get_state(), state)
+
+        self.history.redo()
+        self.assertTrue(self.node.selected)
+        self.assertEqual(self.sphere.get_state(), state)
+
+
+if __name__ == '__main__':
+    unittest.main()